@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark of preparing the cover art embedded into the tracks of an album.
+
+Prepares the variant of a synthetic scan (or of the given image) under a few artwork policies,
+reporting the time taken, the size and dimensions of the variant, and the artwork bytes written
+for an album of the given number of tracks.
+
+Usage:
+    python benchmarks/artwork.py [--size 3000] [--tracks 30] [--runs 3] [--cover-art /path/to/cover.jpg]
+"""
+
+import sys
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+
+import cv2 as cv
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sootworks.audio_tagger.domain.model import ArtworkPolicy  # noqa: E402
+from sootworks.audio_tagger.infrastructure.album_info._artwork_preparer import prepare_cover_art  # noqa: E402
+
+
+POLICIES = {
+    "none": ArtworkPolicy(),
+    "1000px": ArtworkPolicy(max_dimension=1000),
+    "1000px, 500 KB": ArtworkPolicy(max_dimension=1000, max_bytes=500 * 1024),
+    "600px, 100 KB": ArtworkPolicy(max_dimension=600, max_bytes=100 * 1024),
+}
+
+
+def make_scan(size: int) -> bytes:
+    """A noisy (hence poorly compressible) JPEG, like a high-resolution scan."""
+    rng = np.random.default_rng(seed=0)
+    image = cv.GaussianBlur(rng.integers(0, 256, size=(size, size, 3), dtype=np.uint8), (3, 3), 0)
+
+    return cv.imencode(".jpg", image, [cv.IMWRITE_JPEG_QUALITY, 95])[1].tobytes()
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Measuring the preparation of the cover art embedded into tracks.")
+    parser.add_argument("--size", type=int, default=3000, help="the width and height of the synthetic scan.")
+    parser.add_argument("--tracks", type=int, default=30, help="the number of tracks the cover art is embedded into.")
+    parser.add_argument("--runs", type=int, default=3, help="the number of runs, the best of which is reported.")
+    parser.add_argument("--cover-art", type=Path, help="an image to prepare, rather than a synthetic scan.")
+    args = parser.parse_args()
+
+    data = make_scan(size=args.size) if (args.cover_art is None) else args.cover_art.read_bytes()
+    print(f"source: {len(data) / 1024:.0f} KB, x{args.tracks} tracks: {len(data) * args.tracks / 1024**2:.1f} MB")
+    for name, policy in POLICIES.items():
+        best = float("inf")
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            variant = data if policy.is_unlimited else prepare_cover_art(data=data, policy=policy)
+            best = min(best, time.perf_counter() - start)
+
+        height, width = cv.imdecode(np.frombuffer(variant, np.uint8), cv.IMREAD_COLOR).shape[:2]
+        print(
+            f"  {name + ':':<16} {best * 1000:8.1f} ms, {width}x{height}, {len(variant) / 1024:6.0f} KB,"
+            f" x{args.tracks} tracks: {len(variant) * args.tracks / 1024**2:6.1f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
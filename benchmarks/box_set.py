@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark of building the domain models of a very large release.
+
+Parses a synthetic release descriptor of a box set (shaped like those returned by musicbrainzngs)
+into album info, collates (virtual) audio files with it and plans their restructuring, measuring
+the time taken by each stage and the memory allocated for the album info.
+
+Usage:
+    python benchmarks/box_set.py [--discs 20] [--tracks 30] [--runs 5]
+"""
+
+import sys
+import tempfile
+import time
+import tracemalloc
+from argparse import ArgumentParser
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sootworks.audio_tagger.domain.model import DefaultTags  # noqa: E402
+from sootworks.audio_tagger.domain.repository import AlbumDirFormatter  # noqa: E402
+from sootworks.audio_tagger.infrastructure.album_info import MusicBrainzAlbumInfoRepository  # noqa: E402
+from sootworks.audio_tagger.infrastructure.audio_file import SimpleAudioFileRepository  # noqa: E402
+
+
+def make_descriptor(discs: int, tracks: int) -> dict:
+    return {
+        "release": {
+            "id": "00000000-0000-0000-0000-000000000000",
+            "title": "Synthetic Box Set",
+            "date": "2001-01-01",
+            "artist-credit": [{"artist": {"id": "1", "name": "Synthetic Artist"}}],
+            "medium-count": discs,
+            "medium-list": [
+                {
+                    "position": str(disc),
+                    "track-count": tracks,
+                    "track-list": [
+                        {
+                            "position": str(track),
+                            "number": str(track),
+                            "length": str(180_000 + track),
+                            "recording": {"title": f"Track {disc}-{track}", "length": str(180_000 + track)},
+                        }
+                        for track in range(1, tracks + 1)
+                    ],
+                }
+                for disc in range(1, discs + 1)
+            ],
+        }
+    }
+
+
+def measure(function, runs: int) -> float:
+    """Returning the best time (ms) of the given runs."""
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+
+    return best * 1000
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Measuring the construction of the domain models of a very large release.")
+    parser.add_argument("--discs", type=int, default=20, help="the number of discs of the synthetic box set.")
+    parser.add_argument("--tracks", type=int, default=30, help="the number of tracks per disc.")
+    parser.add_argument("--runs", type=int, default=5, help="the number of runs, the best of which is reported.")
+    args = parser.parse_args()
+
+    descriptor = make_descriptor(discs=args.discs, tracks=args.tracks)
+    paths = [
+        Path(f"CD{disc}/{track:02d}.flac") for disc in range(1, args.discs + 1) for track in range(1, args.tracks + 1)
+    ]
+    audio_file_repo = SimpleAudioFileRepository(formatter=AlbumDirFormatter)
+    with tempfile.NamedTemporaryFile(suffix=".jpg") as cover_art:
+        # A given cover art is read from disk, rather than being fetched.
+        default_tags = DefaultTags(cover_art=Path(cover_art.name))
+        album_info_repo = MusicBrainzAlbumInfoRepository(app="benchmark", version="0", contact="-", interactive=False)
+        parse = lambda: album_info_repo._parse_musicbrainz_release_descriptor(  # noqa: E731
+            info=descriptor, default_tags=default_tags
+        )
+
+        tracemalloc.start()
+        info = parse()
+        allocated = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        album = audio_file_repo.collate_audio_files(paths=paths, album_info=info)
+        print(f"tracks: {len(info.tracks)} ({args.discs} discs), album info: {allocated / 1024:.0f} KB")
+        print(f"  parsing:     {measure(parse, args.runs):8.2f} ms")
+        collate = lambda: audio_file_repo.collate_audio_files(paths=paths, album_info=info)  # noqa: E731
+        print(f"  collating:   {measure(collate, args.runs):8.2f} ms")
+        plan = lambda: audio_file_repo.plan_restructuring(album=album, out_path=Path("/library"))  # noqa: E731
+        print(f"  planning:    {measure(plan, args.runs):8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+"""Import-time budget check for the CLI entry point.
+
+Cold-imports the application module in fresh interpreters (`python -X importtime`), and fails
+if the best cumulative import time exceeds the budget, or if any of the heavy dependencies that
+are meant to be loaded lazily has been imported.
+
+Usage:
+    python benchmarks/import_time.py [--budget-ms 400] [--runs 5]
+"""
+
+import re
+import subprocess
+import sys
+from argparse import ArgumentParser
+
+
+MODULE = "sootworks.audio_tagger.app"
+LAZY_MODULES = ("cv2", "numpy", "matplotlib", "aiohttp")
+
+# e.g. "import time:       596 |     235851 | sootworks.audio_tagger.app"
+IMPORT_TIME_PATTERN = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|\s+(\S+)$")
+
+
+def measure(module: str) -> tuple[float, set[str]]:
+    """Returning the cumulative import time of the module (ms), and the top-level packages imported."""
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True, check=True
+    )
+
+    cumulative, packages = None, set()
+    for line in process.stderr.splitlines():
+        if (match := IMPORT_TIME_PATTERN.match(line)) is None:
+            continue
+
+        packages.add(match.group(3).split(".")[0])
+        if match.group(3) == module:
+            cumulative = int(match.group(2)) / 1000
+
+    if cumulative is None:
+        raise RuntimeError(f"Couldn't find the import time of '{module}' (has it been imported already?)")
+
+    return cumulative, packages
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Checking the cold import time of the CLI against a budget.")
+    parser.add_argument("--budget-ms", type=float, default=400.0, help="the allowed cumulative import time")
+    parser.add_argument("--runs", type=int, default=5, help="the best of this many runs is compared to the budget")
+    args = parser.parse_args()
+
+    results = [measure(module=MODULE) for _ in range(args.runs)]
+    best = min(cumulative for cumulative, _ in results)
+    eager = sorted(set(LAZY_MODULES) & set.union(*(packages for _, packages in results)))
+
+    print(f"{MODULE}: {best:.1f} ms (budget: {args.budget_ms:.1f} ms)")
+
+    failures = []
+    if best > args.budget_ms:
+        failures.append(f"import time exceeds the budget by {best - args.budget_ms:.1f} ms")
+    if eager:
+        failures.append(f"lazily loaded dependencies have been imported at startup: {', '.join(eager)}")
+
+    for failure in failures:
+        print(f"FAILED: {failure}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark of the offline release database.
+
+Imports a synthetic MusicBrainz JSON dump (gzipped JSON lines, shaped like the 'mbdump/release'
+file of the data dumps), then measures release lookups (up to the AlbumInfo returned by the
+repository) and searches by album name and artist.
+
+Usage:
+    python benchmarks/release_database.py [--releases 100000] [--tracks 12] [--lookups 2000]
+"""
+
+import contextlib
+import gzip
+import io
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from argparse import ArgumentParser
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sootworks.audio_tagger.domain.model import DefaultTags  # noqa: E402
+from sootworks.audio_tagger.infrastructure.album_info import (  # noqa: E402
+    MusicBrainzDumpAlbumInfoRepository,
+    ReleaseDatabase,
+)
+
+
+def make_release(i: int, tracks: int) -> dict:
+    artist = {"id": str(uuid.uuid4()), "name": f"Artist {i // 10}"}
+    return {
+        "id": str(uuid.uuid4()),
+        "title": f"Album {i}",
+        "date": f"{1970 + i % 50}-01-01",
+        "artist-credit": [{"name": artist["name"], "joinphrase": "", "artist": artist}],
+        "media": [
+            {
+                "position": 1,
+                "format": "CD",
+                "track-count": tracks,
+                "tracks": [
+                    {
+                        "id": str(uuid.uuid4()),
+                        "position": n,
+                        "number": str(n),
+                        "title": f"Track {n}",
+                        "length": 180_000 + n,
+                        "recording": {"id": str(uuid.uuid4()), "title": f"Track {n}", "length": 180_000 + n},
+                    }
+                    for n in range(1, tracks + 1)
+                ],
+            }
+        ],
+    }
+
+
+def make_dump(path: Path, releases: int, tracks: int) -> list[str]:
+    ids = []
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        for i in range(releases):
+            release = make_release(i=i, tracks=tracks)
+            ids.append(release["id"])
+            f.write(json.dumps(release) + "\n")
+
+    return ids
+
+
+def measure(function, args: list) -> tuple[float, float]:
+    """Returning the median and the 99th percentile latency (ms) of the calls."""
+    latencies = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for arg in args:
+            start = time.perf_counter()
+            function(arg)
+            latencies.append(time.perf_counter() - start)
+
+    return statistics.median(latencies) * 1000, statistics.quantiles(latencies, n=100)[98] * 1000
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Measuring imports into, and lookups in, the offline release database.")
+    parser.add_argument("--releases", type=int, default=100_000, help="the number of releases of the synthetic dump.")
+    parser.add_argument("--tracks", type=int, default=12, help="the number of tracks per release.")
+    parser.add_argument("--lookups", type=int, default=2000, help="the number of lookups and searches measured.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        dump = Path(tmp) / "release.gz"
+        ids = make_dump(path=dump, releases=args.releases, tracks=args.tracks)
+
+        database = ReleaseDatabase(path=Path(tmp) / "musicbrainz.sqlite")
+        start = time.perf_counter()
+        stats = database.import_dump(path=dump)
+        duration = time.perf_counter() - start
+        print(f"imported {stats.imported} releases in {duration:.1f}s ({stats.imported / duration:.0f} releases/s)")
+
+        repo = MusicBrainzDumpAlbumInfoRepository(
+            app="benchmark", version="0", contact="-", database=database, interactive=False
+        )
+        default_tags = DefaultTags()
+        sample = random.sample(range(args.releases), k=min(args.lookups, args.releases))
+
+        median, p99 = measure(lambda i: repo.get_album_info(album_id=ids[i], default_tags=default_tags), sample)
+        print(f"  lookup (AlbumInfo): median {median:.3f} ms, p99 {p99:.3f} ms")
+        median, p99 = measure(
+            lambda i: repo.query_album_id(album_name=f"Album {i}", artist=f"Artist {i // 10}", track_count=args.tracks),
+            sample,
+        )
+        print(f"  search:             median {median:.3f} ms, p99 {p99:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
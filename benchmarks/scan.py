@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark of audio file discovery.
+
+Compares the scandir-based scanner of SimpleAudioFileRepository (sequential, and with parallel
+scan workers) with the former Path.iterdir()-based implementation, on a synthetic library of
+empty files, or on an existing library (e.g. a network mount) given by --root.
+
+Usage:
+    python benchmarks/scan.py [--albums 500] [--tracks 12] [--runs 3] [--scan-workers 8] [--root /path/to/library]
+"""
+
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+from collections import deque
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sootworks.audio_tagger.domain.repository import AlbumDirFormatter  # noqa: E402
+from sootworks.audio_tagger.infrastructure.audio_file import SimpleAudioFileRepository  # noqa: E402
+from sootworks.audio_tagger.infrastructure.tagging_lib import get_supported_audio_file_extensions  # noqa: E402
+
+
+def legacy_get_audio_paths(path: Path, suffix_filter: str | None = None) -> list[Path]:
+    """The implementation replaced by the scandir-based scanner, kept as is for reference."""
+    audio_paths = []
+    stack = deque([path])
+    try:
+        while parent := stack.pop():
+            for candidate in parent.iterdir():
+                suffix = candidate.suffix[1:]  # excluding leading period
+                if candidate.is_dir():
+                    stack.append(candidate)
+                elif suffix in get_supported_audio_file_extensions():
+                    if isinstance(suffix_filter, str) and (suffix != suffix_filter):
+                        continue
+                    audio_paths.append(candidate)
+    except IndexError:
+        pass
+
+    return audio_paths
+
+
+def make_library(root: Path, albums: int, tracks: int) -> None:
+    """Creating artist/album/disc dirs of empty audio files, along with some cover art and log files."""
+    for i in range(albums):
+        album_dir = root / f"Artist_{i // 10:03d}" / f"Album_{i:04d}"
+        for disc in (1, 2) if (i % 5 == 0) else (1,):
+            disc_dir = album_dir / f"CD {disc}" if (i % 5 == 0) else album_dir
+            disc_dir.mkdir(parents=True, exist_ok=True)
+            for track in range(1, tracks + 1):
+                (disc_dir / f"{track:02d} - Track.{'flac' if (i % 2) else 'mp3'}").touch()
+        (album_dir / "cover.jpg").touch()
+        (album_dir / "rip.log").touch()
+
+
+def measure(function, root: Path, runs: int) -> tuple[float, set[Path]]:
+    """Returning the best time (ms) of the given runs, along with the paths found."""
+    best, paths = float("inf"), set()
+    for _ in range(runs):
+        start = time.perf_counter()
+        paths = set(function(root))
+        best = min(best, time.perf_counter() - start)
+
+    return best * 1000, paths
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Comparing audio file discovery implementations.")
+    parser.add_argument("--albums", type=int, default=500, help="the number of albums of the synthetic library.")
+    parser.add_argument("--tracks", type=int, default=12, help="the number of tracks per disc.")
+    parser.add_argument("--runs", type=int, default=3, help="the number of runs, the best of which is reported.")
+    parser.add_argument("--scan-workers", type=int, default=8, help="the number of workers of the parallel scan.")
+    parser.add_argument("--root", type=Path, default=None, help="an existing library to scan instead.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = args.root
+        if root is None:
+            root = Path(tmp)
+            make_library(root=root, albums=args.albums, tracks=args.tracks)
+
+        sequential = SimpleAudioFileRepository(formatter=AlbumDirFormatter)
+        parallel = SimpleAudioFileRepository(formatter=AlbumDirFormatter, scan_workers=args.scan_workers)
+        implementations = {
+            "iterdir (legacy)": legacy_get_audio_paths,
+            "scandir": lambda path: sequential.iter_audio_paths(path=path),
+            f"scandir, {args.scan_workers} workers": lambda path: parallel.iter_audio_paths(path=path),
+        }
+
+        results = {name: measure(function, root=root, runs=args.runs) for name, function in implementations.items()}
+
+    baseline, expected = results["iterdir (legacy)"]
+    print(f"root: {root if args.root else 'synthetic'}, audio files: {len(expected)}")
+    for name, (duration, paths) in results.items():
+        # The legacy implementation matches suffixes case-sensitively.
+        note = "" if (paths >= expected) else " (MISSING PATHS)"
+        print(f"  {name:<24} {duration:8.1f} ms ({baseline / duration:.2f}x){note}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,390 @@
+# -*- coding: utf-8 -*-
+
+"""End-to-end benchmark of tagging synthetic albums.
+
+Generates albums of silent WAV, FLAC and MP3 files offline (of the given number of tracks, file
+size and disc layout), served by a stubbed album info repository, then times every stage of
+SimpleAlbumTagger.tag_album separately: scanning the album dir, fetching the album info,
+collating the files, planning and performing the restructuring, tagging, and finalizing. The
+median of the runs is reported per format and stage, and can be saved as JSON and compared with
+a stored baseline, stages slower than the baseline by more than the threshold failing the run.
+
+Usage:
+    python benchmarks/tag_album.py [--tracks 12] [--discs 1] [--track-mb 8] [--formats wav,flac,mp3] [--runs 5]
+        [--output results.json] [--baseline baseline.json] [--threshold 0.1]
+"""
+
+import json
+import platform
+import shutil
+import statistics
+import struct
+import sys
+import tempfile
+import time
+import wave
+from argparse import ArgumentParser, Namespace
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sootworks.audio_tagger.application.audio_tagger import SimpleAlbumTagger  # noqa: E402
+from sootworks.audio_tagger.domain.const import CopyStrategy  # noqa: E402
+from sootworks.audio_tagger.domain.model import (  # noqa: E402
+    AlbumInfo,
+    AlbumQueryParams,
+    AudioTrackInfo,
+    DefaultTags,
+    TaggingReport,
+)
+from sootworks.audio_tagger.domain.repository import AlbumDirFormatter, IAlbumInfoRepository  # noqa: E402
+from sootworks.audio_tagger.infrastructure.audio_file import SimpleAudioFileRepository  # noqa: E402
+from sootworks.audio_tagger.infrastructure.tagging_lib import (  # noqa: E402
+    Eye3DAudioFileTagger,
+    MusicTagAudioFileTagger,
+)
+
+
+SAMPLE_RATE = 44100
+CHANNELS = 2
+STAGES = ("scan", "album_info", "collate", "plan", "restructure", "tag", "finalize")
+
+# FLAC: fixed-size blocks of verbatim (uncompressed) silence, so that files are as large as their PCM data.
+FLAC_BLOCK_SIZE = 4096
+# MP3: MPEG-1 Layer III frames at 128 kbps / 44.1 kHz (joint stereo), with empty side info and main data.
+MP3_FRAME_HEADER = b"\xff\xfb\x90\x64"
+MP3_FRAME_SIZE = 417  # bytes, 144 * 128000 // 44100
+MP3_FRAME_SAMPLES = 1152
+
+
+def _make_crc_table(polynomial: int, width: int) -> list[int]:
+    top, mask, table = 1 << (width - 1), (1 << width) - 1, []
+    for byte in range(256):
+        crc = byte << (width - 8)
+        for _ in range(8):
+            crc = ((crc << 1) ^ polynomial) if (crc & top) else (crc << 1)
+        table.append(crc & mask)
+
+    return table
+
+
+CRC8_TABLE = _make_crc_table(polynomial=0x07, width=8)
+CRC16_TABLE = _make_crc_table(polynomial=0x8005, width=16)
+
+
+def crc8(data: bytes, crc: int = 0) -> int:
+    for byte in data:
+        crc = CRC8_TABLE[crc ^ byte]
+    return crc
+
+
+def crc16(data: bytes, crc: int = 0) -> int:
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFF) ^ CRC16_TABLE[(crc >> 8) ^ byte]
+    return crc
+
+
+class _ZeroRunCrc16:
+    """The CRC-16 of a state followed by a run of zero bytes, which is linear in the state.
+
+    The images of the 16 unit states are computed once, rather than feeding the (long) run of
+    silence of every frame through the CRC.
+    """
+
+    def __init__(self, length: int) -> None:
+        self.images = [crc16(bytes(length), crc=(1 << bit)) for bit in range(16)]
+
+    def __call__(self, crc: int) -> int:
+        result = 0
+        for bit, image in enumerate(self.images):
+            if crc & (1 << bit):
+                result ^= image
+        return result
+
+
+def _encode_utf8_number(number: int) -> bytes:
+    """The frame number of FLAC frame headers, coded like UTF-8 code points."""
+    if number < 0x80:
+        return bytes([number])
+
+    payload, continuation = [], 0
+    while True:
+        payload.insert(0, 0x80 | (number & 0x3F))
+        number >>= 6
+        continuation += 1
+        if number < (1 << (6 - continuation)):
+            break
+    lead = ((0xFF << (7 - continuation)) & 0xFF) | number
+
+    return bytes([lead, *payload])
+
+
+def write_wav(path: Path, samples: int) -> None:
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(CHANNELS)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes(bytes(samples * CHANNELS * 2))
+
+
+def write_flac(path: Path, samples: int) -> None:
+    streaminfo = struct.pack(">HH", FLAC_BLOCK_SIZE, FLAC_BLOCK_SIZE) + bytes(6)  # frame sizes unknown
+    # 20 bits sample rate, 3 bits channels - 1, 5 bits bits per sample - 1, 36 bits total samples
+    streaminfo += ((SAMPLE_RATE << 44) | ((CHANNELS - 1) << 41) | (15 << 36) | samples).to_bytes(8, "big")
+    streaminfo += bytes(16)  # MD5 signature unknown
+
+    zero_run_crcs = {}
+    with path.open("wb") as f:
+        f.write(b"fLaC" + bytes([0x80]) + len(streaminfo).to_bytes(3, "big") + streaminfo)
+        for number, start in enumerate(range(0, samples, FLAC_BLOCK_SIZE)):
+            block_size = min(FLAC_BLOCK_SIZE, samples - start)
+            # Fixed block size, 44.1 kHz, independent stereo, 16 bits per sample.
+            if block_size == FLAC_BLOCK_SIZE:
+                header = b"\xff\xf8\xc9\x18" + _encode_utf8_number(number)
+            else:
+                header = b"\xff\xf8\x79\x18" + _encode_utf8_number(number) + struct.pack(">H", block_size - 1)
+            header += bytes([crc8(header)])
+            subframes = (b"\x02" + bytes(block_size * 2)) * CHANNELS  # verbatim subframes
+
+            if block_size not in zero_run_crcs:
+                zero_run_crcs[block_size] = _ZeroRunCrc16(length=(block_size * 2))
+            crc = crc16(b"\x02", crc=crc16(header))
+            crc = crc16(b"\x02", crc=zero_run_crcs[block_size](crc))
+            crc = zero_run_crcs[block_size](crc)
+            f.write(header + subframes + struct.pack(">H", crc))
+
+
+def write_mp3(path: Path, samples: int) -> None:
+    frame = MP3_FRAME_HEADER + bytes(MP3_FRAME_SIZE - len(MP3_FRAME_HEADER))
+    with path.open("wb") as f:
+        f.write(frame * -(-samples // MP3_FRAME_SAMPLES))
+
+
+WRITERS = {"wav": write_wav, "flac": write_flac, "mp3": write_mp3}
+
+
+def get_samples(suffix: str, size: int) -> int:
+    """The number of samples per channel making up a file of (about) the given size."""
+    if suffix == "mp3":
+        return (size // MP3_FRAME_SIZE) * MP3_FRAME_SAMPLES
+
+    return size // (CHANNELS * 2)
+
+
+def make_album(path: Path, suffix: str, tracks: int, discs: int, size: int) -> None:
+    """Writing the silent files of an album, one dir per disc if there are several."""
+    samples = get_samples(suffix=suffix, size=size)
+    for disc in range(1, discs + 1):
+        disc_dir = path if (discs == 1) else (path / f"CD {disc}")
+        disc_dir.mkdir(parents=True, exist_ok=True)
+        for track in range(1, tracks + 1):
+            WRITERS[suffix](path=(disc_dir / f"{track:02d} - Track.{suffix}"), samples=samples)
+
+
+class SyntheticAlbumInfoRepository(IAlbumInfoRepository):
+    """Serving the album info of synthetic albums, without going online."""
+
+    def __init__(self, tracks: int, discs: int, cover_art: bytes | None = None) -> None:
+        self.tracks = tracks
+        self.discs = discs
+        self.cover_art = cover_art
+
+    def query_album_id(
+        self, album_name: str, artist: str | None = None, year: int | None = None, track_count: int | None = None
+    ) -> str:
+        return "synthetic"
+
+    def get_cover_art(self, album_id: str) -> bytes | None:
+        return self.cover_art
+
+    def get_album_info(self, album_id: str, default_tags: DefaultTags) -> AlbumInfo:
+        info = AlbumInfo(
+            title="Synthetic Album",
+            artist="Synthetic Artist",
+            date=2001,
+            cover_art_data=self.get_cover_art(album_id=album_id),
+            total_discs=self.discs,
+        )
+        info.tracks = [
+            AudioTrackInfo(
+                album_info=info,
+                title=f"Track {disc}-{track}",
+                total_tracks=self.tracks,
+                track_number=track,
+                disc_number=(None if (self.discs == 1) else disc),
+            )
+            for disc in range(1, self.discs + 1)
+            for track in range(1, self.tracks + 1)
+        ]
+
+        return info
+
+
+def make_cover_art(size: int) -> bytes:
+    """A noisy JPEG of the given width and height, like a scan."""
+    import cv2 as cv
+    import numpy as np
+
+    image = np.random.default_rng(seed=0).integers(0, 256, size=(size, size, 3), dtype=np.uint8)
+    return cv.imencode(".jpg", image, [cv.IMWRITE_JPEG_QUALITY, 90])[1].tobytes()
+
+
+def time_stages(tagger: SimpleAlbumTagger, in_path: Path, out_path: Path) -> dict[str, float]:
+    """Running the stages of tag_album (the phase-by-phase path) one by one, returning their durations (ms)."""
+    timings, report = {}, TaggingReport()
+
+    def timed(stage: str, function, **kwargs):
+        start = time.perf_counter()
+        result = function(**kwargs)
+        timings[stage] = (time.perf_counter() - start) * 1000
+        return result
+
+    paths = timed("scan", tagger.audio_file_repo.get_audio_paths, path=in_path, suffix_filter=tagger.suffix_filter)
+    info = timed(
+        "album_info",
+        tagger._get_album_info,
+        album_query_params=AlbumQueryParams(album_id="synthetic"),
+        default_tags=DefaultTags(),
+        track_count=len(paths),
+    )
+    album = timed("collate", tagger._parse_audio_source, in_path=in_path, album_info=info, paths=paths)
+    target_structure = timed("plan", tagger._plan_restructuring, album=album, out_path=out_path)
+    pending_tracks = timed(
+        "restructure", tagger._restructure_album, album=album, target_structure=target_structure, report=report
+    )
+    report += timed("tag", tagger._perform_tagging, album=target_structure, tracks=pending_tracks)
+    timed(
+        "finalize",
+        tagger.audio_file_repo.finalize_restructuring,
+        source_structure=album,
+        target_structure=target_structure,
+    )
+    if report.written != len(info.tracks):
+        raise RuntimeError(f"{report.written} of {len(info.tracks)} files have been tagged.")
+
+    return timings
+
+
+def build_tagger(args: Namespace, cover_art: bytes | None) -> SimpleAlbumTagger:
+    return SimpleAlbumTagger(
+        album_info_repo=SyntheticAlbumInfoRepository(tracks=args.tracks, discs=args.discs, cover_art=cover_art),
+        audio_file_repo=SimpleAudioFileRepository(formatter=AlbumDirFormatter, copy_strategy=args.copy_strategy),
+        taggers=(MusicTagAudioFileTagger, Eye3DAudioFileTagger),
+        suffix_filter=None,
+        interactive=False,
+        tagging_workers=args.tagging_workers,
+        single_pass=args.single_pass,
+    )
+
+
+def run(args: Namespace, root: Path) -> dict[str, dict[str, float]]:
+    cover_art = None if (args.cover_art_size == 0) else make_cover_art(size=args.cover_art_size)
+    results = {}
+    for suffix in args.formats:
+        in_path = root / suffix / "Synthetic_Artist" / "Synthetic_Album"
+        make_album(path=in_path, suffix=suffix, tracks=args.tracks, discs=args.discs, size=int(args.track_mb * 2**20))
+
+        runs = []
+        # NOTE the warm-up runs (e.g. paying for the lazy imports of the tagging libs) are discarded
+        for i in range(args.warmup + args.runs):
+            out_path = root / f"out-{suffix}-{i}"
+            timings = time_stages(
+                tagger=build_tagger(args=args, cover_art=cover_art), in_path=in_path, out_path=out_path
+            )
+            shutil.rmtree(out_path)
+
+            # The same in one go, as the CLI runs it.
+            start = time.perf_counter()
+            build_tagger(args=args, cover_art=cover_art).tag_album(
+                in_path=in_path,
+                album_query_params=AlbumQueryParams(album_id="synthetic"),
+                default_tags=DefaultTags(),
+                out_path=out_path,
+            )
+            timings["tag_album"] = (time.perf_counter() - start) * 1000
+            shutil.rmtree(out_path)
+            if i >= args.warmup:
+                runs.append(timings)
+
+        results[suffix] = {stage: statistics.median(timings[stage] for timings in runs) for stage in runs[0]}
+        results[suffix]["total"] = sum(results[suffix][stage] for stage in STAGES)
+
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float, min_delta: float) -> list[str]:
+    """Printing the results next to the baseline, returning the stages that have regressed beyond the threshold.
+
+    Stages slowed down by less than the min delta (ms) are not considered regressions, as the timing of stages
+    taking a fraction of a millisecond is dominated by noise.
+    """
+    regressions = []
+    for suffix, timings in results.items():
+        print(f"{suffix}:")
+        for stage, duration in timings.items():
+            reference = baseline.get(suffix, {}).get(stage)
+            if reference is None:
+                print(f"  {stage + ':':<13} {duration:9.2f} ms")
+                continue
+
+            change = (duration - reference) / reference if (reference > 0) else 0.0
+            print(f"  {stage + ':':<13} {duration:9.2f} ms (baseline {reference:9.2f} ms, {change:+7.1%})")
+            if (change > threshold) and (duration - reference > min_delta):
+                regressions.append(f"{suffix}/{stage}")
+
+    return regressions
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Timing the stages of tagging synthetic albums.")
+    parser.add_argument("--tracks", type=int, default=12, help="the number of tracks per disc.")
+    parser.add_argument("--discs", type=int, default=1, help="the number of discs per album.")
+    parser.add_argument("--track-mb", type=float, default=8.0, help="the size of every audio file (in MB).")
+    parser.add_argument(
+        "--formats",
+        type=lambda value: value.split(","),
+        default=list(WRITERS),
+        help=f"a comma-separated list of the formats to benchmark (of {', '.join(WRITERS)}).",
+    )
+    parser.add_argument("--cover-art-size", type=int, default=1000, help="the width of the cover art, 0 for none.")
+    parser.add_argument("--runs", type=int, default=5, help="the number of runs, the median of which is reported.")
+    parser.add_argument("--warmup", type=int, default=1, help="the number of runs to discard beforehand.")
+    parser.add_argument("--tagging-workers", type=int, default=1, help="see --tagging-workers of the tagger.")
+    parser.add_argument("--single-pass", action="store_true", help="see --single-pass of the tagger.")
+    parser.add_argument(
+        "--copy-strategy", type=CopyStrategy, default=CopyStrategy.AUTO, help="see --copy-strategy of the tagger."
+    )
+    parser.add_argument("--root", type=Path, help="the dir to generate albums in (e.g. on a given device).")
+    parser.add_argument("--output", type=Path, help="a JSON file to save the results to (e.g. as a baseline).")
+    parser.add_argument("--baseline", type=Path, help="a JSON file of earlier results to compare with.")
+    parser.add_argument(
+        "--threshold", type=float, default=0.1, help="the slowdown (e.g. 0.1 for 10%%) failing a stage."
+    )
+    parser.add_argument("--min-delta", type=float, default=1.0, help="the slowdown (ms) below which stages never fail.")
+    args = parser.parse_args()
+    unknown = set(args.formats) - set(WRITERS)
+    if len(unknown) > 0:
+        parser.error(f"argument --formats: unsupported formats: {', '.join(sorted(unknown))}")
+
+    with tempfile.TemporaryDirectory(dir=args.root) as tmp:
+        results = run(args=args, root=Path(tmp))
+
+    baseline = {} if (args.baseline is None) else json.loads(args.baseline.read_text(encoding="utf-8"))["results"]
+    regressions = compare(results=results, baseline=baseline, threshold=args.threshold, min_delta=args.min_delta)
+    if args.output is not None:
+        config = {
+            key: (value.value if isinstance(value, CopyStrategy) else value)
+            for key, value in vars(args).items()
+            if key not in ("root", "output", "baseline", "threshold", "min_delta")
+        }
+        environment = {"python": platform.python_version(), "platform": platform.platform()}
+        document = {"config": config, "environment": environment, "results": results}
+        args.output.write_text(json.dumps(document, indent=2), encoding="utf-8")
+
+    if len(regressions) > 0:
+        print(f"Regressions beyond {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+"""Micro-benchmark of the per-track tagging overhead.
+
+Applies the tags of a synthetic album to an in-memory song once per track, comparing mappers
+instantiated and dispatched per track (as before tag plans) with the cached tag plan of the
+format. Nothing is written to disk, so only the mapping itself is measured.
+
+Usage:
+    python benchmarks/tag_plan.py [--tracks 10000] [--runs 3] [--cover-art cover.jpg]
+"""
+
+import io
+import sys
+import time
+import wave
+from argparse import ArgumentParser
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sootworks.audio_tagger.domain.model import AlbumInfo, AudioTrackInfo  # noqa: E402
+from sootworks.audio_tagger.infrastructure.tagging_lib import MusicTagAudioFileTagger  # noqa: E402
+
+
+SUFFIX = "wav"
+
+
+def make_song(tagger=MusicTagAudioFileTagger):
+    """Loading a short silent WAV file from memory."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as f:
+        f.setnchannels(2)
+        f.setsampwidth(2)
+        f.setframerate(44100)
+        f.writeframes(b"\0" * 4 * 4410)
+
+    buffer.seek(0)
+    return tagger.get_song_from_buffer(buffer=buffer, path=Path(f"track.{SUFFIX}"))
+
+
+def make_album_info(tracks: int, cover_art: bytes | None) -> AlbumInfo:
+    info = AlbumInfo(title="Synthetic Album", artist="Synthetic Artist", date=2001, cover_art_data=cover_art)
+    info.tracks = [
+        AudioTrackInfo(album_info=info, title=f"Track {i}", total_tracks=tracks, track_number=i, genre="Metal")
+        for i in range(1, tracks + 1)
+    ]
+    return info
+
+
+def tag_per_track(song, info: AlbumInfo, tagger=MusicTagAudioFileTagger) -> None:
+    for track_info in info.tracks:
+        for mapper in tagger.get_mappers(suffix=SUFFIX):
+            mapper(song=song, track_info=track_info)
+
+
+def tag_with_plan(song, info: AlbumInfo, tagger=MusicTagAudioFileTagger) -> None:
+    for track_info in info.tracks:
+        tagger.get_tag_plan(suffix=SUFFIX).apply(song=song, track_info=track_info)
+
+
+def measure(function, song, info: AlbumInfo, runs: int) -> float:
+    """Returning the best per-track time (µs) of the given runs."""
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        function(song, info)
+        best = min(best, time.perf_counter() - start)
+
+    return best / len(info.tracks) * 1e6
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Measuring the per-track overhead of applying tags.")
+    parser.add_argument("--tracks", type=int, default=10_000, help="the number of tracks of the synthetic album.")
+    parser.add_argument("--runs", type=int, default=3, help="the number of runs, the best of which is reported.")
+    parser.add_argument("--cover-art", type=Path, default=None, help="a JPEG image to embed in every track.")
+    args = parser.parse_args()
+
+    cover_art = None if (args.cover_art is None) else args.cover_art.read_bytes()
+    info, song = make_album_info(tracks=args.tracks, cover_art=cover_art), make_song()
+
+    per_track = measure(tag_per_track, song=song, info=info, runs=args.runs)
+    with_plan = measure(tag_with_plan, song=song, info=info, runs=args.runs)
+
+    print(f"tracks: {args.tracks}, cover art: {'yes' if cover_art else 'no'}")
+    print(f"  per-track mappers: {per_track:8.1f} µs/track")
+    print(f"  tag plan:          {with_plan:8.1f} µs/track ({per_track / with_plan:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
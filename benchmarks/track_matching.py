@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark of matching audio files to tracks by duration.
+
+Shuffles the files of a synthetic box set (durations jittered by a few hundred milliseconds),
+and measures the assignment with SciPy (if installed) and with the NumPy fallback, along with
+reading the durations of WAV files from disk sequentially and on a thread pool.
+
+Usage:
+    python benchmarks/track_matching.py [--tracks 300] [--runs 5] [--files 200] [--workers 8]
+"""
+
+import sys
+import tempfile
+import time
+import wave
+from argparse import ArgumentParser
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sootworks.audio_tagger.infrastructure.audio_file import DurationTrackMatcher  # noqa: E402
+from sootworks.audio_tagger.infrastructure.audio_file._duration_matcher import _solve_hungarian  # noqa: E402
+
+
+def measure(function, runs: int) -> float:
+    """Returning the best time (ms) of the given runs."""
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+
+    return best * 1000
+
+
+def make_wav(path: Path, frames: int) -> None:
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(2)
+        f.setsampwidth(2)
+        f.setframerate(44100)
+        f.writeframes(b"\0" * 4 * frames)
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Measuring duration-based matching of files to tracks.")
+    parser.add_argument("--tracks", type=int, default=300, help="the number of tracks to assign files to.")
+    parser.add_argument("--runs", type=int, default=5, help="the number of runs, the best of which is reported.")
+    parser.add_argument("--files", type=int, default=200, help="the number of files whose durations are read.")
+    parser.add_argument("--workers", type=int, default=8, help="the number of threads reading durations.")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(seed=0)
+    lengths = rng.uniform(60, 600, size=args.tracks)
+    durations = (lengths + rng.uniform(-0.5, 0.5, size=args.tracks))[rng.permutation(args.tracks)]
+    costs = np.abs(durations[:, np.newaxis] - lengths[np.newaxis, :])
+
+    matcher = DurationTrackMatcher()
+    print(f"tracks: {args.tracks}")
+    assign = lambda: matcher._assign(durations=list(durations), lengths=list(lengths))  # noqa: E731
+    print(f"  assignment (matcher):   {measure(assign, args.runs):8.2f} ms")
+    print(f"  Hungarian (NumPy):      {measure(lambda: _solve_hungarian(costs), args.runs):8.2f} ms")
+    try:
+        from scipy.optimize import linear_sum_assignment
+
+        print(f"  linear_sum_assignment:  {measure(lambda: linear_sum_assignment(costs), args.runs):8.2f} ms")
+    except ImportError:
+        print("  linear_sum_assignment:  (SciPy is not installed)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [Path(tmp) / f"{i:03d}.wav" for i in range(args.files)]
+        for i, path in enumerate(paths):
+            make_wav(path=path, frames=(4410 * (i % 7 + 1)))
+
+        sequential, parallel = DurationTrackMatcher(workers=1), DurationTrackMatcher(workers=args.workers)
+        print(f"files: {args.files}")
+        for name, matcher in (("sequential", sequential), (f"{args.workers} workers", parallel)):
+            duration = measure(lambda: matcher.get_durations(paths=paths), args.runs)
+            print(f"  durations, {name + ':':<12} {duration:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
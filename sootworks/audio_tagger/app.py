@@ -3,27 +3,74 @@
 """Application entry point.
 """
 
-from argparse import ArgumentParser
+import os
+import re
+from argparse import ArgumentParser, Namespace
+from functools import partial
 from pathlib import Path
 
-from sootworks.audio_tagger.application.const import APP, VERSION, CONTACT
+from termcolor import colored
+
+from sootworks.audio_tagger.application.const import APP, VERSION, CONTACT, DEFAULT_STATE_DIR, TaggingParallelism
 from sootworks.audio_tagger.infrastructure.tagging_lib import Eye3DAudioFileTagger, MusicTagAudioFileTagger
-from sootworks.audio_tagger.infrastructure.album_info import MusicBrainzAlbumInfoRepository
-from sootworks.audio_tagger.infrastructure.audio_file import SimpleAudioFileRepository
+from sootworks.audio_tagger.infrastructure.album_info import (
+    ArtworkStore,
+    AsyncMusicBrainzAlbumInfoRepository,
+    MusicBrainzAlbumInfoRepository,
+    MusicBrainzDumpAlbumInfoRepository,
+    OpenCVArtworkPreparer,
+    ReleaseCache,
+    ReleaseDatabase,
+    ReleaseIndex,
+    TokenBucketRateLimiter,
+)
+from sootworks.audio_tagger.infrastructure.audio_file import DurationTrackMatcher, SimpleAudioFileRepository
+from sootworks.audio_tagger.infrastructure.manifest import JsonAlbumManifestRepository
+from sootworks.audio_tagger.infrastructure.review import JsonReviewQueueRepository
+from sootworks.audio_tagger.infrastructure.tracing import JsonLinesTraceSink, StderrSummaryTraceSink
+from sootworks.audio_tagger.application.approval import ApprovalPolicy
 from sootworks.audio_tagger.application.audio_tagger import SimpleAlbumTagger
+from sootworks.audio_tagger.application.batch_tagger import AlbumJob, BatchAlbumTagger, load_manifest
 from sootworks.audio_tagger.application.exceptions import AudioTaggingCancelled
-from sootworks.audio_tagger.domain.model import AlbumQueryParams, DefaultTags
-from sootworks.audio_tagger.domain.repository import AlbumDirFormatter, IAudioTagMapper
+from sootworks.audio_tagger.domain.const import ArtworkPlacement, CopyStrategy
+from sootworks.audio_tagger.domain.exceptions import AlbumInfoUnavailableError
+from sootworks.audio_tagger.domain.model import AlbumQueryParams, ArtworkPolicy, DefaultTags
+from sootworks.audio_tagger.domain.repository import (
+    AlbumDirFormatter,
+    AudioFileTaggerRouter,
+    IAudioFileTagger,
+    ITraceSink,
+    Tracer,
+)
+
 
+DEFAULT_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "audio_tagger"
 
-# Type declarations
-InPath = OutPath = Path
-SuffixFilter = str
+ALBUM_DIR_NAME_WITH_YEAR = re.compile(r"^(?P<name>.+?)[\s_]*\((?P<year>\d{4})\)$")
 
 
-def parse_args() -> tuple[InPath, AlbumQueryParams, DefaultTags, SuffixFilter, OutPath]:
+def parse_args() -> tuple[Namespace, AlbumQueryParams, DefaultTags]:
     parser = ArgumentParser(description=("Tagging audio recordings."))
-    parser.add_argument("path", type=Path, help="absolute path of the album directory")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("path", nargs="?", type=Path, help="absolute path of the album directory")
+    source.add_argument(
+        "--manifest",
+        type=Path,
+        help=(
+            "batch mode: a JSON file mapping album directories to MusicBrainz release IDs"
+            ' (e.g. {"/path/to/album": "<MUSICBRAINZ_RELEASE_ID>"}).'
+        ),
+    )
+    source.add_argument(
+        "--library-root",
+        type=Path,
+        help="batch mode: a directory under which album directories are to be discovered.",
+    )
+    source.add_argument(
+        "--execute-approved",
+        action="store_true",
+        help="processing the albums of the review queue that have been approved (see review-albums).",
+    )
     parser.add_argument("-n", "--album-name", help="the name of the album")
     parser.add_argument("-a", "--album-artist", dest="artist", help="the name of the album artist")
     parser.add_argument("-y", "--album-year-of-release", dest="year", help="the release year of the album")
@@ -60,9 +107,259 @@ def parse_args() -> tuple[InPath, AlbumQueryParams, DefaultTags, SuffixFilter, O
     parser.add_argument(
         "-o", "--output", type=Path, default=Path("."), help="the dir to which the tagged audio files are to be written"
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="batch mode: the number of albums to process in parallel (defaults to the number of CPUs).",
+    )
+    parser.add_argument(
+        "--tagging-workers",
+        type=int,
+        default=1,
+        help="the number of threads tagging the files of an album concurrently (useful for network storage).",
+    )
+    parser.add_argument(
+        "--tagging-parallelism",
+        type=TaggingParallelism,
+        choices=list(TaggingParallelism),
+        metavar="{" + ",".join(parallelism.value for parallelism in TaggingParallelism) + "}",
+        default=TaggingParallelism.TRACK,
+        help="whether tracks or whole media (discs) are to be handed to the tagging threads.",
+    )
+    parser.add_argument(
+        "--scan-workers",
+        type=int,
+        default=1,
+        help="the number of threads scanning sibling dirs for audio files concurrently (useful for network storage).",
+    )
+    parser.add_argument(
+        "--copy-strategy",
+        type=CopyStrategy,
+        choices=list(CopyStrategy),
+        metavar="{" + ",".join(strategy.value for strategy in CopyStrategy) + "}",
+        default=CopyStrategy.AUTO,
+        help=(
+            "how the audio files are to be copied. 'auto' uses reflinks or in-kernel copies where supported;"
+            " with 'hardlink' the source files get tagged as well, as they share their data with the copies."
+            " Unsupported strategies (e.g. across devices) fall back to regular copies."
+        ),
+    )
+    parser.add_argument(
+        "--move",
+        action="store_true",
+        help=(
+            "moving the audio files rather than copying them (renaming them where possible), the emptied source"
+            " dirs are removed once the album has been tagged. If tagging fails the files are moved back, though"
+            " those tagged by then keep their new tags (the originals aren't kept, use copies to be safe)."
+        ),
+    )
+    parser.add_argument(
+        "--single-pass",
+        action="store_true",
+        help=(
+            "tagging files in memory while they are being copied, so that each target file is written only once"
+            " (large, moved, linked or reflinked files are tagged in place as they are transferred, and formats whose"
+            " tagging lib doesn't support this after all files have been copied)."
+        ),
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help=(
+            "tagging the files of an album while the rest are still being copied, overlapping reads, writes and tag"
+            " encoding (a single thread per stage, --tagging-workers doesn't apply)."
+        ),
+    )
+    parser.add_argument(
+        "--tagger-override",
+        action="append",
+        default=[],
+        metavar="SUFFIX=TAGGING_LIB",
+        help=(
+            "the tagging lib to use for files of the given format, rather than the preferred one (e.g. mp3=eye3D)."
+            " May be given multiple times."
+        ),
+    )
+    parser.add_argument(
+        "--match-durations",
+        action="store_true",
+        help=(
+            "matching files to tracks by comparing their durations with the track lengths, rather than by their"
+            " order of names. Albums matched with a low confidence are only processed interactively."
+        ),
+    )
+    parser.add_argument(
+        "--match-tolerance",
+        type=float,
+        default=3.0,
+        help="the max difference (in seconds) of a file's duration and the length of the track it's matched to.",
+    )
+    parser.add_argument(
+        "--min-match-confidence",
+        type=float,
+        default=0.9,
+        help="the min share of tracks whose files have to match them for the match to be trusted.",
+    )
+    parser.add_argument(
+        "--unattended",
+        action="store_true",
+        help=(
+            "never prompting the user, albums not meeting the approval criteria (e.g. --min-match-confidence with"
+            " --match-durations) are planned and queued for review instead of being processed."
+        ),
+    )
+    parser.add_argument(
+        "--require-album-id",
+        action="store_true",
+        help="unattended mode: queueing albums whose release ID has been searched for rather than given.",
+    )
+    parser.add_argument(
+        "--require-cover-art",
+        action="store_true",
+        help="unattended mode: queueing albums for which no cover art has been found.",
+    )
+    parser.add_argument(
+        "--review-dir",
+        type=Path,
+        help="the dir in which albums queued for review are kept (defaults to the 'review' dir of the state dir).",
+    )
+    parser.add_argument(
+        "--state-dir",
+        type=Path,
+        default=DEFAULT_STATE_DIR,
+        help="the dir in which the manifests of processed albums are kept, for skipping unchanged albums.",
+    )
+    parser.add_argument(
+        "-f", "--force", action="store_true", help="processing albums even if they haven't changed since the last run."
+    )
+    parser.add_argument(
+        "--fast-hash",
+        action="store_true",
+        help="also hashing the head and tail of the source files when telling whether an album has changed.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=DEFAULT_CACHE_DIR,
+        help="the dir in which MusicBrainz responses are cached between runs.",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="disabling the MusicBrainz response cache.")
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=30.0,
+        help="the number of days after which cached MusicBrainz responses are refreshed.",
+    )
+    parser.add_argument(
+        "--artwork-quota",
+        type=float,
+        default=1024.0,
+        help=(
+            "the disk space (in MB) the cached cover art may take up before the least recently used images"
+            " are evicted."
+        ),
+    )
+    parser.add_argument(
+        "--artwork-max-size",
+        type=int,
+        default=0,
+        help="the max width and height (in pixels) of the cover art embedded into the tracks, no limit by default.",
+    )
+    parser.add_argument(
+        "--artwork-max-kb",
+        type=int,
+        default=0,
+        help=(
+            "the max size (in KB) of the cover art embedded into the tracks, images are recompressed (and downscaled"
+            " if need be) to fit it, no limit by default."
+        ),
+    )
+    parser.add_argument(
+        "--artwork-placement",
+        type=ArtworkPlacement,
+        choices=list(ArtworkPlacement),
+        metavar="{" + ",".join(placement.value for placement in ArtworkPlacement) + "}",
+        default=ArtworkPlacement.EMBED,
+        help=(
+            "where the cover art goes: embedded into every track, written once per album next to the tracks as a"
+            " sidecar image (read by media servers such as Emby, Plex or Kodi), both, or embedded into the first"
+            " track only."
+        ),
+    )
+    parser.add_argument(
+        "--artwork-sidecar-name",
+        default="folder.jpg",
+        help="the file name of the sidecar cover art (e.g. cover.jpg).",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="only serving album info from the cache, without contacting MusicBrainz.",
+    )
+    parser.add_argument(
+        "--async-client",
+        action="store_true",
+        help=(
+            "fetching album info through pooled connections, prefetching the albums of a batch concurrently."
+            " The MusicBrainz rate limit is shared by all worker processes."
+        ),
+    )
+    parser.add_argument(
+        "--musicbrainz-url",
+        default=AsyncMusicBrainzAlbumInfoRepository.MUSICBRAINZ_URL,
+        help="the root URL of the MusicBrainz web service (async client only, e.g. for a mirror or stub server).",
+    )
+    parser.add_argument(
+        "--cover-art-archive-url",
+        default=AsyncMusicBrainzAlbumInfoRepository.COVER_ART_ARCHIVE_URL,
+        help="the root URL of the Cover Art Archive (async client only).",
+    )
+    parser.add_argument(
+        "--musicbrainz-db",
+        type=Path,
+        help=(
+            "serving album info from a release database imported from a MusicBrainz JSON dump (see"
+            " import-musicbrainz-dump), without contacting MusicBrainz. Cover art is only taken from the cache."
+        ),
+    )
+
+    parser.add_argument(
+        "--trace",
+        type=Path,
+        help=(
+            "a JSON lines file to append the timings of every stage, request, file transfer and track to (e.g."
+            " trace.jsonl), shared by the workers of a batch."
+        ),
+    )
+    parser.add_argument(
+        "--trace-summary",
+        action="store_true",
+        help="printing a summary of the timings of every album to stderr once it's processed.",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        help=(
+            "profiling the run with cProfile, writing the stats to the given file (e.g. run.pstats, see python -m"
+            " pstats). The workers of batch mode aren't profiled."
+        ),
+    )
 
     args = parser.parse_args()
 
+    if args.review_dir is None:
+        args.review_dir = args.state_dir / "review"
+
+    args.tagger_overrides = {}
+    for override in args.tagger_override:
+        suffix, _, tagging_lib = override.partition("=")
+        args.tagger_overrides[suffix] = tagging_lib
+    try:
+        AudioFileTaggerRouter(taggers=get_taggers(), overrides=args.tagger_overrides)
+    except ValueError as e:
+        parser.error(f"argument --tagger-override: {e}")
+
     album_query_params = AlbumQueryParams(
         album_id=args.album_id,
         album_name=args.album_name,
@@ -77,34 +374,262 @@ def parse_args() -> tuple[InPath, AlbumQueryParams, DefaultTags, SuffixFilter, O
         comment=args.comment,
     )
 
-    return args.path, album_query_params, default_tags, args.suffix_filter, args.output
+    return args, album_query_params, default_tags
+
+
+def get_taggers() -> tuple[IAudioFileTagger]:
+    """The registered taggers in order of priority, formats supported by several of them are routed to the first."""
+    return (
+        MusicTagAudioFileTagger,  # preferred
+        Eye3DAudioFileTagger,
+    )
+
 
+def build_tracer(args: Namespace) -> Tracer:
+    sinks: list[ITraceSink] = []
+    if args.trace is not None:
+        sinks.append(JsonLinesTraceSink(path=args.trace))
+    if args.trace_summary:
+        sinks.append(StderrSummaryTraceSink())
 
-def get_mappers() -> dict[str, tuple[IAudioTagMapper]]:
-    return {
-        MusicTagAudioFileTagger.compatible_tagging_lib: MusicTagAudioFileTagger.get_mappers(),  # preferred
-        Eye3DAudioFileTagger.compatible_tagging_lib: Eye3DAudioFileTagger.get_mappers(),
-    }
+    return Tracer(sinks=tuple(sinks))
 
 
-def main() -> None:
-    in_path, album_query_params, default_tags, suffix_filter, out_path = parse_args()
+def build_album_info_repo(
+    args: Namespace, interactive: bool = True, tracer: Tracer | None = None
+) -> MusicBrainzAlbumInfoRepository:
+    release_cache, artwork_store, release_index = None, None, None
+    if not args.no_cache:
+        release_cache = ReleaseCache(path=(args.cache_dir / "releases.sqlite"), ttl=(args.cache_ttl * 24 * 60 * 60))
+        artwork_store = ArtworkStore(path=(args.cache_dir / "artwork"), quota=int(args.artwork_quota * 1024 * 1024))
+        release_index = ReleaseIndex(path=(args.cache_dir / "searches.sqlite"), ttl=(args.cache_ttl * 24 * 60 * 60))
+    if args.musicbrainz_db is not None:
+        return MusicBrainzDumpAlbumInfoRepository(
+            app=APP,
+            version=VERSION,
+            contact=CONTACT,
+            database=ReleaseDatabase(path=args.musicbrainz_db),
+            interactive=interactive,
+            artwork_store=artwork_store,
+            tracer=tracer,
+        )
 
-    album_info_repo = MusicBrainzAlbumInfoRepository(app=APP, version=VERSION, contact=CONTACT)
-    audio_file_repo = SimpleAudioFileRepository(formatter=AlbumDirFormatter)
-    tagger = SimpleAlbumTagger(
+    params = dict(
+        app=APP,
+        version=VERSION,
+        contact=CONTACT,
+        interactive=interactive,
+        release_cache=release_cache,
+        artwork_store=artwork_store,
+        offline=args.offline,
+        release_index=release_index,
+        tracer=tracer,
+    )
+    if not args.async_client:
+        return MusicBrainzAlbumInfoRepository(**params)
+
+    return AsyncMusicBrainzAlbumInfoRepository(
+        **params,
+        # Shared by the worker processes of a batch, and by concurrent runs.
+        rate_limiter=TokenBucketRateLimiter(name="musicbrainz", path=(args.state_dir / "rate_limit.sqlite")),
+        musicbrainz_url=args.musicbrainz_url,
+        cover_art_archive_url=args.cover_art_archive_url,
+    )
+
+
+def build_artwork_policy(args: Namespace) -> ArtworkPolicy:
+    return ArtworkPolicy(
+        max_dimension=(args.artwork_max_size or None),
+        max_bytes=((args.artwork_max_kb * 1024) or None),
+    )
+
+
+def build_approval_policy(args: Namespace) -> ApprovalPolicy | None:
+    if not args.unattended:
+        return None
+
+    return ApprovalPolicy(
+        min_match_confidence=(args.min_match_confidence if args.match_durations else None),
+        require_album_id=args.require_album_id,
+        require_cover_art=args.require_cover_art,
+    )
+
+
+def build_album_tagger(args: Namespace, interactive: bool = True) -> SimpleAlbumTagger:
+    interactive = interactive and (not args.unattended)
+    # Shared by the repositories, so that their spans are nested in those of the album tagger.
+    tracer = build_tracer(args=args)
+    album_info_repo = build_album_info_repo(args=args, interactive=interactive, tracer=tracer)
+    audio_file_repo = SimpleAudioFileRepository(
+        formatter=AlbumDirFormatter,
+        copy_strategy=args.copy_strategy,
+        move=args.move,
+        scan_workers=args.scan_workers,
+        artwork_placement=args.artwork_placement,
+        sidecar_name=args.artwork_sidecar_name,
+        tracer=tracer,
+    )
+
+    return SimpleAlbumTagger(
         album_info_repo=album_info_repo,
         audio_file_repo=audio_file_repo,
-        taggers=(MusicTagAudioFileTagger, Eye3DAudioFileTagger),
-        suffix_filter=suffix_filter,
+        taggers=get_taggers(),
+        suffix_filter=args.suffix_filter,
+        tagger_overrides=args.tagger_overrides,
+        interactive=interactive,
+        tagging_workers=args.tagging_workers,
+        tagging_parallelism=args.tagging_parallelism,
+        single_pass=args.single_pass,
+        pipelined=args.pipeline,
+        manifest_repo=JsonAlbumManifestRepository(path=(args.state_dir / "manifests")),
+        force=args.force,
+        fast_hash=args.fast_hash,
+        track_matcher=(
+            DurationTrackMatcher(tolerance=args.match_tolerance, min_confidence=args.min_match_confidence)
+            if args.match_durations
+            else None
+        ),
+        approval_policy=build_approval_policy(args=args),
+        review_queue=JsonReviewQueueRepository(path=args.review_dir),
+        artwork_preparer=OpenCVArtworkPreparer(
+            policy=build_artwork_policy(args=args), artwork_store=album_info_repo.artwork_store
+        ),
+        tracer=tracer,
     )
+
+
+def guess_album_query_params(
+    in_path: Path, album_query_params: AlbumQueryParams, library_root: Path | None = None
+) -> AlbumQueryParams:
+    """Taking the album name (and year) and the artist of unidentified albums from their dir names.
+
+    Dir names are expected to be laid out as 'Artist/Album' or 'Artist/Album_(Year)', the artist is only taken from
+    dirs below the library root.
+    """
+    if (album_query_params.album_id is not None) or (album_query_params.album_name is not None):
+        return album_query_params
+
+    update = {"album_name": in_path.name.replace("_", " ")}
+    if (match := ALBUM_DIR_NAME_WITH_YEAR.match(in_path.name)) is not None:
+        update["album_name"] = match["name"].replace("_", " ")
+        update["year"] = album_query_params.year if (album_query_params.year is not None) else int(match["year"])
+    if (album_query_params.artist is None) and (in_path.parent != library_root):
+        update["artist"] = in_path.parent.name.replace("_", " ")
+
+    return album_query_params.copy(update=update)
+
+
+def get_album_jobs(args: Namespace, album_query_params: AlbumQueryParams, default_tags: DefaultTags) -> list[AlbumJob]:
+    if args.manifest is not None:
+        album_ids = load_manifest(path=args.manifest)
+    else:
+        audio_file_repo = SimpleAudioFileRepository(formatter=AlbumDirFormatter, scan_workers=args.scan_workers)
+        album_ids = {album_dir: None for album_dir in audio_file_repo.get_album_dirs(path=args.library_root)}
+
+    return [
+        AlbumJob(
+            in_path=in_path,
+            album_query_params=guess_album_query_params(
+                in_path=in_path,
+                album_query_params=album_query_params.copy(update={"album_id": album_id}),
+                library_root=args.library_root,
+            ),
+            default_tags=default_tags,
+            out_path=args.output,
+        )
+        for in_path, album_id in album_ids.items()
+    ]
+
+
+def tag_library(args: Namespace, album_query_params: AlbumQueryParams, default_tags: DefaultTags) -> None:
+    jobs = get_album_jobs(args=args, album_query_params=album_query_params, default_tags=default_tags)
+
+    # Workers can't prompt the user, hence the non-interactive taggers.
+    batch_tagger = BatchAlbumTagger(
+        tagger_factory=partial(build_album_tagger, args=args, interactive=False),
+        max_workers=args.jobs,
+    )
+
+    prefetcher = None
+    if args.async_client and (args.musicbrainz_db is None) and (not args.no_cache):
+        # Releases and cover art are fetched into the shared caches ahead of the workers asking for them.
+        prefetcher = build_album_info_repo(args=args, interactive=False)
+        prefetcher.prefetch(
+            album_ids=[job.album_query_params.album_id for job in jobs if job.album_query_params.album_id]
+        )
     try:
-        tagger.tag_album(
-            in_path=in_path, album_query_params=album_query_params, default_tags=default_tags, out_path=out_path
+        results = batch_tagger.tag_albums(
+            jobs=jobs, on_result=lambda result: print(f"[{result.status.value}] {result.in_path}")
+        )
+    finally:
+        if prefetcher is not None:
+            prefetcher.close()
+    print(batch_tagger.summarize(results=results))
+
+
+def tag_approved_albums(args: Namespace) -> None:
+    tagger = build_album_tagger(args=args, interactive=False)
+    items = [item for item in tagger.review_queue.get_items() if item.approved]
+    if len(items) == 0:
+        print(f"No approved albums in {args.review_dir}.")
+        return
+
+    written, failed = 0, 0
+    for item in items:
+        try:
+            report = tagger.tag_reviewed_album(item=item)
+        except Exception as e:
+            print(colored(f"Failed to process {item.in_path}: {e}", "light_red"))
+            failed += 1
+            continue
+        print(colored(f"Processed {item.in_path}: {report.written} file(s) tagged.", "light_green"))
+        written += report.written
+
+    print(f"Processed {len(items) - failed} approved album(s), tags written to {written} file(s), {failed} failed.")
+    tagger.close()
+
+
+def run(args: Namespace, album_query_params: AlbumQueryParams, default_tags: DefaultTags) -> None:
+    if args.execute_approved:
+        tag_approved_albums(args=args)
+        return
+
+    if args.path is None:
+        tag_library(args=args, album_query_params=album_query_params, default_tags=default_tags)
+        return
+
+    tagger = build_album_tagger(args=args)
+    try:
+        report = tagger.tag_album(
+            in_path=args.path, album_query_params=album_query_params, default_tags=default_tags, out_path=args.output
         )
     except AudioTaggingCancelled as e:
         print(f"Exiting due to {e}")
         exit(0)
+    except AlbumInfoUnavailableError as e:
+        print(f"Exiting due to {e}")
+        exit(1)
+    finally:
+        tagger.close()
+
+    print(f"Tags written to {report.written} file(s), {report.skipped} file(s) already up to date.")
+
+
+def main() -> None:
+    args, album_query_params, default_tags = parse_args()
+    if args.profile is None:
+        run(args=args, album_query_params=album_query_params, default_tags=default_tags)
+        return
+
+    import cProfile
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.runcall(run, args=args, album_query_params=album_query_params, default_tags=default_tags)
+    finally:
+        # NOTE written even if the run has failed or exited, as slow failures are worth profiling too
+        profiler.dump_stats(args.profile)
+        print(f"Profile written to {args.profile} (see python -m pstats {args.profile})")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+
+"""Deciding whether planned albums may be processed without being reviewed by the user."""
+
+from pydantic import BaseModel
+
+from sootworks.audio_tagger.domain.model import Album, AlbumQueryParams
+
+
+class ApprovalPolicy(BaseModel):
+    """The criteria albums have to meet in unattended mode, those failing any of them are queued for review.
+
+    The number of files is always checked against the number of tracks when files are collated, albums whose track
+    counts don't match exactly fail rather than being queued, as no restructuring can be planned for them.
+    """
+
+    min_match_confidence: float | None = None  # requiring files to have been matched to tracks by duration
+    require_album_id: bool = False  # requiring the release ID to have been given, rather than searched for
+    require_cover_art: bool = False
+
+    def get_rejection_reasons(self, album: Album, album_query_params: AlbumQueryParams) -> list[str]:
+        """Returning why the album isn't approved, an empty list meaning that it is."""
+        reasons = []
+        if self.min_match_confidence is not None:
+            if album.match_confidence is None:
+                reasons.append("files couldn't be matched to tracks by duration")
+            elif album.match_confidence < self.min_match_confidence:
+                reasons.append(f"files match tracks by duration with a low confidence ({album.match_confidence:.0%})")
+        if self.require_album_id and (album_query_params.album_id is None):
+            reasons.append(f"the release has been searched for ({album.info.album_id})")
+        if self.require_cover_art and (album.info.cover_art_data is None):
+            reasons.append("no cover art has been found")
+
+        return reasons
@@ -1,15 +1,49 @@
 # -*- coding: utf-8 -*-
 
 
+import base64
+import contextvars
+import hashlib
 import io
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
+from typing import Any, BinaryIO, Callable
 
 from termcolor import colored
 
-from sootworks.audio_tagger.application.exceptions import AudioTaggingCancelled
+from sootworks.audio_tagger.application.approval import ApprovalPolicy
+from sootworks.audio_tagger.application.const import TaggingParallelism
+from sootworks.audio_tagger.application.exceptions import AlbumQueuedForReview, AlbumUnchanged, AudioTaggingCancelled
+from sootworks.audio_tagger.application.pipeline import Pipeline
 from sootworks.audio_tagger.application.specification import IAlbumTagger
-from sootworks.audio_tagger.domain.model import Album, AlbumInfo, AlbumQueryParams, AudioMedium, DefaultTags
-from sootworks.audio_tagger.domain.repository import IAlbumInfoRepository, IAudioFileRepository, IAudioFileTagger
+from sootworks.audio_tagger.domain.const import TagType
+from sootworks.audio_tagger.domain.exceptions import AlbumInfoValidationError
+from sootworks.audio_tagger.domain.model import (
+    Album,
+    AlbumInfo,
+    AlbumManifest,
+    AlbumQueryParams,
+    AudioMedium,
+    AudioTrackInfo,
+    DefaultTags,
+    ReviewItem,
+    TaggingReport,
+)
+from sootworks.audio_tagger.domain.repository import (
+    AudioFileRewrite,
+    AudioFileTaggerRouter,
+    IAlbumInfoRepository,
+    IAlbumManifestRepository,
+    IArtworkPreparer,
+    IAudioFileRepository,
+    IAudioFileTagger,
+    IReviewQueueRepository,
+    ITrackMatcher,
+    TagPlan,
+    Tracer,
+)
 
 
 class SimpleAlbumTagger(IAlbumTagger):
@@ -19,11 +53,51 @@ class SimpleAlbumTagger(IAlbumTagger):
         audio_file_repo: IAudioFileRepository,
         taggers: tuple[IAudioFileTagger],
         suffix_filter: str,
+        tagger_overrides: dict[str, str] | None = None,
+        interactive: bool = True,
+        tagging_workers: int = 1,
+        tagging_parallelism: TaggingParallelism = TaggingParallelism.TRACK,
+        single_pass: bool = False,
+        pipelined: bool = False,
+        manifest_repo: IAlbumManifestRepository | None = None,
+        force: bool = False,
+        fast_hash: bool = False,
+        track_matcher: ITrackMatcher | None = None,
+        approval_policy: ApprovalPolicy | None = None,
+        review_queue: IReviewQueueRepository | None = None,
+        artwork_preparer: IArtworkPreparer | None = None,
+        tracer: Tracer | None = None,
     ) -> None:
         self.album_info_repo = album_info_repo
         self.audio_file_repo = audio_file_repo
         self.taggers = taggers
+        # Taggers are given in order of priority, every file is tagged by a single one of them.
+        self.router = AudioFileTaggerRouter(taggers=taggers, overrides=tagger_overrides)
         self.suffix_filter = suffix_filter
+        self.interactive = interactive
+        self.tagging_workers = tagging_workers
+        self.tagging_parallelism = tagging_parallelism
+        self.single_pass = single_pass
+        self.pipelined = pipelined
+        self.manifest_repo = manifest_repo
+        self.force = force
+        self.fast_hash = fast_hash
+        self.track_matcher = track_matcher
+        # Unattended mode: albums not approved by the policy are queued for review rather than being verified.
+        self.approval_policy = approval_policy
+        self.review_queue = review_queue
+        self.artwork_preparer = artwork_preparer
+        # Cover art is prepared while the files are scanned, matched and restructured.
+        self._artwork_executor = (
+            None if (artwork_preparer is None) else ThreadPoolExecutor(max_workers=1, thread_name_prefix="artwork")
+        )
+        # Timing the stages of processing an album, down to every track.
+        self.tracer = Tracer() if (tracer is None) else tracer
+
+    @staticmethod
+    def _in_current_context(function: Callable) -> Callable:
+        """Binding the function to a copy of the current context, so that spans started on other threads are nested."""
+        return partial(contextvars.copy_context().run, function)
 
     def _update_album_info(self, info: AlbumInfo, default_tags: DefaultTags) -> None:
         for track in info.tracks:
@@ -31,16 +105,57 @@ class SimpleAlbumTagger(IAlbumTagger):
             track.disc_number = track.disc_number if default_tags.disc_number is None else default_tags.disc_number
             track.comment = track.comment if default_tags.comment is None else default_tags.comment
 
-    def _get_album_info(self, album_query_params: AlbumQueryParams, default_tags: DefaultTags) -> AlbumInfo:
-        album_id = self.album_info_repo.get_album_id(album_query_params=album_query_params)
-        album_info = self.album_info_repo.get_album_info(album_id=album_id, default_tags=default_tags)
+    def _get_album_info(
+        self, album_query_params: AlbumQueryParams, default_tags: DefaultTags, track_count: int | None = None
+    ) -> AlbumInfo:
+        with self.tracer.span("album_info"):
+            album_id = self.album_info_repo.get_album_id(album_query_params=album_query_params, track_count=track_count)
+            album_info = self.album_info_repo.get_album_info(album_id=album_id, default_tags=default_tags)
+        album_info.album_id = album_id
         self._update_album_info(info=album_info, default_tags=default_tags)
 
         return album_info
 
-    def _parse_audio_source(self, in_path: Path, album_info: AlbumInfo) -> Album:
-        source_audio_files = self.audio_file_repo.get_audio_paths(path=in_path, suffix_filter=self.suffix_filter)
-        album = self.audio_file_repo.collate_audio_files(paths=source_audio_files, album_info=album_info)
+    def _prepare_artwork(self, album_info: AlbumInfo) -> Future | None:
+        if self.artwork_preparer is None:
+            return None
+
+        return self._artwork_executor.submit(
+            self._in_current_context(self._prepare_traced_artwork), album_info=album_info
+        )
+
+    def _prepare_traced_artwork(self, album_info: AlbumInfo) -> bytes | None:
+        with self.tracer.span("artwork.prepare") as span:
+            image = self.artwork_preparer.prepare(album_info=album_info)
+            span.byte_count = 0 if (image is None) else len(image)
+
+        return image
+
+    def _apply_artwork(self, album: Album, artwork: Future | None) -> None:
+        if artwork is None:
+            return
+
+        # NOTE only the time left waiting for the artwork being prepared concurrently
+        with self.tracer.span("artwork.wait"):
+            image = artwork.result()
+        if image is not None:
+            album.info.set_embedded_cover_art(image=image)
+
+    def _parse_audio_source(self, in_path: Path, album_info: AlbumInfo, paths: list[Path] | None = None) -> Album:
+        source_audio_files = self._get_audio_paths(in_path=in_path) if (paths is None) else paths
+        with self.tracer.span("collate"):
+            album = self.audio_file_repo.collate_audio_files(paths=source_audio_files, album_info=album_info)
+        if self.track_matcher is None:
+            return album
+
+        with self.tracer.span("match"):
+            album = self.track_matcher.match(album=album)
+        if not self.track_matcher.is_confident(album=album):
+            message = f"Files match the track lengths with a low confidence ({album.match_confidence:.0%})"
+            if self.interactive:
+                print(colored(f"Warning: {message}, please check the track order below.", "yellow", attrs=["bold"]))
+            elif self.approval_policy is None:
+                raise AlbumInfoValidationError(f"{message}, verify the track order and re-run interactively.")
 
         return album
 
@@ -93,6 +208,8 @@ class SimpleAlbumTagger(IAlbumTagger):
         """Presenting the old and new dir structure to the user for comparison, asking for verification."""
         buffer = io.StringIO()
         buffer.write(colored("\n+++ Summary +++\n", attrs=["bold"]))
+        if source_structure.match_confidence is not None:
+            buffer.write(f"\n  Files matched to tracks by duration: {source_structure.match_confidence:.0%}\n")
         for medium_index in range(len(source_structure.media)):
             source_medium, target_medium = source_structure.media[medium_index], target_structure.media[medium_index]
 
@@ -103,6 +220,8 @@ class SimpleAlbumTagger(IAlbumTagger):
             SimpleAlbumTagger._add_file_names_to_comparison(
                 buffer=buffer, source_medium=source_medium, target_medium=target_medium
             )
+        if target_structure.cover_art_path is not None:
+            buffer.write(f"\n  Cover art: {colored(str(target_structure.cover_art_path), 'light_magenta')}\n")
 
         print(buffer.getvalue())
 
@@ -113,43 +232,443 @@ class SimpleAlbumTagger(IAlbumTagger):
         if not user_input == "y":
             raise AudioTaggingCancelled("restructuring strategy has been refused by user.")
 
-    def _restructure_album(self, album: Album, out_path: Path) -> Album:
-        """Making a copy of the audio files under a new dir structure matching the configured format."""
-        target_structure: Album = self.audio_file_repo.plan_restructuring(album=album, out_path=out_path)
+    @staticmethod
+    def _get_track_path(album: Album, track_info: AudioTrackInfo) -> Path:
+        medium_index, path_index = (0 if (track_info.disc_number is None) else (track_info.disc_number - 1)), (
+            track_info.track_number - 1
+        )
+        return album.media[medium_index].paths[path_index]
+
+    def _get_tagger(self, path: Path) -> IAudioFileTagger:
+        tagger = self.router.get_tagger(suffix=path.suffix[1:])
+        if tagger is None:
+            raise RuntimeError(f"Unsupported media format encountered: {path.suffix[1:]}")
+
+        return tagger
+
+    @staticmethod
+    def _get_tag_plan(tagger: IAudioFileTagger, album: Album, path: Path, track_info: AudioTrackInfo) -> TagPlan:
+        """The tag plan of the file, without the cover art if it isn't to be embedded into the track."""
+        exclude = frozenset() if album.is_cover_art_embedded(track_info=track_info) else frozenset({TagType.COVER})
+        return tagger.get_tag_plan(suffix=path.suffix[1:].lower(), exclude=exclude)
+
+    def _tag_buffer(
+        self,
+        buffer: BinaryIO,
+        path: Path,
+        track_info: AudioTrackInfo,
+        tagger: IAudioFileTagger,
+        plan: TagPlan,
+        report: TaggingReport,
+    ) -> None:
+        with self.tracer.span("track", path=str(path)) as span:
+            song = tagger.get_song_from_buffer(buffer=buffer, path=path)
+            # NOTE rewrites are applied one file at a time, the report isn't updated concurrently.
+            up_to_date = plan.is_up_to_date(song=song, track_info=track_info)
+            span.attributes["written"] = not up_to_date
+            if up_to_date:
+                report.skipped += 1
+                return
+
+            plan.apply(song=song, track_info=track_info)
+            tagger.save_tags_to_buffer(song=song, buffer=buffer)
+        report.written += 1
+
+    def _get_tagging_rewrites(self, album: Album, report: TaggingReport) -> dict[Path, AudioFileRewrite]:
+        """Tagging files while they are being copied, if the tagger of their format supports it."""
+        rewrites = {}
+        for track_info in album.info.tracks:
+            path = self._get_track_path(album=album, track_info=track_info)
+            tagger = self._get_tagger(path=path)
+            if tagger.in_memory_tagging:
+                plan = self._get_tag_plan(tagger=tagger, album=album, path=path, track_info=track_info)
+                rewrites[path] = partial(
+                    self._tag_buffer, path=path, track_info=track_info, tagger=tagger, plan=plan, report=report
+                )
+
+        return rewrites
+
+    def _get_audio_paths(self, in_path: Path) -> list[Path]:
+        with self.tracer.span("scan") as span:
+            paths = self.audio_file_repo.get_audio_paths(path=in_path, suffix_filter=self.suffix_filter)
+            span.attributes["files"] = len(paths)
+
+        return paths
+
+    def _plan_restructuring(self, album: Album, out_path: Path) -> Album:
+        with self.tracer.span("plan"):
+            target_structure: Album = self.audio_file_repo.plan_restructuring(album=album, out_path=out_path)
 
         # NOTE tested till here
 
-        self._verify_restructuring(source_structure=album, target_structure=target_structure)
-        self.audio_file_repo.restructure_album(source_structure=album, target_structure=target_structure)
+        if self.interactive:
+            self._verify_restructuring(source_structure=album, target_structure=target_structure)
 
         return target_structure
 
-    def _perform_tagging(self, album: Album) -> None:
-        """Setting metadata on the restructured album."""
-        for track_info in album.info.tracks:
-            medium_index, path_index = (0 if (track_info.disc_number is None) else (track_info.disc_number - 1)), (
-                track_info.track_number - 1
+    def _restructure_album(self, album: Album, target_structure: Album, report: TaggingReport) -> list[AudioTrackInfo]:
+        """Making a copy of the audio files under a new dir structure matching the configured format.
+
+        Returning the tracks still to be tagged, files tagged while being copied are accounted for in the given report.
+        """
+        rewrites = self._get_tagging_rewrites(album=target_structure, report=report) if self.single_pass else {}
+        with self.tracer.span("restructure"):
+            self.audio_file_repo.restructure_album(
+                source_structure=album, target_structure=target_structure, rewrites=rewrites
+            )
+
+        pending_tracks = [
+            track_info
+            for track_info in target_structure.info.tracks
+            if self._get_track_path(album=target_structure, track_info=track_info) not in rewrites
+        ]
+
+        return pending_tracks
+
+    def _map_track(self, album: Album, path: Path, track_info: AudioTrackInfo) -> tuple[IAudioFileTagger, Any] | None:
+        """Loading the song and setting its tags, returning None if it already carries the target tags."""
+        tagger = self._get_tagger(path=path)
+
+        with self.tracer.span("track.load", path=str(path)):
+            song = tagger.get_song(path=path)
+        plan = self._get_tag_plan(tagger=tagger, album=album, path=path, track_info=track_info)
+        if plan.is_up_to_date(song=song, track_info=track_info):
+            return None
+
+        plan.apply(song=song, track_info=track_info)
+
+        return tagger, song
+
+    def _save_track(self, path: Path, tagger: IAudioFileTagger, song: Any) -> None:
+        with self.tracer.span("track.save", path=str(path)) as span:
+            tagger.save_tags(song=song)
+            span.byte_count = path.stat().st_size if self.tracer.enabled else 0
+
+    def _tag_track(self, album: Album, track_info: AudioTrackInfo) -> bool:
+        """Returning whether the file has been written, saving is skipped if it already carries the target tags."""
+        path = self._get_track_path(album=album, track_info=track_info)
+        with self.tracer.span("track", path=str(path)) as span:
+            mapped = self._map_track(album=album, path=path, track_info=track_info)
+            span.attributes["written"] = mapped is not None
+            if mapped is None:
+                return False
+
+            tagger, song = mapped
+            self._save_track(path=path, tagger=tagger, song=song)
+
+        return True
+
+    def _tag_tracks(self, album: Album, tracks: list[AudioTrackInfo]) -> TaggingReport:
+        written = [self._tag_track(album=album, track_info=track_info) for track_info in tracks]
+        return TaggingReport(written=written.count(True), skipped=written.count(False))
+
+    def _get_tagging_batches(self, tracks: list[AudioTrackInfo]) -> list[list[AudioTrackInfo]]:
+        match self.tagging_parallelism:
+            case TaggingParallelism.TRACK:
+                return [[track_info] for track_info in tracks]
+            case TaggingParallelism.MEDIUM:
+                media = {}
+                for track_info in tracks:
+                    media.setdefault(track_info.disc_number, []).append(track_info)
+
+                return list(media.values())
+            case _:
+                raise RuntimeError(f"Unsupported TaggingParallelism: {self.tagging_parallelism}")
+
+    def _perform_tagging(self, album: Album, tracks: list[AudioTrackInfo]) -> TaggingReport:
+        """Setting metadata on the given tracks of the restructured album."""
+        with self.tracer.span("tag", tracks=len(tracks)):
+            return self._tag_tracks_concurrently(album=album, tracks=tracks)
+
+    def _tag_tracks_concurrently(self, album: Album, tracks: list[AudioTrackInfo]) -> TaggingReport:
+        if self.tagging_workers <= 1:
+            return self._tag_tracks(album=album, tracks=tracks)
+
+        with ThreadPoolExecutor(max_workers=self.tagging_workers) as executor:
+            futures = [
+                executor.submit(self._in_current_context(self._tag_tracks), album=album, tracks=batch)
+                for batch in self._get_tagging_batches(tracks=tracks)
+            ]
+            try:
+                # Re-raising the first error in submission order, just like the sequential path would.
+                return sum((future.result() for future in futures), start=TaggingReport())
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+    def _restructure_and_tag_album(self, album: Album, target_structure: Album) -> TaggingReport:
+        """Copying and tagging the tracks in overlapping stages, rather than tagging them once all have been copied.
+
+        Copied tracks are handed over to a stage loading and mapping them, which hands them over to a stage saving
+        them, so that reading, writing, and encoding tags happen concurrently.
+        """
+        # NOTE each counter is only updated by a single stage, files tagged while being copied have their own report.
+        report, rewrite_report = TaggingReport(), TaggingReport()
+        rewrites = self._get_tagging_rewrites(album=target_structure, report=rewrite_report) if self.single_pass else {}
+        pending_tracks = {
+            path: track_info
+            for track_info in target_structure.info.tracks
+            if (path := self._get_track_path(album=target_structure, track_info=track_info)) not in rewrites
+        }
+        restructured = False
+
+        def copy(emit: Callable[[Path], None]) -> None:
+            nonlocal restructured
+            self.audio_file_repo.restructure_album(
+                source_structure=album,
+                target_structure=target_structure,
+                rewrites=rewrites,
+                on_transferred=lambda src, tgt: emit(tgt) if (tgt in pending_tracks) else None,
+            )
+            restructured = True
+
+        def map_track(path: Path) -> tuple[Path, IAudioFileTagger, Any] | None:
+            if (mapped := self._map_track(album=target_structure, path=path, track_info=pending_tracks[path])) is None:
+                report.skipped += 1
+                return None
+
+            return path, *mapped
+
+        def save_track(mapped: tuple[Path, IAudioFileTagger, Any]) -> None:
+            path, tagger, song = mapped
+            self._save_track(path=path, tagger=tagger, song=song)
+            report.written += 1
+
+        try:
+            with self.tracer.span("restructure_and_tag"):
+                Pipeline().run(*(self._in_current_context(stage) for stage in (copy, map_track, save_track)))
+        except BaseException:
+            # Failed restructurings are reverted by the repository itself, as in the phase-by-phase path.
+            if restructured:
+                self.audio_file_repo.revert_restructuring(source_structure=album, target_structure=target_structure)
+            raise
+
+        return report + rewrite_report
+
+    def _get_output_settings(self) -> dict[str, str]:
+        """The settings the output depends on beyond the album, albums processed with others are processed again."""
+        settings = {
+            f"tagger.{suffix}": tagger.compatible_tagging_lib for suffix, tagger in sorted(self.router.routes.items())
+        }
+        settings.update(self.audio_file_repo.get_output_settings())
+        if self.artwork_preparer is not None:
+            settings["artwork_policy"] = self.artwork_preparer.policy.key
+
+        return settings
+
+    def _is_unchanged(
+        self,
+        in_path: Path,
+        album_query_params: AlbumQueryParams,
+        default_tags: DefaultTags,
+        out_path: Path,
+        paths: list[Path],
+    ) -> bool:
+        """Telling whether the album has been processed before into the same output, and nothing relevant has changed.
+
+        Given the scanned audio files of the album, this only takes a stat per file short of the optional fast hash.
+        """
+        if (self.manifest_repo is None) or self.force:
+            return False
+
+        manifest = self.manifest_repo.get_manifest(in_path=in_path)
+        if (
+            (manifest is None)
+            or ((album_query_params.album_id is not None) and (album_query_params.album_id != manifest.album_id))
+            or (manifest.formatter_version != self.audio_file_repo.formatter.version)
+            or (manifest.default_tags != default_tags)
+            or (manifest.out_path != out_path.absolute())
+            or (manifest.settings != self._get_output_settings())
+            or (not all(path.exists() for path in manifest.outputs))
+        ):
+            return False
+
+        snapshots = self.audio_file_repo.get_snapshots(
+            paths=paths, fast_hash=any(snapshot.digest is not None for snapshot in manifest.sources)
+        )
+        get_path = lambda snapshot: str(snapshot.path)  # noqa: E731
+
+        return sorted(snapshots, key=get_path) == sorted(manifest.sources, key=get_path)
+
+    def _save_manifest(
+        self,
+        in_path: Path,
+        source_structure: Album,
+        target_structure: Album,
+        default_tags: DefaultTags,
+        out_path: Path | None,
+    ) -> None:
+        # Moved sources can't be compared against in later runs.
+        paths = [path for medium in source_structure.media for path in medium.paths if path.exists()]
+        if (self.manifest_repo is None) or (len(paths) == 0):
+            return
+
+        manifest = AlbumManifest(
+            in_path=in_path.absolute(),
+            album_id=source_structure.info.album_id,
+            formatter_version=self.audio_file_repo.formatter.version,
+            default_tags=default_tags,
+            out_path=(None if (out_path is None) else out_path.absolute()),
+            settings=self._get_output_settings(),
+            sources=self.audio_file_repo.get_snapshots(paths=paths, fast_hash=self.fast_hash),
+            outputs=[
+                *(path.absolute() for medium in target_structure.media for path in medium.paths),
+                *([] if (target_structure.cover_art_path is None) else [target_structure.cover_art_path.absolute()]),
+            ],
+        )
+        self.manifest_repo.save_manifest(manifest=manifest)
+
+    def _queue_unless_approved(
+        self,
+        in_path: Path,
+        out_path: Path,
+        album_query_params: AlbumQueryParams,
+        default_tags: DefaultTags,
+        source_structure: Album,
+        target_structure: Album,
+    ) -> None:
+        reasons = self.approval_policy.get_rejection_reasons(
+            album=source_structure, album_query_params=album_query_params
+        )
+        if len(reasons) == 0:
+            return
+
+        thumbnail = source_structure.info.get_cover_art_thumbnail()
+        item = ReviewItem(
+            id=hashlib.sha1(str(in_path.absolute()).encode()).hexdigest(),
+            in_path=in_path.absolute(),
+            out_path=out_path.absolute(),
+            album_query_params=album_query_params,
+            default_tags=default_tags,
+            reasons=reasons,
+            source_structure=source_structure,
+            target_structure=target_structure,
+            cover_art_thumbnail=None if (thumbnail is None) else base64.b64encode(thumbnail).decode("ascii"),
+            created_at=time.time(),
+        )
+        self.review_queue.save_item(item=item, cover_art=source_structure.info.cover_art_data)
+
+        raise AlbumQueuedForReview(f"album '{in_path}' has been queued for review: {'; '.join(reasons)}.")
+
+    def _execute_plan(
+        self,
+        in_path: Path,
+        source_structure: Album,
+        target_structure: Album,
+        default_tags: DefaultTags,
+        out_path: Path | None,
+        artwork: Future | None = None,
+    ) -> TaggingReport:
+        """Restructuring and tagging the album as planned, along with the cover art being prepared (if any)."""
+        if artwork is None:
+            artwork = self._prepare_artwork(album_info=target_structure.info)
+        if self.pipelined or self.single_pass:
+            # Files are tagged from the start.
+            self._apply_artwork(album=target_structure, artwork=artwork)
+
+        if self.pipelined:
+            report = self._restructure_and_tag_album(album=source_structure, target_structure=target_structure)
+        else:
+            report = TaggingReport()
+            pending_tracks = self._restructure_album(
+                album=source_structure, target_structure=target_structure, report=report
+            )
+            try:
+                self._apply_artwork(album=target_structure, artwork=artwork)
+                report += self._perform_tagging(album=target_structure, tracks=pending_tracks)
+            except BaseException:
+                self.audio_file_repo.revert_restructuring(
+                    source_structure=source_structure, target_structure=target_structure
+                )
+                raise
+
+        with self.tracer.span("finalize"):
+            self.audio_file_repo.finalize_restructuring(
+                source_structure=source_structure, target_structure=target_structure
+            )
+        with self.tracer.span("manifest"):
+            self._save_manifest(
+                in_path=in_path,
+                source_structure=source_structure,
+                target_structure=target_structure,
+                default_tags=default_tags,
+                out_path=out_path,
             )
-            path = album.media[medium_index].paths[path_index]
-            suffix = path.suffix[1:]
 
-            processed = False
-            for tagger in self.taggers:
-                if suffix in tagger.supported_audio_file_extentions:
-                    song = tagger.get_song(path=path)
-                    for mapper in tagger.get_mappers(suffix=suffix):
-                        mapper(song=song, track_info=track_info)
+        return report
 
-                    tagger.save_tags(song=song)
+    def _tag_album(
+        self, in_path: Path, album_query_params: AlbumQueryParams, default_tags: DefaultTags, out_path: Path
+    ) -> TaggingReport:
+        # Scanned ahead, as the number of tracks helps telling releases apart if the album is to be searched for.
+        paths = self._get_audio_paths(in_path=in_path)
+        with self.tracer.span("unchanged"):
+            unchanged = self._is_unchanged(
+                in_path=in_path,
+                album_query_params=album_query_params,
+                default_tags=default_tags,
+                out_path=out_path,
+                paths=paths,
+            )
+        if unchanged:
+            raise AlbumUnchanged(f"album '{in_path}' hasn't changed since it was last processed (see --force).")
 
-                    processed = True
-            if not processed:
-                raise RuntimeError(f"Unsupported media format encountered: {suffix}")
+        album_info = self._get_album_info(
+            album_query_params=album_query_params, default_tags=default_tags, track_count=len(paths)
+        )
+        artwork = self._prepare_artwork(album_info=album_info)
+        album = self._parse_audio_source(in_path=in_path, album_info=album_info, paths=paths)
+        target_structure = self._plan_restructuring(album=album, out_path=out_path)
+        if self.approval_policy is not None:
+            self._queue_unless_approved(
+                in_path=in_path,
+                out_path=out_path,
+                album_query_params=album_query_params,
+                default_tags=default_tags,
+                source_structure=album,
+                target_structure=target_structure,
+            )
+
+        return self._execute_plan(
+            in_path=in_path,
+            source_structure=album,
+            target_structure=target_structure,
+            default_tags=default_tags,
+            out_path=out_path,
+            artwork=artwork,
+        )
 
     def tag_album(
         self, in_path: Path, album_query_params: AlbumQueryParams, default_tags: DefaultTags, out_path: Path
-    ) -> None:
-        album_info = self._get_album_info(album_query_params=album_query_params, default_tags=default_tags)
-        album = self._parse_audio_source(in_path=in_path, album_info=album_info)
-        restructured_album = self._restructure_album(album=album, out_path=out_path)
-        self._perform_tagging(album=restructured_album)
+    ) -> TaggingReport:
+        with self.tracer.span("album", in_path=str(in_path)):
+            return self._tag_album(
+                in_path=in_path, album_query_params=album_query_params, default_tags=default_tags, out_path=out_path
+            )
+
+    def tag_reviewed_album(self, item: ReviewItem) -> TaggingReport:
+        """Processing an approved album of the review queue as planned, without fetching or matching it again."""
+        if not item.approved:
+            raise AudioTaggingCancelled(f"album '{item.in_path}' hasn't been approved yet.")
+        missing = [path for medium in item.source_structure.media for path in medium.paths if not path.exists()]
+        if len(missing) > 0:
+            raise AlbumInfoValidationError(f"Source files have been removed since the album was queued: {missing[0]}")
+
+        with self.tracer.span("album", in_path=str(item.in_path)):
+            report = self._execute_plan(
+                in_path=item.in_path,
+                source_structure=item.source_structure,
+                target_structure=item.target_structure,
+                default_tags=item.default_tags,
+                out_path=item.out_path,
+            )
+        self.review_queue.remove_item(item_id=item.id)
+
+        return report
+
+    def close(self) -> None:
+        if self._artwork_executor is not None:
+            self._artwork_executor.shutdown(cancel_futures=True)
+        self.album_info_repo.close()
+        self.tracer.close()
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+
+"""Batch processing of album dirs.
+
+Albums are tagged on a pool of worker processes. Every worker builds its own album tagger
+once, so the cost of importing and configuring the backends is paid per worker rather than
+per album.
+"""
+
+import io
+import json
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.util import Finalize
+from pathlib import Path
+from typing import Callable
+
+from pydantic import BaseModel
+from termcolor import colored
+
+from sootworks.audio_tagger.application.const import AlbumJobStatus
+from sootworks.audio_tagger.application.exceptions import AlbumQueuedForReview, AlbumUnchanged, AudioTaggingCancelled
+from sootworks.audio_tagger.application.specification import IAlbumTagger
+from sootworks.audio_tagger.domain.model import AlbumQueryParams, DefaultTags, TaggingReport
+
+
+# Type declarations
+AlbumTaggerFactory = Callable[[], IAlbumTagger]
+
+
+class AlbumJob(BaseModel):
+    in_path: Path
+    album_query_params: AlbumQueryParams
+    default_tags: DefaultTags
+    out_path: Path
+
+
+class AlbumJobResult(BaseModel):
+    in_path: Path
+    status: AlbumJobStatus
+    message: str | None = None
+    duration: float  # seconds
+    report: TaggingReport | None = None
+
+
+def load_manifest(path: Path) -> dict[Path, str | None]:
+    """Loading a JSON manifest mapping album dirs to MusicBrainz release IDs.
+
+    Relative album dirs are resolved against the dir of the manifest, the release ID may be
+    null if it should be queried.
+    """
+    with path.open(encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    if not isinstance(manifest, dict):
+        raise ValueError(f"Malformed manifest, expected an object of album dirs: {path}")
+
+    return {(path.parent / album_dir).resolve(): album_id for album_dir, album_id in manifest.items()}
+
+
+# Set in each worker process by the pool initializer.
+_worker_tagger: IAlbumTagger | None = None
+
+
+def _init_worker(tagger_factory: AlbumTaggerFactory) -> None:
+    global _worker_tagger
+    _worker_tagger = tagger_factory()
+    # NOTE atexit handlers aren't run by worker processes, unlike finalizers with an exit priority
+    Finalize(None, _worker_tagger.close, exitpriority=10)
+
+
+def _run_job(job: AlbumJob) -> AlbumJobResult:
+    start, report = time.perf_counter(), None
+    try:
+        report = _worker_tagger.tag_album(
+            in_path=job.in_path,
+            album_query_params=job.album_query_params,
+            default_tags=job.default_tags,
+            out_path=job.out_path,
+        )
+    except AlbumUnchanged as e:
+        status, message = AlbumJobStatus.SKIPPED, str(e)
+    except AlbumQueuedForReview as e:
+        status, message = AlbumJobStatus.QUEUED, str(e)
+    except AudioTaggingCancelled as e:
+        status, message = AlbumJobStatus.CANCELLED, str(e)
+    except Exception as e:
+        status, message = AlbumJobStatus.FAILED, f"{type(e).__name__}: {e}"
+    else:
+        status, message = AlbumJobStatus.SUCCEEDED, None
+
+    return AlbumJobResult(
+        in_path=job.in_path, status=status, message=message, duration=time.perf_counter() - start, report=report
+    )
+
+
+class BatchAlbumTagger:
+    """Fanning album tagging out to worker processes.
+
+    The tagger factory is sent to the workers, so it must be picklable (e.g. a module-level
+    function, or a functools.partial of one).
+    """
+
+    def __init__(self, tagger_factory: AlbumTaggerFactory, max_workers: int | None = None) -> None:
+        self.tagger_factory = tagger_factory
+        self.max_workers = max_workers
+
+    def tag_albums(
+        self, jobs: list[AlbumJob], on_result: Callable[[AlbumJobResult], None] | None = None
+    ) -> list[AlbumJobResult]:
+        """Returning the results sorted by album dir, each of them is also handed to the callback once available."""
+        # The same album dir must not be processed by two workers at once.
+        unique_jobs = list({job.in_path.resolve(): job for job in jobs}.values())
+
+        results = []
+        # NOTE workers aren't forked from the parent, whose threads (e.g. the prefetcher's event loop, or its SQLite
+        # writes) may hold locks at fork time that would never be released in the children
+        start_method = "forkserver" if ("forkserver" in multiprocessing.get_all_start_methods()) else "spawn"
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context(start_method),
+            initializer=_init_worker,
+            initargs=(self.tagger_factory,),
+        ) as executor:
+            futures = [executor.submit(_run_job, job) for job in unique_jobs]
+            for future in as_completed(futures):
+                result = future.result()
+                if on_result is not None:
+                    on_result(result)
+                results.append(result)
+
+        return sorted(results, key=lambda result: str(result.in_path))
+
+    @staticmethod
+    def summarize(results: list[AlbumJobResult]) -> str:
+        colors = {
+            AlbumJobStatus.SUCCEEDED: "light_green",
+            AlbumJobStatus.SKIPPED: "light_blue",
+            AlbumJobStatus.QUEUED: "light_magenta",
+            AlbumJobStatus.CANCELLED: "light_yellow",
+            AlbumJobStatus.FAILED: "light_red",
+        }
+
+        buffer = io.StringIO()
+        buffer.write(colored("\n+++ Batch Summary +++\n", attrs=["bold"]))
+        for result in results:
+            buffer.write(f"\n  {colored(result.status.value, colors[result.status], attrs=['bold'])} {result.in_path}")
+            buffer.write(f" ({result.duration:.1f}s)")
+            if result.report is not None:
+                buffer.write(f"\n    * files written: {result.report.written}, up to date: {result.report.skipped}")
+            if result.message is not None:
+                buffer.write(f"\n    * {result.message}")
+
+        counts = {status: len([r for r in results if r.status == status]) for status in AlbumJobStatus}
+        buffer.write("\n\n  " + ", ".join(f"{status.value.lower()}: {count}" for status, count in counts.items()))
+
+        return buffer.getvalue()
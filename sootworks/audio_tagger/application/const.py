@@ -5,8 +5,28 @@
 Mostly default values...
 """
 
+import os
+from enum import Enum
+from pathlib import Path
+
 APP = "MassRenamer"
 VERSION = "0.1.0"
 CONTACT = "ttimon7@gmail.com"
 
+# Where the manifests and the review queue are kept, shared by the tagger and the review tool
+DEFAULT_STATE_DIR = Path(os.environ.get("XDG_STATE_HOME", Path.home() / ".local" / "state")) / "audio_tagger"
+
 GOJIRA_FORTITUDE = "07bba468-ff52-49d5-88c2-024cf82ab2e0"
+
+
+class AlbumJobStatus(Enum):
+    SUCCEEDED = "SUCCEEDED"
+    SKIPPED = "SKIPPED"
+    QUEUED = "QUEUED"
+    CANCELLED = "CANCELLED"
+    FAILED = "FAILED"
+
+
+class TaggingParallelism(Enum):
+    TRACK = "track"
+    MEDIUM = "medium"
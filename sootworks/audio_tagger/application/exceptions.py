@@ -3,3 +3,11 @@
 
 class AudioTaggingCancelled(Exception):
     pass
+
+
+class AlbumUnchanged(AudioTaggingCancelled):
+    pass
+
+
+class AlbumQueuedForReview(AudioTaggingCancelled):
+    pass
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+"""Overlapping the stages of processing a stream of items (e.g. copying, tagging and saving audio files).
+
+Every stage runs on its own thread, and hands its results over to the next one through a bounded
+queue, so that no more than a few items are held in memory at once. Once a stage fails, the
+others are aborted, and the first error is re-raised by the caller.
+"""
+
+import queue
+import threading
+from functools import partial
+from typing import Any, Callable
+
+
+DEFAULT_DEPTH = 4  # the number of items buffered between two stages
+POLL_INTERVAL = 0.1  # seconds
+
+# Type declarations
+# A source produces items by passing them to the given callback.
+PipelineSource = Callable[[Callable[[Any], None]], None]
+# A stage maps an item to the one handed to the next stage, or to None if there's nothing left to do with it.
+PipelineStage = Callable[[Any], Any | None]
+
+_END = object()
+
+
+class PipelineAborted(Exception):
+    """Raised in the stages still running once another one has failed."""
+
+
+class Pipeline:
+    def __init__(self, depth: int = DEFAULT_DEPTH) -> None:
+        self.depth = depth
+
+        self._failed = threading.Event()
+        self._errors: list[BaseException] = []
+        self._lock = threading.Lock()
+
+    def _put(self, items: queue.Queue, item: Any) -> None:
+        while not self._failed.is_set():
+            try:
+                items.put(item, timeout=POLL_INTERVAL)
+                return
+            except queue.Full:
+                pass
+
+        raise PipelineAborted()
+
+    def _get(self, items: queue.Queue) -> Any:
+        while not self._failed.is_set():
+            try:
+                return items.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                pass
+
+        raise PipelineAborted()
+
+    def _run_source(self, source: PipelineSource, out_items: queue.Queue) -> None:
+        source(partial(self._put, out_items))
+        self._put(out_items, _END)
+
+    def _run_stage(self, stage: PipelineStage, in_items: queue.Queue, out_items: queue.Queue | None) -> None:
+        while (item := self._get(in_items)) is not _END:
+            if ((result := stage(item)) is not None) and (out_items is not None):
+                self._put(out_items, result)
+
+        if out_items is not None:
+            self._put(out_items, _END)
+
+    def _guard(self, target: Callable, *args: Any) -> None:
+        try:
+            target(*args)
+        except PipelineAborted:
+            pass
+        except BaseException as e:
+            with self._lock:
+                self._errors.append(e)
+            self._failed.set()
+
+    def run(self, source: PipelineSource, *stages: PipelineStage) -> None:
+        """Running the source and the stages concurrently until all items have passed, or one of them has failed."""
+        queues = [queue.Queue(maxsize=self.depth) for _ in stages]
+        threads = [threading.Thread(target=self._guard, args=(self._run_source, source, queues[0]))]
+        for i, stage in enumerate(stages):
+            out_items = queues[i + 1] if (i + 1 < len(stages)) else None
+            threads.append(threading.Thread(target=self._guard, args=(self._run_stage, stage, queues[i], out_items)))
+
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                thread.join()
+        except BaseException:  # e.g. KeyboardInterrupt
+            self._failed.set()
+            for thread in threads:
+                thread.join()
+            raise
+
+        if len(self._errors) > 0:
+            raise self._errors[0]
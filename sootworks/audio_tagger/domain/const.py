@@ -22,3 +22,18 @@ class TagType(Enum):
     GENRE = "GENRE"
     DISC_NUM = "DISC_NUM"
     COVER = "COVER"
+
+
+class ArtworkPlacement(Enum):
+    EMBED = "embed"  # into every track
+    SIDECAR = "sidecar"  # as an image file next to the tracks (e.g. folder.jpg), read by media servers
+    BOTH = "both"
+    EMBED_FIRST_TRACK_ONLY = "embed-first-track-only"
+
+
+class CopyStrategy(Enum):
+    AUTO = "auto"  # the fastest strategy supported, not sharing inodes between source and target
+    REFLINK = "reflink"  # sharing extents copy-on-write (e.g. on Btrfs, XFS)
+    COPY_FILE_RANGE = "copy_file_range"  # copying in the kernel, without passing the data through user space
+    HARDLINK = "hardlink"  # NOTE the source files get tagged too, as they share the inode with the targets
+    COPY = "copy"
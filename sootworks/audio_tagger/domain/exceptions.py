@@ -5,3 +5,15 @@
 
 class AlbumInfoValidationError(Exception):
     pass
+
+
+class AlbumDirLockedError(Exception):
+    pass
+
+
+class AlbumInfoUnavailableError(Exception):
+    pass
+
+
+class AlbumNotFoundError(AlbumInfoUnavailableError):
+    pass
@@ -3,18 +3,28 @@
 """Domain Models
 
 The most stable Domain Entities used for exchanging information between Domain Services.
+
+Albums, their tracks and their planned structures are slotted dataclasses: they are built in
+bulk from trusted data (e.g. parsed release descriptors), so they skip validation, and take a
+fraction of the memory and construction time of PyDantic models on releases of hundreds of
+tracks. PyDantic models are kept for data crossing the boundaries (e.g. CLI params, manifests).
 """
 
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
+import hashlib
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from pydantic import BaseModel, Field
 
-import cv2 as cv
-import numpy as np
-from pydantic import BaseModel, Field, PrivateAttr
+from sootworks.audio_tagger.domain.const import ArtworkPlacement, MediumType
 
-from sootworks.audio_tagger.domain.const import MediumType
+if TYPE_CHECKING:
+    # OpenCV and NumPy are imported lazily, as only cover art previews and conversions need them.
+    import numpy as np
 
 
 class AlbumQueryParams(BaseModel):
@@ -31,37 +41,107 @@ class DefaultTags(BaseModel):
     comment: str | None = None
 
 
-class AlbumInfo(BaseModel):
+def is_jpeg(image: bytes) -> bool:
+    return image[:3] == b"\xff\xd8\xff"
+
+
+class ArtworkPolicy(BaseModel):
+    """Limits of the cover art embedded into every track, images exceeding them are downscaled and recompressed."""
+
+    max_dimension: int | None = None  # in pixels, of the longer side
+    max_bytes: int | None = None
+    min_quality: int = 50  # the JPEG quality range searched for the best quality fitting max_bytes
+    max_quality: int = 95
+
+    @property
+    def is_unlimited(self) -> bool:
+        return (self.max_dimension is None) and (self.max_bytes is None)
+
+    @property
+    def key(self) -> str:
+        """Identifying the variants prepared by the policy, e.g. in caches."""
+        return f"{self.max_dimension}:{self.max_bytes}:{self.min_quality}:{self.max_quality}"
+
+
+@dataclass(slots=True, kw_only=True)
+class AlbumInfo:
+    album_id: str | None = None  # e.g. the MusicBrainz release ID
     title: str  # e.g. Vovin
     artist: str  # e.g. Therion
     date: int  # e.g. 1998
-    tracks: list[AudioTrackInfo] = Field(default_factory=list)
-    # cover_art is an image buffer to be loaded by np.frombuffer(cover_art, np.uint8)
-    cover_art: np.ndarray | None = None
+    tracks: list[AudioTrackInfo] = field(default_factory=list)
+    # cover_art_data is the encoded image buffer as fetched (e.g. JPEG, or PNG when given by the user)
+    cover_art_data: bytes | None = field(default=None, repr=False)
     total_discs: int = 1  # 1
 
-    _cover_art_jpeg: bytes | None = PrivateAttr(default_factory=lambda: None)
+    _cover_art: np.ndarray | None = field(default=None, init=False, repr=False, compare=False)
+    _cover_art_jpeg: bytes | None = field(default=None, init=False, repr=False, compare=False)
+    _cover_art_jpeg_digest: str | None = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def cover_art(self) -> np.ndarray | None:
+        """The decoded image, only decoded when the pixels are actually needed (e.g. for previews)."""
+        if (self.cover_art_data is not None) and (self._cover_art is None):
+            import cv2 as cv
+            import numpy as np
+
+            self._cover_art = cv.imdecode(np.frombuffer(self.cover_art_data, np.uint8), cv.IMREAD_COLOR)
+
+        return self._cover_art
 
     @property
     def cover_art_jpeg(self) -> bytes | None:
-        if (self.cover_art is not None) and (self._cover_art_jpeg is None):
-            self._cover_art_jpeg = cv.imencode(".jpg", self.cover_art)[1].tobytes()
+        """The image to embed, JPEG sources are passed on as they are, without re-encoding."""
+        if (self.cover_art_data is not None) and (self._cover_art_jpeg is None):
+            if is_jpeg(self.cover_art_data):
+                self._cover_art_jpeg = self.cover_art_data
+            else:
+                import cv2 as cv
+
+                self._cover_art_jpeg = cv.imencode(".jpg", self.cover_art)[1].tobytes()
 
         return self._cover_art_jpeg
 
-    class Config:
-        # FIXME PyDantic can't handle Numpy values when performing type checking.
-        arbitrary_types_allowed = True
+    @property
+    def cover_art_jpeg_digest(self) -> str | None:
+        """The SHA-256 digest of the image to embed, for comparing it against the images already embedded."""
+        if (self.cover_art_jpeg is not None) and (self._cover_art_jpeg_digest is None):
+            self._cover_art_jpeg_digest = hashlib.sha256(self.cover_art_jpeg).hexdigest()
+
+        return self._cover_art_jpeg_digest
+
+    def set_embedded_cover_art(self, image: bytes) -> None:
+        """Overriding the image to embed (e.g. with a downscaled variant), the source image is kept as it is."""
+        self._cover_art_jpeg = image
+        self._cover_art_jpeg_digest = None
 
+    def get_cover_art_thumbnail(self, max_size: int = 160) -> bytes | None:
+        """A downscaled JPEG of the cover art, for previews that don't need the full image."""
+        if self.cover_art is None:
+            return None
 
-class AudioTrackInfo(BaseModel):
-    album_info: AlbumInfo
+        import cv2 as cv
+
+        height, width = self.cover_art.shape[:2]
+        scale = min(1.0, max_size / max(height, width))
+        thumbnail = cv.resize(
+            self.cover_art, (round(width * scale), round(height * scale)), interpolation=cv.INTER_AREA
+        )
+
+        return cv.imencode(".jpg", thumbnail)[1].tobytes()
+
+
+@dataclass(slots=True, kw_only=True)
+class AudioTrackInfo:
+    # NOTE the back-reference is left out of comparisons and reprs, as the album info refers to its tracks.
+    album_info: AlbumInfo = field(compare=False, repr=False)
     title: str  # e.g. The Rise of Sodom and Gomorrah
     total_tracks: int  # e.g. 12
     track_number: int  # e.g. 1
     genre: str | None = None  # metal
     disc_number: int | None = None  # e.g. 1
     comment: str | None = None  # e.g. Special Edition
+    length: float | None = None  # in seconds, e.g. 344.2
 
     @property
     def album(self) -> str:
@@ -83,6 +163,10 @@ class AudioTrackInfo(BaseModel):
     def cover_art_jpeg(self) -> bytes | None:
         return self.album_info.cover_art_jpeg
 
+    @property
+    def cover_art_jpeg_digest(self) -> str | None:
+        return self.album_info.cover_art_jpeg_digest
+
     @property
     def total_discs(self) -> int:
         return self.album_info.total_discs
@@ -92,22 +176,101 @@ class AudioTrackInfo(BaseModel):
         return cls(
             album_info=other.album_info,
             title=other.title,
+            total_tracks=other.total_tracks,
             track_number=other.track_number,
             genre=other.genre,
             disc_number=other.disc_number,
             comment=other.comment,
+            length=other.length,
         )
 
 
-class AudioMedium(BaseModel):
+class TaggingReport(BaseModel):
+    """The number of files whose tags have been written, and of those already carrying the target tags."""
+
+    written: int = 0
+    skipped: int = 0
+
+    def __add__(self, other: TaggingReport) -> TaggingReport:
+        return TaggingReport(written=(self.written + other.written), skipped=(self.skipped + other.skipped))
+
+
+@dataclass(slots=True, kw_only=True)
+class AudioMedium:
     type: MediumType
-    paths: list[Path] = Field(default_factory=list)
+    paths: list[Path] = field(default_factory=list)
 
     @property
     def total_tracks(self) -> int:
         return len(self.paths)
 
 
-class Album(BaseModel):
-    info: AlbumInfo | None = None
-    media: list[AudioMedium] = Field(default_factory=list)  # Media should be in order (i.e. CD 1, CD 2, ...)
+@dataclass(slots=True, kw_only=True)
+class Album:
+    info: AlbumInfo | None = None  # shared by the source and the target structure of an album
+    media: list[AudioMedium] = field(default_factory=list)  # Media should be in order (i.e. CD 1, CD 2, ...)
+    # The share of tracks whose files matched them by duration (unset if they haven't been matched).
+    match_confidence: float | None = None
+    # Where the cover art goes, the sidecar image (if any) being planned along with the tracks of target structures.
+    artwork_placement: ArtworkPlacement = ArtworkPlacement.EMBED
+    cover_art_path: Path | None = None
+
+    def is_cover_art_embedded(self, track_info: AudioTrackInfo) -> bool:
+        match self.artwork_placement:
+            case ArtworkPlacement.EMBED | ArtworkPlacement.BOTH:
+                return True
+            case ArtworkPlacement.EMBED_FIRST_TRACK_ONLY:
+                return (track_info.disc_number in (None, 1)) and (track_info.track_number == 1)
+            case _:
+                return False
+
+
+@dataclass(slots=True, kw_only=True)
+class ReviewItem:
+    """A planned album that hasn't been approved by the approval policy, to be reviewed by the user."""
+
+    id: str
+    in_path: Path
+    out_path: Path | None = None  # missing from items queued by earlier versions
+    album_query_params: AlbumQueryParams
+    default_tags: DefaultTags
+    reasons: list[str] = field(default_factory=list)  # why the album hasn't been approved
+    source_structure: Album
+    target_structure: Album  # sharing the album info of the source structure
+    cover_art_thumbnail: str | None = field(default=None, repr=False)  # a base64-encoded JPEG
+    approved: bool = False
+    created_at: float
+
+
+@dataclass(slots=True, kw_only=True)
+class Span:
+    """A named piece of work (e.g. fetching a release, or saving the tags of a track), timed by a tracer."""
+
+    id: int
+    parent_id: int | None = None  # the span it has been started within (if any)
+    name: str
+    started_at: float  # seconds since the epoch
+    duration: float = 0.0  # wall time in seconds
+    byte_count: int = 0  # e.g. the size of the files copied or the images fetched
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None  # the type of the exception raised within the span (if any)
+
+
+class SourceFileSnapshot(BaseModel):
+    path: Path
+    size: int
+    mtime_ns: int
+    digest: str | None = None  # a fast hash of the file, if requested
+
+
+class AlbumManifest(BaseModel):
+    """A record of a processed album, for telling whether its source has changed since."""
+
+    in_path: Path
+    album_id: str
+    formatter_version: int
+    default_tags: DefaultTags
+    out_path: Path | None = None
+    settings: dict[str, str] = Field(default_factory=dict)  # those the output depends on, beyond the album itself
+    sources: list[SourceFileSnapshot] = Field(default_factory=list)
+    outputs: list[Path] = Field(default_factory=list)
@@ -15,18 +15,40 @@ access technology being used.
 """
 
 from sootworks.audio_tagger.domain.repository._album_info import IAlbumInfoRepository
-from sootworks.audio_tagger.domain.repository._audio_file import AlbumDirFormatter, IAudioFileRepository
+from sootworks.audio_tagger.domain.repository._album_manifest import IAlbumManifestRepository
+from sootworks.audio_tagger.domain.repository._artwork import IArtworkPreparer
+from sootworks.audio_tagger.domain.repository._audio_file import (
+    AlbumDirFormatter,
+    AudioFileRewrite,
+    AudioFileTransferCallback,
+    IAudioFileRepository,
+)
+from sootworks.audio_tagger.domain.repository._review_queue import IReviewQueueRepository
 from sootworks.audio_tagger.domain.repository._tagging_lib import (
     LIB_SPECIFIC_SONG_OBJECT,
+    AudioFileTaggerRouter,
     IAudioTagMapper,
     IAudioFileTagger,
+    TagPlan,
 )
+from sootworks.audio_tagger.domain.repository._tracer import ITraceSink, Tracer
+from sootworks.audio_tagger.domain.repository._track_matcher import ITrackMatcher
 
 __all__ = [
     "AlbumDirFormatter",
+    "AudioFileRewrite",
+    "AudioFileTransferCallback",
+    "AudioFileTaggerRouter",
     "IAlbumInfoRepository",
+    "IAlbumManifestRepository",
+    "IArtworkPreparer",
     "IAudioFileRepository",
     "IAudioTagMapper",
     "IAudioFileTagger",
+    "IReviewQueueRepository",
+    "ITraceSink",
+    "ITrackMatcher",
     "LIB_SPECIFIC_SONG_OBJECT",
+    "TagPlan",
+    "Tracer",
 ]
@@ -3,22 +3,31 @@
 from abc import ABC, abstractmethod
 
 from sootworks.audio_tagger.domain.model import AlbumInfo, AlbumQueryParams, DefaultTags
+from sootworks.audio_tagger.domain.repository._tracer import Tracer
 
 
 class IAlbumInfoRepository(ABC):
     """Domain-level interface for implementing repositories abstracting album information management."""
 
-    def get_album_id(self, album_query_params: AlbumQueryParams) -> str:
+    # Timing lookups (e.g. web service requests), disabled unless given by implementations.
+    tracer: Tracer = Tracer()
+
+    def get_album_id(self, album_query_params: AlbumQueryParams, track_count: int | None = None) -> str:
         return (
             self.query_album_id(
-                album_name=album_query_params.album_name, artist=album_query_params.artist, year=album_query_params.year
+                album_name=album_query_params.album_name,
+                artist=album_query_params.artist,
+                year=album_query_params.year,
+                track_count=track_count,
             )
             if album_query_params.album_id is None
             else album_query_params.album_id
         )
 
     @abstractmethod
-    def query_album_id(self, album_name: str, artist: str | None = None, year: int | None = None) -> str:
+    def query_album_id(
+        self, album_name: str, artist: str | None = None, year: int | None = None, track_count: int | None = None
+    ) -> str:
         raise NotImplementedError()
 
     @abstractmethod
@@ -28,3 +37,7 @@ class IAlbumInfoRepository(ABC):
     @abstractmethod
     def get_album_info(self, album_id: str, default_tags: DefaultTags) -> AlbumInfo:
         raise NotImplementedError()
+
+    def close(self) -> None:
+        """Releasing the resources held by the repository (e.g. connections), once done with it."""
+        pass
@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+from sootworks.audio_tagger.domain.model import AlbumManifest
+
+
+class IAlbumManifestRepository(ABC):
+    """Domain-level interface for implementing repositories keeping track of processed albums."""
+
+    @abstractmethod
+    def get_manifest(self, in_path: Path) -> AlbumManifest | None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def save_manifest(self, manifest: AlbumManifest) -> None:
+        raise NotImplementedError()
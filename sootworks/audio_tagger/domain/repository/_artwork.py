@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+
+from abc import ABC, abstractmethod
+
+from sootworks.audio_tagger.domain.model import AlbumInfo, ArtworkPolicy
+
+
+class IArtworkPreparer(ABC):
+    """Domain-level interface for implementing services preparing the cover art to embed into the tracks of an album."""
+
+    policy: ArtworkPolicy
+
+    @abstractmethod
+    def prepare(self, album_info: AlbumInfo) -> bytes | None:
+        """Returning the JPEG image to embed, or None if the cover art is to be embedded as it is (or is missing)."""
+        raise NotImplementedError()
@@ -3,17 +3,28 @@
 import re
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Type
+from typing import BinaryIO, Callable, Type
 
 from sootworks.audio_tagger.domain.const import MediumType
-from sootworks.audio_tagger.domain.model import Album, AlbumInfo, AudioTrackInfo
+from sootworks.audio_tagger.domain.model import Album, AlbumInfo, AudioTrackInfo, SourceFileSnapshot
+from sootworks.audio_tagger.domain.repository._tracer import Tracer
 
 
 # RegEx Patterns
 FORBIDDEN_CHARACTERS = re.compile(r"[<>:\"\'\/\\|\?\*]")
 
+# Type definitions
+# Rewriting the content of an audio file (e.g. updating its tags) while it is being restructured, given a file object
+# holding it (either in memory, or the target file itself once transferred).
+AudioFileRewrite = Callable[[BinaryIO], None]
+# Notified of every file transferred by a restructuring (i.e. the source and target paths), as soon as it's in place.
+AudioFileTransferCallback = Callable[[Path, Path], None]
+
 
 class AlbumDirFormatter:
+    # To be bumped whenever the output format changes, so that albums processed before are processed again.
+    version = 1
+
     @staticmethod
     def get_artist_dir_name(artist: str) -> str:
         return artist.replace(" ", "_")
@@ -52,13 +63,29 @@ class AlbumDirFormatter:
 class IAudioFileRepository(ABC):
     """Domain-level interface for implementing repositories abstracting audio file system operations."""
 
-    def __init__(self, formatter: Type[AlbumDirFormatter]) -> None:
+    def __init__(self, formatter: Type[AlbumDirFormatter], tracer: Tracer | None = None) -> None:
         self.formatter = formatter
+        # Timing file operations (e.g. copies), disabled unless given.
+        self.tracer = Tracer() if (tracer is None) else tracer
 
     @abstractmethod
     def get_audio_paths(self, path: Path, suffix_filter: str | None = None) -> list[Path]:
         raise NotImplementedError()
 
+    @abstractmethod
+    def get_snapshots(self, paths: list[Path], fast_hash: bool = False) -> list[SourceFileSnapshot]:
+        """Taking a snapshot of the size and modification time (and optionally a fast hash) of the given files."""
+        raise NotImplementedError()
+
+    @abstractmethod
+    def get_album_dirs(self, path: Path) -> list[Path]:
+        """Discovering the album dirs of a library located under the given root dir."""
+        raise NotImplementedError()
+
+    def get_output_settings(self) -> dict[str, str]:
+        """The settings restructured albums depend on beyond the formatter (e.g. for telling outdated outputs)."""
+        return {}
+
     @staticmethod
     def _sort_track_info(album_info: AlbumInfo) -> tuple[tuple[AudioTrackInfo]]:
         stacks = [[] for i in range(album_info.total_discs)]
@@ -76,5 +103,32 @@ class IAudioFileRepository(ABC):
         raise NotImplementedError()
 
     @abstractmethod
-    def restructure_album(self, source_structure: Album, target_structure: Album) -> None:
+    def restructure_album(
+        self,
+        source_structure: Album,
+        target_structure: Album,
+        rewrites: dict[Path, AudioFileRewrite] | None = None,
+        on_transferred: AudioFileTransferCallback | None = None,
+    ) -> None:
+        """Copying the source files to the target paths.
+
+        Files with a rewrite registered for their target path are rewritten as part of their transfer,
+        in memory (written to the target in one go) where implementations deem it worthwhile, in place
+        otherwise. Errors raised by the transfer callback abort the restructuring.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def finalize_restructuring(self, source_structure: Album, target_structure: Album) -> None:
+        """Called once the restructured album has been tagged (e.g. for removing moved source files, or writing the
+        sidecar cover art, the image to embed having been prepared by then).
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def revert_restructuring(self, source_structure: Album, target_structure: Album) -> None:
+        """Called if the restructuring or the tagging has failed, restoring the source files if necessary.
+
+        Moved files are moved back as they are, i.e. with the tags written before the failure.
+        """
         raise NotImplementedError()
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+
+from abc import ABC, abstractmethod
+
+from sootworks.audio_tagger.domain.model import ReviewItem
+
+
+class IReviewQueueRepository(ABC):
+    """Domain-level interface for implementing repositories keeping planned albums awaiting review."""
+
+    @abstractmethod
+    def get_items(self) -> list[ReviewItem]:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def get_item(self, item_id: str) -> ReviewItem | None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def save_item(self, item: ReviewItem, cover_art: bytes | None = None) -> None:
+        """Adding (or updating) the item, the full cover art is only given when it's added."""
+        raise NotImplementedError()
+
+    @abstractmethod
+    def remove_item(self, item_id: str) -> None:
+        raise NotImplementedError()
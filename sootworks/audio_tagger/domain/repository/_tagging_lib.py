@@ -1,8 +1,9 @@
 # -*- coding: utf-8 -*-
 
+import functools
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
 
 from sootworks.audio_tagger.domain.const import TagType
 from sootworks.audio_tagger.domain.model import AudioTrackInfo
@@ -20,10 +21,34 @@ class IAudioTagMapper(ABC):
     def __call__(self, song: LIB_SPECIFIC_SONG_OBJECT, track_info: AudioTrackInfo) -> None:
         pass
 
+    def is_up_to_date(self, song: LIB_SPECIFIC_SONG_OBJECT, track_info: AudioTrackInfo) -> bool:
+        """Telling whether the song already carries the tag to be set, mappers not overriding this always apply."""
+        return False
+
+
+class TagPlan:
+    """The mappers of a format resolved once (i.e. filtered and ordered), and reused across tracks and albums.
+
+    Applying the plan runs its mappers one after the other on the loaded song, which is then saved once for all tags.
+    """
+
+    def __init__(self, mappers: tuple[IAudioTagMapper]) -> None:
+        self.mappers = mappers
+
+    def is_up_to_date(self, song: LIB_SPECIFIC_SONG_OBJECT, track_info: AudioTrackInfo) -> bool:
+        """Telling whether the song already carries all tags of the plan, so saving can be skipped."""
+        return all(mapper.is_up_to_date(song=song, track_info=track_info) for mapper in self.mappers)
+
+    def apply(self, song: LIB_SPECIFIC_SONG_OBJECT, track_info: AudioTrackInfo) -> None:
+        for mapper in self.mappers:
+            mapper(song=song, track_info=track_info)
+
 
 class IAudioFileTagger(ABC):
     compatible_tagging_lib: str
     supported_audio_file_extentions: set[str]
+    # Whether songs can be loaded from, and their tags saved to file objects (e.g. in-memory buffers).
+    in_memory_tagging: bool = False
 
     @classmethod
     @abstractmethod
@@ -39,3 +64,52 @@ class IAudioFileTagger(ABC):
     @abstractmethod
     def save_tags(cls, song: Any) -> None:
         pass
+
+    @classmethod
+    def build_tag_plan(cls, suffix: str, exclude: frozenset[TagType] = frozenset()) -> TagPlan:
+        return TagPlan(
+            mappers=tuple(mapper for mapper in cls.get_mappers(suffix=suffix) if mapper.tag_type not in exclude)
+        )
+
+    @classmethod
+    @functools.cache
+    def get_tag_plan(cls, suffix: str, exclude: frozenset[TagType] = frozenset()) -> TagPlan:
+        """The tag plan of the given format without the excluded tags, built on first use and cached per tagger."""
+        return cls.build_tag_plan(suffix=suffix, exclude=exclude)
+
+    @classmethod
+    def get_song_from_buffer(cls, buffer: BinaryIO, path: Path) -> Any:
+        """Loading a song from the content of the file at the given path (only if in_memory_tagging is set)."""
+        raise NotImplementedError()
+
+    @classmethod
+    def save_tags_to_buffer(cls, song: Any, buffer: BinaryIO) -> None:
+        raise NotImplementedError()
+
+
+class AudioFileTaggerRouter:
+    """Routing each audio file format to exactly one tagger, so every file is loaded and saved only once.
+
+    The routing table is built once, formats supported by several taggers are routed to the first one given, unless
+    overridden explicitly (suffixes mapped to the name of a tagging lib).
+    """
+
+    def __init__(self, taggers: tuple[IAudioFileTagger], overrides: dict[str, str] | None = None) -> None:
+        self.routes: dict[str, IAudioFileTagger] = {}
+        for tagger in taggers:
+            for suffix in tagger.supported_audio_file_extentions:
+                self.routes.setdefault(suffix.lower(), tagger)
+
+        taggers_by_lib = {tagger.compatible_tagging_lib: tagger for tagger in taggers}
+        for suffix, tagging_lib in (overrides or {}).items():
+            suffix = suffix.lower().lstrip(".")
+            tagger = taggers_by_lib.get(tagging_lib)
+            if tagger is None:
+                raise ValueError(f"Unknown tagging lib: {tagging_lib} (expected one of {', '.join(taggers_by_lib)})")
+            if suffix not in tagger.supported_audio_file_extentions:
+                raise ValueError(f"Tagging lib {tagging_lib} doesn't support '{suffix}' files")
+
+            self.routes[suffix] = tagger
+
+    def get_tagger(self, suffix: str) -> IAudioFileTagger | None:
+        return self.routes.get(suffix.lower())
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+import itertools
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator
+
+from sootworks.audio_tagger.domain.model import Span
+
+
+# Shared by every tracer, so that spans started by repositories are nested in those of the album tagger.
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+_span_ids = itertools.count(start=1)
+
+
+class ITraceSink(ABC):
+    """Domain-level interface for implementing sinks receiving the spans finished by a tracer."""
+
+    @abstractmethod
+    def emit(self, span: Span) -> None:
+        """Called from the thread the span has finished on, implementations must be thread-safe."""
+        raise NotImplementedError()
+
+    def close(self) -> None:
+        pass
+
+
+class Tracer:
+    """Timing named spans of work, handing them to the sinks once finished.
+
+    Without sinks, spans are neither timed nor recorded, hence tracing costs next to nothing unless enabled.
+    Worker threads only nest their spans in those of the submitting thread if they run in a copy of its context
+    (see contextvars.copy_context).
+    """
+
+    def __init__(self, sinks: tuple[ITraceSink, ...] = ()) -> None:
+        self.sinks = sinks
+
+    @property
+    def enabled(self) -> bool:
+        return len(self.sinks) > 0
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """Timing the enclosed work, the yielded span may be given a byte count and further attributes."""
+        if not self.enabled:
+            yield Span(id=0, name=name, started_at=0.0, attributes=attributes)
+            return
+
+        parent = _current_span.get()
+        span = Span(
+            id=next(_span_ids),
+            parent_id=(None if (parent is None) else parent.id),
+            name=name,
+            started_at=time.time(),
+            attributes=attributes,
+        )
+        token = _current_span.set(span)
+        start = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span.error = type(e).__name__
+            raise
+        finally:
+            span.duration = time.perf_counter() - start
+            _current_span.reset(token)
+            for sink in self.sinks:
+                sink.emit(span=span)
+
+    def close(self) -> None:
+        for sink in self.sinks:
+            sink.close()
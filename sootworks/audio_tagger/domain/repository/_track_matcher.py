@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+
+from abc import ABC, abstractmethod
+
+from sootworks.audio_tagger.domain.model import Album
+
+
+class ITrackMatcher(ABC):
+    """Domain-level interface for implementing services matching audio files to the tracks of an album."""
+
+    # Albums matched with a lower confidence are to be verified by the user (or skipped).
+    min_confidence: float = 0.9
+
+    @abstractmethod
+    def match(self, album: Album) -> Album:
+        """Reordering the paths of each medium to follow the order of its tracks, setting the confidence of the match.
+
+        The confidence is left unset if there was nothing to match by (e.g. the track lengths are unknown).
+        """
+        raise NotImplementedError()
+
+    def is_confident(self, album: Album) -> bool:
+        return (album.match_confidence is None) or (album.match_confidence >= self.min_confidence)
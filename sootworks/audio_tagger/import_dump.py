@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+
+"""Importing a MusicBrainz JSON dump into a release database, for tagging without contacting MusicBrainz.
+"""
+
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+
+from sootworks.audio_tagger.infrastructure.album_info import ReleaseDatabase
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Importing releases of a MusicBrainz JSON dump into a release database.")
+    parser.add_argument(
+        "dump",
+        type=Path,
+        help=(
+            "the release dump, either the 'release.tar.xz' archive of the JSON data dumps, or its 'mbdump/release'"
+            " file (optionally compressed with gzip, xz or bzip2)."
+        ),
+    )
+    parser.add_argument(
+        "database", type=Path, help="the SQLite database to import into (see --musicbrainz-db of the tagger)."
+    )
+    parser.add_argument("--batch-size", type=int, default=1000, help="the number of releases written per transaction.")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    stats = ReleaseDatabase(path=args.database).import_dump(path=args.dump, batch_size=args.batch_size)
+    print(
+        f"Imported {stats.imported} release(s) in {time.perf_counter() - start:.1f}s"
+        f" ({stats.skipped} line(s) imported before, {stats.failed} failed)."
+    )
+
+
+if __name__ == "__main__":
+    main()
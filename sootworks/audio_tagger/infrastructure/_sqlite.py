@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+
+"""SQLite helpers shared by the infrastructure-level stores."""
+
+import sqlite3
+from pathlib import Path
+
+
+# Seconds to wait for a lock held by a concurrent worker process.
+BUSY_TIMEOUT = 30.0
+
+
+def connect(path: Path) -> sqlite3.Connection:
+    """Opening a database that may be shared by concurrent worker processes.
+
+    Callers are responsible for serializing access from multiple threads.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(path, timeout=BUSY_TIMEOUT, isolation_level=None, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+
+    return connection
@@ -1,6 +1,28 @@
 # -*- coding: utf-8 -*-
 
+from sootworks.audio_tagger.infrastructure.album_info._artwork_preparer import OpenCVArtworkPreparer
+from sootworks.audio_tagger.infrastructure.album_info._artwork_store import ArtworkEntry, ArtworkStore
+from sootworks.audio_tagger.infrastructure.album_info._async_music_brainz import AsyncMusicBrainzAlbumInfoRepository
 from sootworks.audio_tagger.infrastructure.album_info._music_brainz import MusicBrainzAlbumInfoRepository
+from sootworks.audio_tagger.infrastructure.album_info._music_brainz_dump import MusicBrainzDumpAlbumInfoRepository
+from sootworks.audio_tagger.infrastructure.album_info._rate_limiter import TokenBucketRateLimiter
+from sootworks.audio_tagger.infrastructure.album_info._release_cache import CacheStats, ReleaseCache
+from sootworks.audio_tagger.infrastructure.album_info._release_database import ImportStats, ReleaseDatabase
+from sootworks.audio_tagger.infrastructure.album_info._release_index import ReleaseCandidate, ReleaseIndex
 
 
-__all__ = ["MusicBrainzAlbumInfoRepository"]
+__all__ = [
+    "ArtworkEntry",
+    "ArtworkStore",
+    "AsyncMusicBrainzAlbumInfoRepository",
+    "CacheStats",
+    "ImportStats",
+    "MusicBrainzAlbumInfoRepository",
+    "MusicBrainzDumpAlbumInfoRepository",
+    "OpenCVArtworkPreparer",
+    "ReleaseCache",
+    "ReleaseCandidate",
+    "ReleaseDatabase",
+    "ReleaseIndex",
+    "TokenBucketRateLimiter",
+]
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+
+"""Preparing the variant of the cover art embedded into every track of an album.
+
+Images larger than the max dimension of the policy are downscaled (with area interpolation), then
+encoded as JPEG at the highest quality fitting the max size, found by a binary search over the
+quality range of the policy. Images not fitting even at the lowest quality are downscaled further.
+JPEG sources already within the limits (and images that can't be decoded) are embedded as they are, without
+re-encoding.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import TYPE_CHECKING
+
+from sootworks.audio_tagger.domain.model import AlbumInfo, ArtworkPolicy, is_jpeg
+from sootworks.audio_tagger.domain.repository import IArtworkPreparer
+from sootworks.audio_tagger.infrastructure.album_info._artwork_store import ArtworkStore
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+# Images not fitting the max size at the lowest quality are scaled by this factor, down to the min dimension.
+DOWNSCALE_FACTOR = 0.75
+MIN_DIMENSION = 64
+
+
+def _resize(image: np.ndarray, max_dimension: int) -> np.ndarray:
+    import cv2 as cv
+
+    height, width = image.shape[:2]
+    scale = max_dimension / max(height, width)
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+
+    return cv.resize(image, size, interpolation=cv.INTER_AREA)
+
+
+def _encode(image: np.ndarray, quality: int) -> bytes:
+    import cv2 as cv
+
+    return cv.imencode(".jpg", image, [cv.IMWRITE_JPEG_QUALITY, quality])[1].tobytes()
+
+
+def _encode_within(image: np.ndarray, policy: ArtworkPolicy) -> bytes | None:
+    """Encoding the image at the highest quality fitting the max size, None if it doesn't fit at the lowest one."""
+    encoded = _encode(image=image, quality=policy.max_quality)
+    if (policy.max_bytes is None) or (len(encoded) <= policy.max_bytes):
+        return encoded
+
+    best, low, high = None, policy.min_quality, policy.max_quality - 1
+    while low <= high:
+        quality = (low + high) // 2
+        encoded = _encode(image=image, quality=quality)
+        if len(encoded) <= policy.max_bytes:
+            best, low = encoded, quality + 1
+        else:
+            high = quality - 1
+
+    return best
+
+
+def prepare_cover_art(data: bytes, policy: ArtworkPolicy) -> bytes:
+    """Returning the JPEG variant of the encoded image conforming to the policy (as far as the min dimension allows)."""
+    import cv2 as cv
+    import numpy as np
+
+    image = cv.imdecode(np.frombuffer(data, np.uint8), cv.IMREAD_COLOR)
+    if image is None:  # e.g. a format OpenCV doesn't support, left to media players
+        return data
+
+    dimension = max(image.shape[:2])
+    if (policy.max_dimension is not None) and (dimension > policy.max_dimension):
+        image, dimension = _resize(image=image, max_dimension=policy.max_dimension), policy.max_dimension
+    elif is_jpeg(data) and ((policy.max_bytes is None) or (len(data) <= policy.max_bytes)):
+        return data
+
+    while (encoded := _encode_within(image=image, policy=policy)) is None:
+        dimension = round(dimension * DOWNSCALE_FACTOR)
+        if dimension < MIN_DIMENSION:
+            return _encode(image=image, quality=policy.min_quality)
+        image = _resize(image=image, max_dimension=dimension)
+
+    return encoded
+
+
+class OpenCVArtworkPreparer(IArtworkPreparer):
+    """Preparing cover art with OpenCV, variants are kept by the artwork store (if given) for later runs."""
+
+    def __init__(self, policy: ArtworkPolicy, artwork_store: ArtworkStore | None = None) -> None:
+        self.policy = policy
+        self.artwork_store = artwork_store
+
+    def prepare(self, album_info: AlbumInfo) -> bytes | None:
+        if (album_info.cover_art_data is None) or self.policy.is_unlimited:
+            return None
+
+        source_digest = hashlib.sha256(album_info.cover_art_data).hexdigest()
+        if self.artwork_store is not None:
+            variant = self.artwork_store.get_variant(source_digest=source_digest, policy=self.policy.key)
+            if variant is not None:
+                return variant
+
+        variant = prepare_cover_art(data=album_info.cover_art_data, policy=self.policy)
+        if self.artwork_store is not None:
+            self.artwork_store.put_variant(source_digest=source_digest, policy=self.policy.key, data=variant)
+
+        return variant
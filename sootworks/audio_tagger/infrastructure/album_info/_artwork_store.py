@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+
+"""Content-addressed store of cover art shared between runs.
+
+Images are kept as raw bytes named by their SHA-256 digest, while an SQLite index maps release
+IDs to the digest of their front image along with the approval status reported by the Cover
+Art Archive. Both requests of a cover art download are hence skipped for releases seen before,
+even by concurrent worker processes. Variants prepared for embedding (downscaled and recompressed
+by an artwork policy) are kept as objects as well, mapped from the digest of their source image.
+Images are evicted in least-recently-used order once the disk quota is exceeded.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from sootworks.audio_tagger.infrastructure._sqlite import connect
+
+
+DEFAULT_QUOTA = 1024 * 1024 * 1024  # bytes
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS releases (
+    album_id TEXT PRIMARY KEY,
+    approved INTEGER NOT NULL,
+    digest TEXT,
+    fetched_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS objects (
+    digest TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS objects_accessed_at ON objects (accessed_at);
+CREATE TABLE IF NOT EXISTS variants (
+    source_digest TEXT NOT NULL,
+    policy TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    PRIMARY KEY (source_digest, policy)
+);
+"""
+
+
+class ArtworkEntry(BaseModel):
+    approved: bool
+    digest: str | None = None
+    data: bytes | None = None  # None if there is no approved image, or if it has been evicted
+
+
+class ArtworkStore:
+    def __init__(self, path: Path, quota: int = DEFAULT_QUOTA) -> None:
+        self.path = path
+        self.quota = quota
+
+        self._lock = threading.Lock()
+        self._connection = None
+
+    def _get_connection(self):
+        if self._connection is None:
+            self._connection = connect(self.path / "artwork.sqlite")
+            self._connection.executescript(_SCHEMA)
+
+        return self._connection
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _get_object_path(self, digest: str) -> Path:
+        return self.path / "objects" / digest[:2] / digest
+
+    def _read_object(self, digest: str) -> bytes | None:
+        try:
+            data = self._get_object_path(digest=digest).read_bytes()
+        except FileNotFoundError:
+            return None
+
+        self._get_connection().execute("UPDATE objects SET accessed_at = ? WHERE digest = ?", (time.time(), digest))
+        return data
+
+    def _write_object(self, digest: str, data: bytes) -> None:
+        object_path = self._get_object_path(digest=digest)
+        if not object_path.exists():
+            # Objects are immutable, concurrent writers of the same digest write the very same bytes.
+            object_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = object_path.with_name(f".{digest}.{os.getpid()}.{threading.get_ident()}.tmp")
+            try:
+                tmp.write_bytes(data)
+                os.replace(tmp, object_path)
+            finally:
+                tmp.unlink(missing_ok=True)
+
+        self._get_connection().execute(
+            "INSERT OR REPLACE INTO objects (digest, size, accessed_at) VALUES (?, ?, ?)",
+            (digest, len(data), time.time()),
+        )
+
+    def _enforce_quota(self) -> list[str]:
+        """Evicting the least recently used objects, returning their digests.
+
+        Only their rows are deleted, the files are to be removed once the transaction has been committed (see
+        _remove_objects), so that a rollback doesn't leave rows pointing to removed files.
+        """
+        connection = self._get_connection()
+        (total,) = connection.execute("SELECT COALESCE(SUM(size), 0) FROM objects").fetchone()
+        if total <= self.quota:
+            return []
+
+        evicted = []
+        for digest, size in connection.execute("SELECT digest, size FROM objects ORDER BY accessed_at").fetchall():
+            connection.execute("DELETE FROM objects WHERE digest = ?", (digest,))
+            evicted.append(digest)
+
+            total -= size
+            if total <= self.quota:
+                break
+
+        return evicted
+
+    def _remove_objects(self, digests: list[str]) -> None:
+        for digest in digests:
+            self._get_object_path(digest=digest).unlink(missing_ok=True)
+
+    def get(self, album_id: str) -> ArtworkEntry | None:
+        with self._lock:
+            row = (
+                self._get_connection()
+                .execute("SELECT approved, digest FROM releases WHERE album_id = ?", (album_id,))
+                .fetchone()
+            )
+            if row is None:
+                return None
+
+            approved, digest = bool(row[0]), row[1]
+            data = None if (digest is None) else self._read_object(digest=digest)
+
+            return ArtworkEntry(approved=approved, digest=digest, data=data)
+
+    def put(self, album_id: str, approved: bool, data: bytes | None) -> ArtworkEntry:
+        digest = None if (data is None) else hashlib.sha256(data).hexdigest()
+        with self._lock:
+            connection = self._get_connection()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                if data is not None:
+                    self._write_object(digest=digest, data=data)
+                connection.execute(
+                    "INSERT OR REPLACE INTO releases (album_id, approved, digest, fetched_at) VALUES (?, ?, ?, ?)",
+                    (album_id, int(approved), digest, time.time()),
+                )
+                evicted = self._enforce_quota()
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            else:
+                connection.execute("COMMIT")
+                self._remove_objects(digests=evicted)
+
+        return ArtworkEntry(approved=approved, digest=digest, data=data)
+
+    def get_variant(self, source_digest: str, policy: str) -> bytes | None:
+        """Returning the variant of the source image prepared by the given policy, None if unknown or evicted."""
+        with self._lock:
+            row = (
+                self._get_connection()
+                .execute("SELECT digest FROM variants WHERE source_digest = ? AND policy = ?", (source_digest, policy))
+                .fetchone()
+            )
+
+            return None if (row is None) else self._read_object(digest=row[0])
+
+    def put_variant(self, source_digest: str, policy: str, data: bytes) -> None:
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            connection = self._get_connection()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._write_object(digest=digest, data=data)
+                connection.execute(
+                    "INSERT OR REPLACE INTO variants (source_digest, policy, digest) VALUES (?, ?, ?)",
+                    (source_digest, policy, digest),
+                )
+                evicted = self._enforce_quota()
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            else:
+                connection.execute("COMMIT")
+                self._remove_objects(digests=evicted)
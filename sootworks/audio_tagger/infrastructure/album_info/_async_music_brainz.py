@@ -0,0 +1,323 @@
+# -*- coding: utf-8 -*-
+
+"""MusicBrainz and Cover Art Archive client built on asyncio.
+
+Requests are sent through a single pooled HTTP session (keeping connections alive between
+calls), running on an event loop of its own, so that releases and cover art of upcoming albums
+can be prefetched concurrently while the current one is being processed. Requests to MusicBrainz
+are throttled by a token bucket, which can be shared by worker processes. Responses are parsed
+the way musicbrainzngs does, so that release descriptors (and the caches holding them) are the
+same for both clients.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import io
+import json
+import re
+import threading
+from concurrent.futures import Future
+from datetime import datetime, timezone
+from functools import partial
+from typing import TYPE_CHECKING
+
+from musicbrainzngs import mbxml
+
+from sootworks.audio_tagger.domain.exceptions import AlbumInfoUnavailableError
+from sootworks.audio_tagger.domain.model import AlbumInfo, DefaultTags
+from sootworks.audio_tagger.domain.repository import Tracer
+from sootworks.audio_tagger.infrastructure.album_info._artwork_store import ArtworkStore
+from sootworks.audio_tagger.infrastructure.album_info._music_brainz import (
+    RELEASE_INCLUDES,
+    MusicBrainzAlbumInfoRepository,
+)
+from sootworks.audio_tagger.infrastructure.album_info._rate_limiter import TokenBucketRateLimiter
+from sootworks.audio_tagger.infrastructure.album_info._release_cache import ReleaseCache
+from sootworks.audio_tagger.infrastructure.album_info._release_index import ReleaseIndex
+
+if TYPE_CHECKING:
+    # aiohttp is imported lazily, keeping the startup of the CLI fast when the client isn't used.
+    import aiohttp
+
+
+MUSICBRAINZ_URL = "https://musicbrainz.org/ws/2"
+COVER_ART_ARCHIVE_URL = "https://coverartarchive.org"
+
+DEFAULT_MAX_CONNECTIONS = 4
+DEFAULT_TIMEOUT = 30.0  # seconds
+MAX_RETRIES = 3
+RETRY_STATUSES = {429, 502, 503, 504}  # e.g. 503 is returned by MusicBrainz if the rate limit is exceeded
+
+_LUCENE_SPECIAL_CHARACTERS = re.compile(r'([+\-&|!(){}\[\]\^"~*?:\\/])')
+
+
+def _get_retry_delay(retry_after: str | None, attempt: int) -> float:
+    """The delay (in seconds) asked for by the server, given either in seconds or as an HTTP date.
+
+    Backing off exponentially if it's missing or malformed.
+    """
+    if retry_after is None:
+        return 2**attempt
+
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = email.utils.parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return 2**attempt
+    if retry_at.tzinfo is None:  # e.g. '-0000'
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class AsyncMusicBrainzAlbumInfoRepository(MusicBrainzAlbumInfoRepository):
+    MUSICBRAINZ_URL = MUSICBRAINZ_URL
+    COVER_ART_ARCHIVE_URL = COVER_ART_ARCHIVE_URL
+
+    def __init__(
+        self,
+        app: str,
+        version: str,
+        contact: str,
+        interactive: bool = True,
+        release_cache: ReleaseCache | None = None,
+        artwork_store: ArtworkStore | None = None,
+        offline: bool = False,
+        release_index: ReleaseIndex | None = None,
+        rate_limiter: TokenBucketRateLimiter | None = None,
+        musicbrainz_url: str = MUSICBRAINZ_URL,
+        cover_art_archive_url: str = COVER_ART_ARCHIVE_URL,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        tracer: Tracer | None = None,
+    ) -> None:
+        super().__init__(
+            app=app,
+            version=version,
+            contact=contact,
+            interactive=interactive,
+            release_cache=release_cache,
+            artwork_store=artwork_store,
+            offline=offline,
+            release_index=release_index,
+            tracer=tracer,
+        )
+        self.rate_limiter = TokenBucketRateLimiter(name="musicbrainz") if (rate_limiter is None) else rate_limiter
+        self.musicbrainz_url = musicbrainz_url.rstrip("/")
+        self.cover_art_archive_url = cover_art_archive_url.rstrip("/")
+        self.max_connections = max_connections
+
+        # Started lazily, on the first request.
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._session: aiohttp.ClientSession | None = None
+        self._lock = threading.Lock()
+        self._releases: dict[str, Future] = {}
+        self._cover_art: dict[str, Future] = {}
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="musicbrainz-client", daemon=True).start()
+
+            return self._loop
+
+    def _submit(self, coroutine) -> Future:
+        return asyncio.run_coroutine_threadsafe(coroutine, self._get_loop())
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # Only ever called on the event loop.
+        if self._session is None:
+            import aiohttp
+
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections),
+                timeout=aiohttp.ClientTimeout(total=DEFAULT_TIMEOUT),
+                headers={"User-Agent": f"{self.app}/{self.version} ( {self.contact} )"},
+            )
+
+        return self._session
+
+    async def _request(self, url: str, params: dict | None = None, rate_limited: bool = True) -> bytes | None:
+        """Returning the response body, or None if the resource doesn't exist."""
+        for attempt in range(MAX_RETRIES + 1):
+            if rate_limited:
+                await self.rate_limiter.acquire_async()
+
+            async with self._get_session().get(url, params=params) as response:
+                if response.status == 404:
+                    return None
+                if (response.status in RETRY_STATUSES) and (attempt < MAX_RETRIES):
+                    await asyncio.sleep(
+                        _get_retry_delay(retry_after=response.headers.get("Retry-After"), attempt=attempt)
+                    )
+                    continue
+
+                response.raise_for_status()
+                return await response.read()
+
+    async def fetch_release(self, album_id: str) -> dict:
+        body = await self._request(
+            url=f"{self.musicbrainz_url}/release/{album_id}", params={"inc": " ".join(RELEASE_INCLUDES)}
+        )
+        if body is None:
+            raise AlbumInfoUnavailableError(f"Release '{album_id}' doesn't exist.")
+
+        return mbxml.parse_message(io.BytesIO(body))
+
+    async def search_releases(self, limit: int, **fields: str) -> dict:
+        """Searching releases by the given fields, the way musicbrainzngs.search_releases does."""
+        escape = partial(_LUCENE_SPECIAL_CHARACTERS.sub, r"\\\1")
+        query = " ".join(f"{key}:({escape(value)})" for key, value in fields.items())
+        body = await self._request(url=f"{self.musicbrainz_url}/release", params={"query": query, "limit": limit})
+
+        return mbxml.parse_message(io.BytesIO(body))
+
+    async def fetch_cover_art(self, album_id: str) -> tuple[dict, bytes | None]:
+        """Returning the image list of the release, along with its front image if there's an approved one."""
+        body = await self._request(url=f"{self.cover_art_archive_url}/release/{album_id}", rate_limited=False)
+        image_list = {"images": []} if (body is None) else json.loads(body)
+
+        approved = any(("Front" in image["types"]) and image["approved"] for image in image_list["images"])
+        front_image = None
+        if approved:
+            front_image = await self._request(
+                url=f"{self.cover_art_archive_url}/release/{album_id}/front", rate_limited=False
+            )
+
+        return image_list, front_image
+
+    async def _prefetch_release(self, album_id: str) -> dict:
+        release = await self.fetch_release(album_id=album_id)
+        if self.release_cache is not None:
+            await asyncio.to_thread(
+                self.release_cache.set, album_id=album_id, includes=RELEASE_INCLUDES, release=release
+            )
+
+        return release
+
+    async def _prefetch_cover_art(self, album_id: str) -> tuple[dict, bytes | None]:
+        image_list, front_image = await self.fetch_cover_art(album_id=album_id)
+        if self.artwork_store is not None:
+            await asyncio.to_thread(
+                self.artwork_store.put, album_id=album_id, approved=(front_image is not None), data=front_image
+            )
+
+        return image_list, front_image
+
+    def _is_release_cached(self, album_id: str) -> bool:
+        return (self.release_cache is not None) and (
+            self.release_cache.get(album_id=album_id, includes=RELEASE_INCLUDES) is not None
+        )
+
+    def _is_cover_art_cached(self, album_id: str) -> bool:
+        entry = None if (self.artwork_store is None) else self.artwork_store.get(album_id=album_id)
+        return (entry is not None) and ((entry.data is not None) or (not entry.approved))
+
+    @staticmethod
+    def _discard(futures: dict[str, Future], album_id: str, future: Future) -> None:
+        if futures.get(album_id) is future:
+            futures.pop(album_id, None)
+
+    def _keep_prefetch(self, futures: dict[str, Future], album_id: str, future: Future, cached: bool) -> None:
+        """Keeping the prefetch for later lookups, only until it's done if its result is written to a cache."""
+        futures[album_id] = future
+        if cached:
+            # NOTE looked up in the cache from then on, e.g. prefetches of a library are never looked up by this repo
+            future.add_done_callback(partial(self._discard, futures, album_id))
+
+    def prefetch(self, album_ids: list[str]) -> None:
+        """Fetching the releases and cover art of the given albums concurrently in the background.
+
+        Results are written to the caches (if configured, so that they can be picked up by other processes too),
+        and are kept for later lookups by this repository. Albums already cached are skipped.
+        """
+        if self.offline:
+            return
+
+        for album_id in album_ids:
+            if (album_id not in self._releases) and (not self._is_release_cached(album_id=album_id)):
+                self._keep_prefetch(
+                    futures=self._releases,
+                    album_id=album_id,
+                    future=self._submit(self._prefetch_release(album_id=album_id)),
+                    cached=(self.release_cache is not None),
+                )
+            if (album_id not in self._cover_art) and (not self._is_cover_art_cached(album_id=album_id)):
+                self._keep_prefetch(
+                    futures=self._cover_art,
+                    album_id=album_id,
+                    future=self._submit(self._prefetch_cover_art(album_id=album_id)),
+                    cached=(self.artwork_store is not None),
+                )
+
+    def _fetch_release(self, album_id: str) -> dict:
+        future = self._releases.pop(album_id, None)
+        return (self._submit(self.fetch_release(album_id=album_id)) if (future is None) else future).result()
+
+    def _search_releases(self, limit: int, **fields: str) -> dict:
+        import aiohttp
+
+        try:
+            return self._submit(self.search_releases(limit=limit, **fields)).result()
+        except aiohttp.ClientError as e:
+            raise AlbumInfoUnavailableError(f"Searching releases has failed: {e}") from e
+
+    def _get_cover_art_future(self, album_id: str) -> Future:
+        if album_id not in self._cover_art:
+            self._cover_art[album_id] = self._submit(self.fetch_cover_art(album_id=album_id))
+
+        return self._cover_art[album_id]
+
+    def _fetch_image_list(self, album_id: str) -> dict:
+        return self._get_cover_art_future(album_id=album_id).result()[0]
+
+    def _fetch_front_image(self, album_id: str) -> bytes:
+        return self._get_cover_art_future(album_id=album_id).result()[1]
+
+    def _get_front_image(self, album_id: str) -> bytes | None:
+        try:
+            return super()._get_front_image(album_id=album_id)
+        finally:
+            # Done with, whether the image has been fetched, found not to be approved, or taken from the store.
+            self._cover_art.pop(album_id, None)
+
+    def get_album_info(self, album_id: str, default_tags: DefaultTags) -> AlbumInfo:
+        import aiohttp
+
+        try:
+            info = self._get_release(album_id=album_id)
+        except aiohttp.ClientError as e:
+            raise AlbumInfoUnavailableError(f"Fetching release '{album_id}' has failed: {e}") from e
+
+        try:
+            return self._parse_musicbrainz_release_descriptor(info=info, default_tags=default_tags)
+        except aiohttp.ClientError as e:
+            raise AlbumInfoUnavailableError(f"Fetching the cover art of release '{album_id}' has failed: {e}") from e
+
+    async def _close(self) -> None:
+        # Prefetches still pending (e.g. of albums that have failed meanwhile) are of no use anymore.
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def close(self) -> None:
+        if self._loop is not None:
+            self._submit(self._close()).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop = None
+            self._releases.clear()
+            self._cover_art.clear()
+
+        self.rate_limiter.close()
+        super().close()
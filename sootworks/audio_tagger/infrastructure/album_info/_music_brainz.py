@@ -6,15 +6,26 @@ from functools import wraps
 from pathlib import Path
 from typing import Any, Callable
 
-import cv2 as cv
-import matplotlib as mpl
-import matplotlib.pyplot as plt
 import musicbrainzngs
-import numpy as np
 
-from sootworks.audio_tagger.application.const import GOJIRA_FORTITUDE
+from sootworks.audio_tagger.domain.exceptions import AlbumInfoUnavailableError, AlbumNotFoundError
 from sootworks.audio_tagger.domain.model import AlbumInfo, AudioTrackInfo, DefaultTags
-from sootworks.audio_tagger.domain.repository import IAlbumInfoRepository
+from sootworks.audio_tagger.domain.repository import IAlbumInfoRepository, Tracer
+from sootworks.audio_tagger.infrastructure.album_info._artwork_store import ArtworkStore
+from sootworks.audio_tagger.infrastructure.album_info._release_cache import ReleaseCache
+from sootworks.audio_tagger.infrastructure.album_info._release_index import (
+    ReleaseCandidate,
+    ReleaseIndex,
+    rank_candidates,
+)
+
+
+RELEASE_INCLUDES = ["artists", "recordings"]
+
+MIN_MATCH_SCORE = 0.8  # candidates scoring lower are only chosen by the user
+ARTIST_SEARCH_LIMIT = 100  # the max page size of the web service
+RELEASE_SEARCH_LIMIT = 25
+MAX_LISTED_CANDIDATES = 5
 
 
 def clean_text(text: str) -> str:
@@ -34,21 +45,161 @@ def _set_useragent(method: Callable) -> Callable:
 
 
 class MusicBrainzAlbumInfoRepository(IAlbumInfoRepository):
-    def __init__(self, app: str, version: str, contact: str) -> None:
+    def __init__(
+        self,
+        app: str,
+        version: str,
+        contact: str,
+        interactive: bool = True,
+        release_cache: ReleaseCache | None = None,
+        artwork_store: ArtworkStore | None = None,
+        offline: bool = False,
+        release_index: ReleaseIndex | None = None,
+        tracer: Tracer | None = None,
+    ) -> None:
         self.app = app
         self.version = version
         self.contact = contact
+        self.interactive = interactive
+        self.release_cache = release_cache
+        self.artwork_store = artwork_store
+        self.offline = offline
+        self.release_index = release_index
+        self.tracer = Tracer() if (tracer is None) else tracer
 
         self._user_agent_configured = False
 
     @_set_useragent
-    def query_album_id(self, album_name: str, artist: str | None = None, year: int | None = None) -> str:
-        """FIXME implement me"""
-        return GOJIRA_FORTITUDE
+    def _search_releases(self, limit: int, **fields: str) -> dict:
+        return musicbrainzngs.search_releases(limit=limit, **fields)
+
+    @staticmethod
+    def _parse_release_list(result: dict) -> list[ReleaseCandidate]:
+        candidates = []
+        for release in result["release-list"]:
+            year = release.get("date", "")[:4]
+            candidates.append(
+                ReleaseCandidate(
+                    id=release["id"],
+                    title=clean_text(release["title"]),
+                    artist=clean_text(release.get("artist-credit-phrase", "")),
+                    year=int(year) if year.isdigit() else None,
+                    track_count=release.get("medium-track-count"),
+                )
+            )
+
+        return candidates
+
+    def _search(self, key: str, limit: int, **fields: str) -> list[ReleaseCandidate]:
+        """Returning the candidates found by the search, running it only if it's not in the index yet."""
+        if (self.release_index is not None) and ((candidates := self.release_index.get(key=key)) is not None):
+            return candidates
+
+        if self.offline:
+            return []
+
+        try:
+            with self.tracer.span("musicbrainz.search", key=key):
+                candidates = self._parse_release_list(self._search_releases(limit=limit, **fields))
+        except musicbrainzngs.WebServiceError as e:
+            raise AlbumInfoUnavailableError(f"Searching releases has failed: {e}") from e
+
+        if self.release_index is not None:
+            self.release_index.put(key=key, candidates=candidates)
+
+        return candidates
+
+    def _choose_candidate(self, album_name: str, ranked: list[tuple[float, ReleaseCandidate]]) -> str:
+        if (len(ranked) > 0) and (ranked[0][0] >= MIN_MATCH_SCORE):
+            score, candidate = ranked[0]
+            print(
+                f"Matched '{album_name}' with '{candidate.title}' by {candidate.artist} ({score:.0%}): {candidate.id}"
+            )
+            return candidate.id
+
+        if (not self.interactive) or (len(ranked) == 0):
+            best = "" if (len(ranked) == 0) else f" (best match: '{ranked[0][1].title}', {ranked[0][0]:.0%})"
+            raise AlbumNotFoundError(f"No release matching '{album_name}' has been found{best}.")
+
+        listed = ranked[:MAX_LISTED_CANDIDATES]
+        print(f"No release matches '{album_name}' closely, the best candidates are:")
+        for i, (score, candidate) in enumerate(listed, start=1):
+            print(
+                f"  {i}) '{candidate.title}' by {candidate.artist} ({candidate.year}, {candidate.track_count} tracks,"
+                f" {score:.0%}): {candidate.id}"
+            )
+
+        while True:
+            choice = input(f"Choose a release [1-{len(listed)}], or press Enter to skip: ").strip()
+            if choice == "":
+                raise AlbumNotFoundError(f"No release has been chosen for '{album_name}'.")
+            if choice.isdigit() and (1 <= int(choice) <= len(listed)):
+                return listed[int(choice) - 1][1].id
+
+            print(f"Try again (possible choices: {list(range(1, len(listed) + 1))})")
+
+    @_set_useragent
+    def query_album_id(
+        self, album_name: str, artist: str | None = None, year: int | None = None, track_count: int | None = None
+    ) -> str:
+        """Searching for the release best matching the given details, ranked by fuzzy matching and track count.
+
+        The candidates indexed by earlier searches are tried first, then all releases of the artist are listed (and
+        indexed for the artist's other albums), and only then is the album itself searched for.
+        """
+        if album_name is None:
+            raise AlbumNotFoundError("Neither a release ID nor an album name has been given.")
+
+        candidates: dict[str, ReleaseCandidate] = {}
+
+        def rank(found: list[ReleaseCandidate]) -> list[tuple[float, ReleaseCandidate]]:
+            candidates.update((candidate.id, candidate) for candidate in found)
+            return rank_candidates(
+                candidates=list(candidates.values()),
+                album_name=album_name,
+                artist=artist,
+                year=year,
+                track_count=track_count,
+            )
+
+        is_matched = lambda ranked: (len(ranked) > 0) and (ranked[0][0] >= MIN_MATCH_SCORE)  # noqa: E731
+
+        ranked = []
+        if self.release_index is not None:
+            ranked = rank(self.release_index.find(album_name=album_name, artist=artist))
+            if (artist is not None) and (not is_matched(ranked)):
+                ranked = rank(
+                    self._search(
+                        key=ReleaseIndex.get_artist_search_key(artist=artist), limit=ARTIST_SEARCH_LIMIT, artist=artist
+                    )
+                )
+        if not is_matched(ranked):
+            fields = {"release": album_name} if (artist is None) else {"release": album_name, "artist": artist}
+            ranked = rank(
+                self._search(
+                    key=ReleaseIndex.get_release_search_key(album_name=album_name, artist=artist),
+                    limit=RELEASE_SEARCH_LIMIT,
+                    **fields,
+                )
+            )
+
+        return self._choose_candidate(album_name=album_name, ranked=ranked)
+
+    @_set_useragent
+    def _fetch_image_list(self, album_id: str) -> dict:
+        return musicbrainzngs.get_image_list(album_id)
+
+    @_set_useragent
+    def _fetch_front_image(self, album_id: str) -> bytes:
+        return musicbrainzngs.get_image_front(releaseid=album_id)
+
+    @_set_useragent
+    def _fetch_release(self, album_id: str) -> dict:
+        return musicbrainzngs.get_release_by_id(album_id, includes=RELEASE_INCLUDES)
 
     @_set_useragent
     def _has_approved_cover_art(self, album_id: str) -> bool:
-        data = musicbrainzngs.get_image_list(album_id)
+        data = self._fetch_image_list(album_id=album_id)
 
         match = False
         for image in data["images"]:
@@ -61,25 +212,49 @@ class MusicBrainzAlbumInfoRepository(IAlbumInfoRepository):
         return match
 
     @_set_useragent
-    def get_cover_art(self, album_id: str, default_cover_art: Path | None) -> np.ndarray | None:
-        cover_art = None
-        if default_cover_art is None:
-            if self._has_approved_cover_art(album_id=album_id):
-                raw_image = musicbrainzngs.get_image_front(releaseid=album_id)
+    def _get_front_image(self, album_id: str) -> bytes | None:
+        entry = None if (self.artwork_store is None) else self.artwork_store.get(album_id=album_id)
+        if (entry is not None) and ((entry.data is not None) or (not entry.approved)):
+            return entry.data
 
-                np_image_array = np.frombuffer(raw_image, np.uint8)
-                cover_art = cv.imdecode(np_image_array, cv.IMREAD_COLOR)
-            else:
-                print(f"No approved cover image found for album: '{album_id}'")
-        else:
-            cover_art = cv.imread(str(default_cover_art))
+        if self.offline:
+            print(f"Cover art of album '{album_id}' is not cached, and offline mode is on.")
+            return None
+
+        # The approval status is known even if the image itself has been evicted from the store.
+        with self.tracer.span("musicbrainz.cover_art", album_id=album_id) as span:
+            approved = self._has_approved_cover_art(album_id=album_id) if (entry is None) else entry.approved
+            raw_image = self._fetch_front_image(album_id=album_id) if approved else None
+            span.byte_count = 0 if (raw_image is None) else len(raw_image)
+        if self.artwork_store is not None:
+            self.artwork_store.put(album_id=album_id, approved=approved, data=raw_image)
+
+        if not approved:
+            print(f"No approved cover image found for album: '{album_id}'")
+
+        return raw_image
+
+    @_set_useragent
+    def get_cover_art(self, album_id: str, default_cover_art: Path | None) -> bytes | None:
+        """Returning the encoded image as it is, decoding is left to those in need of the pixels."""
+        if default_cover_art is None:
+            return self._get_front_image(album_id=album_id)
 
-        return cover_art
+        return default_cover_art.read_bytes()
 
     @_set_useragent
-    def _verify_cover_art(self, cover_art: np.ndarray | None) -> None:
+    def _verify_cover_art(self, cover_art: bytes | None) -> None:
+        if not self.interactive:
+            return True
+
         key_pressed = [None]
         if cover_art is not None:
+            # The scientific stack is only loaded when there is something to preview.
+            import cv2 as cv
+            import matplotlib as mpl
+            import matplotlib.pyplot as plt
+            import numpy as np
+
             window_name = "Cover Art"
 
             # Disabling matplotlib toolbar on figure.
@@ -105,8 +280,9 @@ class MusicBrainzAlbumInfoRepository(IAlbumInfoRepository):
                 ax.imshow(cv.cvtColor(image, cv.COLOR_BGR2RGB))
                 plt.show()
 
+            image = cv.imdecode(np.frombuffer(cover_art, np.uint8), cv.IMREAD_COLOR)
             while key_pressed[0] not in ["y", "n"]:
-                show_image(image=cover_art)
+                show_image(image=image)
 
         return key_pressed[0] == "y"
 
@@ -122,6 +298,10 @@ class MusicBrainzAlbumInfoRepository(IAlbumInfoRepository):
 
             return ", ".join(artists)
 
+        def get_length(track_info: dict) -> float | None:
+            length = track_info.get("length", track_info["recording"].get("length"))
+            return None if (length is None) else int(length) / 1000  # given in milliseconds
+
         def get_tracks(release: dict, album_info: AlbumInfo) -> list[AudioTrackInfo]:
             tracks = []
             for disc_number, medium in enumerate(release["medium-list"], start=1):
@@ -131,9 +311,10 @@ class MusicBrainzAlbumInfoRepository(IAlbumInfoRepository):
                             album_info=album_info,
                             title=clean_text(track_info["recording"]["title"]),
                             total_tracks=len(medium["track-list"]),
-                            track_number=track_info["position"],
+                            track_number=int(track_info["position"]),
                             # TODO fetch genre
                             disc_number=None if (album_info.total_discs == 1) else disc_number,
+                            length=get_length(track_info),
                         )
                     )
 
@@ -143,21 +324,48 @@ class MusicBrainzAlbumInfoRepository(IAlbumInfoRepository):
             title=clean_text(release["title"]),
             artist=clean_text(get_artists(release)),
             date=int(release["date"][:4]),
-            total_discs=release["medium-count"],
+            total_discs=int(release["medium-count"]),
         )
 
         cover_art = self.get_cover_art(album_id=release["id"], default_cover_art=default_tags.cover_art)
         if self._verify_cover_art(cover_art=cover_art):
-            album_info.cover_art = cover_art
+            album_info.cover_art_data = cover_art
 
         album_info.tracks = get_tracks(release=release, album_info=album_info)
 
         return album_info
 
+    @_set_useragent
+    def _get_release(self, album_id: str) -> dict:
+        if self.release_cache is not None:
+            with self.tracer.span("release_cache.get", album_id=album_id) as span:
+                info = self.release_cache.get(album_id=album_id, includes=RELEASE_INCLUDES, allow_expired=self.offline)
+                # NOTE counts are those of the run so far (in this process), the last span holds the totals
+                span.attributes.update(hit=(info is not None), **self.release_cache.stats.dict())
+            if info is not None:
+                return info
+
+        if self.offline:
+            raise AlbumInfoUnavailableError(f"Release '{album_id}' is not cached, and offline mode is on.")
+
+        with self.tracer.span("musicbrainz.release", album_id=album_id):
+            info = self._fetch_release(album_id=album_id)
+        if self.release_cache is not None:
+            self.release_cache.set(album_id=album_id, includes=RELEASE_INCLUDES, release=info)
+
+        return info
+
+    def close(self) -> None:
+        if (self.release_cache is not None) and ((self.release_cache.stats.hits + self.release_cache.stats.misses) > 0):
+            print(f"Release cache: {self.release_cache.stats.summarize()}.")
+        for store in (self.release_cache, self.release_index, self.artwork_store):
+            if store is not None:
+                store.close()
+
     @_set_useragent
     def get_album_info(self, album_id: str, default_tags: DefaultTags) -> AlbumInfo:
         try:
-            info = musicbrainzngs.get_release_by_id(album_id, includes=["artists", "recordings"])
+            info = self._get_release(album_id=album_id)
         except musicbrainzngs.WebServiceError as e:
             print(f"Something went wrong with the request: {e}")
         else:
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+from sootworks.audio_tagger.domain.exceptions import AlbumInfoUnavailableError, AlbumNotFoundError
+from sootworks.audio_tagger.domain.repository import Tracer
+from sootworks.audio_tagger.infrastructure.album_info._artwork_store import ArtworkStore
+from sootworks.audio_tagger.infrastructure.album_info._music_brainz import MusicBrainzAlbumInfoRepository
+from sootworks.audio_tagger.infrastructure.album_info._release_database import ReleaseDatabase
+from sootworks.audio_tagger.infrastructure.album_info._release_index import rank_candidates
+
+
+class MusicBrainzDumpAlbumInfoRepository(MusicBrainzAlbumInfoRepository):
+    """Serving album info from a release database imported from a MusicBrainz JSON dump, never going online.
+
+    The dumps don't include images, hence cover art is only served if given, or if kept by the artwork store.
+    """
+
+    def __init__(
+        self,
+        app: str,
+        version: str,
+        contact: str,
+        database: ReleaseDatabase,
+        interactive: bool = True,
+        artwork_store: ArtworkStore | None = None,
+        tracer: Tracer | None = None,
+    ) -> None:
+        super().__init__(
+            app=app,
+            version=version,
+            contact=contact,
+            interactive=interactive,
+            artwork_store=artwork_store,
+            offline=True,
+            tracer=tracer,
+        )
+        self.database = database
+
+    def query_album_id(
+        self, album_name: str, artist: str | None = None, year: int | None = None, track_count: int | None = None
+    ) -> str:
+        if album_name is None:
+            raise AlbumNotFoundError("Neither a release ID nor an album name has been given.")
+
+        with self.tracer.span("release_database.search", album_name=album_name):
+            candidates = self.database.find(album_name=album_name, artist=artist)
+        ranked = rank_candidates(
+            candidates=candidates,
+            album_name=album_name,
+            artist=artist,
+            year=year,
+            track_count=track_count,
+        )
+
+        return self._choose_candidate(album_name=album_name, ranked=ranked)
+
+    def close(self) -> None:
+        self.database.close()
+        super().close()
+
+    def _get_release(self, album_id: str) -> dict:
+        with self.tracer.span("release_database.release", album_id=album_id):
+            info = self.database.get(album_id=album_id)
+        if info is None:
+            raise AlbumInfoUnavailableError(f"Release '{album_id}' is not in the release database.")
+
+        return info
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+"""Token bucket rate limiting, optionally shared between processes.
+
+The state of a bucket (the tokens left, and when it was last refilled) can be kept in an SQLite
+table, so that worker processes calling the same web service draw from the same bucket, rather
+than each of them being allowed the full rate.
+"""
+
+import asyncio
+import threading
+import time
+from pathlib import Path
+
+from sootworks.audio_tagger.infrastructure._sqlite import connect
+
+
+# MusicBrainz allows an average of one request per second per client.
+DEFAULT_RATE = 1.0  # tokens per second
+DEFAULT_CAPACITY = 1.0  # tokens
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    name TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+class TokenBucketRateLimiter:
+    def __init__(
+        self,
+        name: str,
+        rate: float = DEFAULT_RATE,
+        capacity: float = DEFAULT_CAPACITY,
+        path: Path | None = None,
+    ) -> None:
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity
+        self.path = path  # the buckets are only shared within the process if not set
+
+        self._lock = threading.Lock()
+        self._connection = None
+        self._bucket = (capacity, time.time())
+
+    def _get_connection(self):
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = connect(self.path)
+            self._connection.executescript(_SCHEMA)
+
+        return self._connection
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _take(self, tokens: float, updated_at: float, now: float) -> tuple[float, float, float]:
+        """Refilling the bucket and taking a token from it if there's one, returning the new state and the delay."""
+        tokens = min(self.capacity, tokens + (now - updated_at) * self.rate)
+        if tokens >= 1:
+            return tokens - 1, now, 0.0
+
+        return tokens, now, (1 - tokens) / self.rate
+
+    def _try_acquire(self) -> float:
+        """Taking a token if available, returning the number of seconds to wait before trying again otherwise."""
+        now = time.time()
+        with self._lock:
+            if self.path is None:
+                tokens, updated_at, delay = self._take(*self._bucket, now=now)
+                self._bucket = (tokens, updated_at)
+                return delay
+
+            connection = self._get_connection()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = connection.execute(
+                    "SELECT tokens, updated_at FROM buckets WHERE name = ?", (self.name,)
+                ).fetchone()
+                tokens, updated_at, delay = self._take(*(row or (self.capacity, now)), now=now)
+                connection.execute(
+                    "INSERT OR REPLACE INTO buckets (name, tokens, updated_at) VALUES (?, ?, ?)",
+                    (self.name, tokens, updated_at),
+                )
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            else:
+                connection.execute("COMMIT")
+
+            return delay
+
+    def acquire(self) -> None:
+        while (delay := self._try_acquire()) > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        # The shared bucket may be locked by other processes for a moment, hence not blocking the event loop.
+        while (delay := await asyncio.to_thread(self._try_acquire)) > 0:
+            await asyncio.sleep(delay)
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+
+"""Tiered cache of MusicBrainz release descriptors.
+
+Lookups are served by an in-memory LRU first, then by an on-disk SQLite store shared between
+runs (and worker processes), so re-tagging an album doesn't pay for the rate-limited round trip
+to the web service again.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from sootworks.audio_tagger.infrastructure._sqlite import connect
+
+
+DEFAULT_TTL = 30 * 24 * 60 * 60.0  # seconds
+DEFAULT_MAX_MEMORY_ENTRIES = 128
+DEFAULT_MAX_DISK_ENTRIES = 10_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS releases (
+    key TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS releases_accessed_at ON releases (accessed_at);
+"""
+
+
+class CacheStats(BaseModel):
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    memory_evictions: int = 0
+    disk_evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def evictions(self) -> int:
+        return self.memory_evictions + self.disk_evictions
+
+    def summarize(self) -> str:
+        return (
+            f"{self.hits} hit(s) ({self.memory_hits} in memory, {self.disk_hits} on disk), {self.misses} miss(es),"
+            f" {self.evictions} eviction(s), {self.expirations} expired"
+        )
+
+
+class ReleaseCache:
+    def __init__(
+        self,
+        path: Path,
+        ttl: float | None = DEFAULT_TTL,
+        max_memory_entries: int = DEFAULT_MAX_MEMORY_ENTRIES,
+        max_disk_entries: int = DEFAULT_MAX_DISK_ENTRIES,
+    ) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.stats = CacheStats()
+
+        self._memory: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection = None
+
+    @staticmethod
+    def _get_key(album_id: str, includes: list[str]) -> str:
+        return f"{album_id}:{'+'.join(sorted(includes))}"
+
+    def _get_connection(self):
+        # Connecting lazily, so that the cache can be configured before worker processes are forked.
+        if self._connection is None:
+            self._connection = connect(self.path)
+            self._connection.executescript(_SCHEMA)
+
+        return self._connection
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return (self.ttl is not None) and ((now - created_at) > self.ttl)
+
+    def _set_in_memory(self, key: str, created_at: float, release: dict) -> None:
+        self._memory[key] = (created_at, release)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self.stats.memory_evictions += 1
+
+    def _get_from_memory(self, key: str, now: float, allow_expired: bool) -> dict | None:
+        if (entry := self._memory.get(key)) is None:
+            return None
+
+        created_at, release = entry
+        if (not allow_expired) and self._is_expired(created_at=created_at, now=now):
+            del self._memory[key]
+            self.stats.expirations += 1
+            return None
+
+        self._memory.move_to_end(key)
+        self.stats.memory_hits += 1
+        return release
+
+    def _get_from_disk(self, key: str, now: float, allow_expired: bool) -> dict | None:
+        connection = self._get_connection()
+        row = connection.execute("SELECT payload, created_at FROM releases WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+
+        payload, created_at = row
+        if (not allow_expired) and self._is_expired(created_at=created_at, now=now):
+            connection.execute("DELETE FROM releases WHERE key = ?", (key,))
+            self.stats.expirations += 1
+            return None
+
+        connection.execute("UPDATE releases SET accessed_at = ? WHERE key = ?", (now, key))
+        release = json.loads(payload)
+        self._set_in_memory(key=key, created_at=created_at, release=release)
+        self.stats.disk_hits += 1
+        return release
+
+    def get(self, album_id: str, includes: list[str], allow_expired: bool = False) -> dict | None:
+        """Returning the cached release, expired entries are only served if explicitly allowed (e.g. offline)."""
+        key, now = self._get_key(album_id=album_id, includes=includes), time.time()
+        with self._lock:
+            release = self._get_from_memory(key=key, now=now, allow_expired=allow_expired)
+            if release is None:
+                release = self._get_from_disk(key=key, now=now, allow_expired=allow_expired)
+            if release is None:
+                self.stats.misses += 1
+
+            return release
+
+    def set(self, album_id: str, includes: list[str], release: dict) -> None:
+        key, now = self._get_key(album_id=album_id, includes=includes), time.time()
+        with self._lock:
+            self._set_in_memory(key=key, created_at=now, release=release)
+
+            connection = self._get_connection()
+            connection.execute(
+                "INSERT OR REPLACE INTO releases (key, payload, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(release), now, now),
+            )
+            self.stats.disk_evictions += connection.execute(
+                "DELETE FROM releases WHERE key IN"
+                " (SELECT key FROM releases ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_disk_entries,),
+            ).rowcount
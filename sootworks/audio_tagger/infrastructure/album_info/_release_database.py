@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+
+"""Local database of MusicBrainz releases, populated from a JSON dump.
+
+Releases of the JSON data dumps (one JSON document per line, either as a plain file, optionally
+compressed, or as the 'mbdump/release' member of a tar archive) are streamed line by line, and
+converted into the descriptors returned by musicbrainzngs.get_release_by_id(), trimmed to the
+fields the tagger uses. Descriptors are stored along with their normalized title and artist, so
+that releases can be both looked up and searched for without contacting the web service.
+
+Imports are committed in batches along with the number of lines processed, so an interrupted
+import resumes where it has stopped, while a newer dump updates the releases imported before.
+"""
+
+import bz2
+import gzip
+import json
+import lzma
+import tarfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator
+
+from pydantic import BaseModel
+
+from sootworks.audio_tagger.infrastructure._sqlite import connect
+from sootworks.audio_tagger.infrastructure.album_info._release_index import ReleaseCandidate, normalize
+
+
+DEFAULT_BATCH_SIZE = 1000  # releases per transaction
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS releases (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    artist TEXT NOT NULL,
+    year INTEGER,
+    track_count INTEGER,
+    normalized_title TEXT NOT NULL,
+    normalized_artist TEXT NOT NULL,
+    descriptor TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS releases_normalized_title ON releases (normalized_title);
+CREATE INDEX IF NOT EXISTS releases_normalized_artist ON releases (normalized_artist);
+CREATE TABLE IF NOT EXISTS imports (
+    source TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    lines INTEGER NOT NULL,
+    completed INTEGER NOT NULL
+);
+"""
+
+_OPENERS = {".gz": gzip.open, ".xz": lzma.open, ".bz2": bz2.open}
+
+
+class ImportStats(BaseModel):
+    imported: int = 0
+    skipped: int = 0  # lines imported by an earlier, interrupted run
+    failed: int = 0  # lines that couldn't be parsed
+    completed: bool = False
+
+
+def _get_artist_credit(credits: list[dict]) -> list[dict | str]:
+    """Returning the artist credit the way musicbrainzngs does, join phrases interleaved with the artists."""
+    artist_credit = []
+    for credit in credits:
+        entry = {"artist": {"id": credit["artist"]["id"], "name": credit["artist"]["name"]}}
+        if credit.get("name", credit["artist"]["name"]) != credit["artist"]["name"]:
+            entry["name"] = credit["name"]
+        artist_credit.append(entry)
+        if credit.get("joinphrase"):
+            artist_credit.append(credit["joinphrase"])
+
+    return artist_credit
+
+
+def _get_track(track: dict) -> dict:
+    recording = {"id": track["recording"]["id"], "title": track["recording"]["title"]}
+    if track["recording"].get("length") is not None:
+        recording["length"] = str(track["recording"]["length"])
+
+    result = {"id": track["id"], "position": str(track["position"]), "number": track["number"], "recording": recording}
+    if track.get("length") is not None:
+        result["length"] = str(track["length"])
+
+    return result
+
+
+def convert_release(release: dict) -> dict:
+    """Converting a release of the JSON dump into a (trimmed) descriptor, as returned by musicbrainzngs."""
+    media = release.get("media", [])
+    converted = {
+        "id": release["id"],
+        "title": release["title"],
+        "artist-credit": _get_artist_credit(release.get("artist-credit", [])),
+        "medium-count": len(media),
+        "medium-list": [
+            {
+                "position": str(medium["position"]),
+                "track-list": [_get_track(track) for track in medium.get("tracks", [])],
+                "track-count": medium.get("track-count", len(medium.get("tracks", []))),
+            }
+            for medium in media
+        ],
+    }
+    converted["artist-credit-phrase"] = "".join(
+        credit if isinstance(credit, str) else credit.get("name", credit["artist"]["name"])
+        for credit in converted["artist-credit"]
+    )
+    if release.get("date"):
+        converted["date"] = release["date"]
+
+    return {"release": converted}
+
+
+@contextmanager
+def open_dump(path: Path) -> Iterator[IO[bytes]]:
+    """Opening the JSON lines of the dump as a stream, decompressing (and untarring) it on the fly."""
+    if tarfile.is_tarfile(path):
+        with tarfile.open(path, mode="r|*") as archive:
+            for member in archive:
+                if member.isfile() and (member.name.rsplit("/", 1)[-1] == "release"):
+                    yield archive.extractfile(member)
+                    return
+
+        raise ValueError(f"No 'mbdump/release' file has been found in '{path}'.")
+
+    with _OPENERS.get(path.suffix.lower(), open)(path, "rb") as f:
+        yield f
+
+
+class ReleaseDatabase:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+        self._lock = threading.Lock()
+        self._connection = None
+
+    def _get_connection(self):
+        # Connecting lazily, so that the database can be configured before worker processes are forked.
+        if self._connection is None:
+            self._connection = connect(self.path)
+            self._connection.executescript(_SCHEMA)
+
+        return self._connection
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def get(self, album_id: str) -> dict | None:
+        with self._lock:
+            row = self._get_connection().execute("SELECT descriptor FROM releases WHERE id = ?", (album_id,)).fetchone()
+
+        return None if (row is None) else json.loads(row[0])
+
+    def find(self, album_name: str, artist: str | None = None) -> list[ReleaseCandidate]:
+        """Returning the releases with the exact (normalized) title, along with those of the artist if given."""
+        query = "SELECT id, title, artist, year, track_count FROM releases WHERE normalized_title = ?"
+        params = [normalize(album_name)]
+        if artist is not None:
+            query += " UNION SELECT id, title, artist, year, track_count FROM releases WHERE normalized_artist = ?"
+            params.append(normalize(artist))
+        with self._lock:
+            rows = self._get_connection().execute(query, params).fetchall()
+
+        return [
+            ReleaseCandidate(id=id_, title=title, artist=artist, year=year, track_count=track_count)
+            for id_, title, artist, year, track_count in rows
+        ]
+
+    @staticmethod
+    def _get_row(descriptor: dict) -> tuple:
+        release = descriptor["release"]
+        year = release.get("date", "")[:4]
+        artist = release["artist-credit-phrase"]
+
+        return (
+            release["id"],
+            release["title"],
+            artist,
+            int(year) if year.isdigit() else None,
+            sum(len(medium["track-list"]) for medium in release["medium-list"]),
+            normalize(release["title"]),
+            normalize(artist),
+            json.dumps(descriptor, separators=(",", ":")),
+        )
+
+    def _write_batch(self, connection, rows: list[tuple], source: str, stat, lines: int, completed: bool) -> None:
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.executemany("INSERT OR REPLACE INTO releases VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            connection.execute(
+                "INSERT OR REPLACE INTO imports (source, size, mtime, lines, completed) VALUES (?, ?, ?, ?, ?)",
+                (source, stat.st_size, stat.st_mtime, lines, int(completed)),
+            )
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        else:
+            connection.execute("COMMIT")
+
+    def import_dump(
+        self, path: Path, batch_size: int = DEFAULT_BATCH_SIZE, progress_interval: float = 10.0
+    ) -> ImportStats:
+        """Importing the releases of the dump, resuming an interrupted import of the same file."""
+        source, stat = str(path.absolute()), path.stat()
+        stats = ImportStats()
+        with self._lock:
+            connection = self._get_connection()
+            row = connection.execute(
+                "SELECT size, mtime, lines, completed FROM imports WHERE source = ?", (source,)
+            ).fetchone()
+            resume_from = 0
+            if (row is not None) and (row[0] == stat.st_size) and (row[1] == stat.st_mtime):
+                if row[3]:
+                    stats.skipped, stats.completed = row[2], True
+                    return stats
+                resume_from = row[2]
+
+            rows, lines, reported_at = [], 0, time.monotonic()
+            with open_dump(path) as f:
+                for line in f:
+                    lines += 1
+                    if lines <= resume_from:
+                        stats.skipped += 1
+                        continue
+
+                    try:
+                        rows.append(self._get_row(convert_release(json.loads(line))))
+                    except (ValueError, KeyError, TypeError):
+                        stats.failed += 1
+
+                    if len(rows) >= batch_size:
+                        self._write_batch(
+                            connection=connection, rows=rows, source=source, stat=stat, lines=lines, completed=False
+                        )
+                        stats.imported += len(rows)
+                        rows = []
+                        if time.monotonic() - reported_at >= progress_interval:
+                            print(f"Imported {stats.imported} release(s) ({lines} line(s) processed)...")
+                            reported_at = time.monotonic()
+
+            self._write_batch(connection=connection, rows=rows, source=source, stat=stat, lines=lines, completed=True)
+            stats.imported += len(rows)
+            stats.completed = True
+
+        return stats
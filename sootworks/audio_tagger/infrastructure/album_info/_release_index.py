@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+
+"""Local index of MusicBrainz release search results.
+
+Candidates returned by release searches are kept in an SQLite database shared between runs (and
+worker processes), keyed by their normalized title and artist, so that re-queries, and albums of
+artists whose releases have been listed before, are resolved without another rate-limited round
+trip to the web service.
+"""
+
+import json
+import re
+import threading
+import time
+import unicodedata
+from difflib import SequenceMatcher
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from sootworks.audio_tagger.infrastructure._sqlite import connect
+
+
+DEFAULT_TTL = 30 * 24 * 60 * 60.0  # seconds
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS candidates (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    artist TEXT NOT NULL,
+    year INTEGER,
+    track_count INTEGER,
+    normalized_title TEXT NOT NULL,
+    normalized_artist TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS candidates_normalized_title ON candidates (normalized_title);
+CREATE INDEX IF NOT EXISTS candidates_normalized_artist ON candidates (normalized_artist);
+CREATE TABLE IF NOT EXISTS searches (
+    key TEXT PRIMARY KEY,
+    ids TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+# Weights of the criteria candidates are ranked by, those not known for the album queried are left out.
+TITLE_WEIGHT = 0.6
+ARTIST_WEIGHT = 0.25
+YEAR_WEIGHT = 0.05
+TRACK_COUNT_WEIGHT = 0.1
+
+
+def normalize(text: str | None) -> str:
+    """Lowercasing, and stripping accents, punctuation and a leading article for fuzzy matching."""
+    if text is None:
+        return ""
+
+    text = unicodedata.normalize("NFKD", text.replace("’", "'").replace("_", " "))
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    text = _WHITESPACE.sub(" ", _PUNCTUATION.sub(" ", text)).strip()
+
+    return text[4:] if text.startswith("the ") else text
+
+
+class ReleaseCandidate(BaseModel):
+    id: str
+    title: str
+    artist: str
+    year: int | None = None
+    track_count: int | None = None
+
+    def get_score(
+        self, album_name: str, artist: str | None = None, year: int | None = None, track_count: int | None = None
+    ) -> float:
+        """Returning how well the candidate matches the album queried, from 0 to 1."""
+        similarity = lambda a, b: SequenceMatcher(a=normalize(a), b=normalize(b)).ratio()  # noqa: E731
+
+        scores = [(TITLE_WEIGHT, similarity(album_name, self.title))]
+        if artist is not None:
+            scores.append((ARTIST_WEIGHT, similarity(artist, self.artist)))
+        if (year is not None) and (self.year is not None):
+            scores.append((YEAR_WEIGHT, max(0.0, 1 - abs(year - self.year) / 2)))
+        if (track_count is not None) and (self.track_count is not None):
+            scores.append((TRACK_COUNT_WEIGHT, max(0.0, 1 - abs(track_count - self.track_count) / track_count)))
+
+        return sum(weight * score for weight, score in scores) / sum(weight for weight, _ in scores)
+
+
+def rank_candidates(
+    candidates: list[ReleaseCandidate],
+    album_name: str,
+    artist: str | None = None,
+    year: int | None = None,
+    track_count: int | None = None,
+) -> list[tuple[float, ReleaseCandidate]]:
+    """Returning the scores of the candidates along with them, best first (keeping the order of ties)."""
+    scored = (
+        (candidate.get_score(album_name=album_name, artist=artist, year=year, track_count=track_count), candidate)
+        for candidate in candidates
+    )
+
+    return sorted(scored, key=lambda item: item[0], reverse=True)
+
+
+class ReleaseIndex:
+    def __init__(self, path: Path, ttl: float | None = DEFAULT_TTL) -> None:
+        self.path = path
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._connection = None
+
+    @staticmethod
+    def get_release_search_key(album_name: str, artist: str | None = None) -> str:
+        return f"release:{normalize(album_name)}|{normalize(artist)}"
+
+    @staticmethod
+    def get_artist_search_key(artist: str) -> str:
+        return f"artist:{normalize(artist)}"
+
+    def _get_connection(self):
+        # Connecting lazily, so that the index can be configured before worker processes are forked.
+        if self._connection is None:
+            self._connection = connect(self.path)
+            self._connection.executescript(_SCHEMA)
+
+        return self._connection
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _get_candidates(self, connection, ids: list[str]) -> list[ReleaseCandidate]:
+        rows = connection.execute(
+            f"SELECT id, title, artist, year, track_count FROM candidates WHERE id IN ({', '.join('?' * len(ids))})",
+            ids,
+        ).fetchall()
+
+        return [
+            ReleaseCandidate(id=id_, title=title, artist=artist, year=year, track_count=track_count)
+            for id_, title, artist, year, track_count in rows
+        ]
+
+    def get(self, key: str) -> list[ReleaseCandidate] | None:
+        """Returning the candidates found by the given search, or None if it hasn't been run (or has expired)."""
+        with self._lock:
+            connection = self._get_connection()
+            row = connection.execute("SELECT ids, created_at FROM searches WHERE key = ?", (key,)).fetchone()
+            if (row is None) or ((self.ttl is not None) and (time.time() - row[1] > self.ttl)):
+                return None
+
+            return self._get_candidates(connection=connection, ids=json.loads(row[0]))
+
+    def put(self, key: str, candidates: list[ReleaseCandidate]) -> None:
+        with self._lock:
+            connection = self._get_connection()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO candidates"
+                    " (id, title, artist, year, track_count, normalized_title, normalized_artist)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (c.id, c.title, c.artist, c.year, c.track_count, normalize(c.title), normalize(c.artist))
+                        for c in candidates
+                    ],
+                )
+                connection.execute(
+                    "INSERT OR REPLACE INTO searches (key, ids, created_at) VALUES (?, ?, ?)",
+                    (key, json.dumps([c.id for c in candidates]), time.time()),
+                )
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            else:
+                connection.execute("COMMIT")
+
+    def find(self, album_name: str, artist: str | None = None) -> list[ReleaseCandidate]:
+        """Returning the indexed candidates of the artist (if given), or those with the exact title otherwise.
+
+        These may have been found by any earlier search, expired or not, release IDs don't change.
+        """
+        with self._lock:
+            connection = self._get_connection()
+            if artist is not None:
+                query, value = "SELECT id FROM candidates WHERE normalized_artist = ?", normalize(artist)
+            else:
+                query, value = "SELECT id FROM candidates WHERE normalized_title = ?", normalize(album_name)
+            ids = [id_ for id_, in connection.execute(query, (value,)).fetchall()]
+
+            return self._get_candidates(connection=connection, ids=ids)
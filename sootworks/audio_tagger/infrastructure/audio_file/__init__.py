@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
+from sootworks.audio_tagger.infrastructure.audio_file._duration_matcher import DurationTrackMatcher
 from sootworks.audio_tagger.infrastructure.audio_file._simple import SimpleAudioFileRepository
 
 
-__all__ = ["MusicBrainzAlbumInfoRepository", "SimpleAudioFileRepository"]
+__all__ = ["DurationTrackMatcher", "MusicBrainzAlbumInfoRepository", "SimpleAudioFileRepository"]
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+
+"""Matching audio files to tracks by comparing their durations with the track lengths.
+
+Stream durations are read from the audio headers on a thread pool. For every medium the
+absolute differences between file durations and track lengths make up a cost matrix, which is
+solved as an assignment problem: if the files are already in track order (or every file is
+closest to a distinct track) they are taken as they are, otherwise the optimal assignment is
+computed by SciPy if installed, or by a NumPy implementation of the Hungarian method.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import mutagen
+
+from sootworks.audio_tagger.domain.model import Album, AudioTrackInfo
+from sootworks.audio_tagger.domain.repository import IAudioFileRepository, ITrackMatcher
+
+if TYPE_CHECKING:
+    # NumPy (and optionally SciPy) is imported lazily, as only albums actually being matched need it.
+    import numpy as np
+
+
+DEFAULT_WORKERS = 8
+DEFAULT_TOLERANCE = 3.0  # seconds
+# Added to the costs for every position a file is moved by, so that files of (nearly) equal duration keep their order.
+ORDER_PENALTY = 1e-3  # seconds
+
+
+def _solve_assignment(costs: np.ndarray) -> np.ndarray:
+    """Returning the index of the column assigned to every row of the square cost matrix."""
+    try:
+        from scipy.optimize import linear_sum_assignment
+    except ImportError:
+        return _solve_hungarian(costs=costs)
+
+    return linear_sum_assignment(costs)[1]
+
+
+def _solve_hungarian(costs: np.ndarray) -> np.ndarray:
+    """The O(n^3) Hungarian method with potentials, the inner loop over columns vectorized."""
+    import numpy as np
+
+    n = costs.shape[0]
+    # 1-based, the 0th column being the virtual one the augmenting paths start from.
+    a = np.zeros((n + 1, n + 1))
+    a[1:, 1:] = costs
+    u, v = np.zeros(n + 1), np.zeros(n + 1)
+    p, way = np.zeros(n + 1, dtype=int), np.zeros(n + 1, dtype=int)  # p[j]: the row assigned to column j
+    for i in range(1, n + 1):
+        p[0], j0 = i, 0
+        min_v, used = np.full(n + 1, np.inf), np.zeros(n + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0, free = p[j0], ~used
+            free[0] = False
+            reduced = a[i0] - u[i0] - v
+            better = free & (reduced < min_v)
+            min_v[better], way[better] = reduced[better], j0
+            j1 = int(np.argmin(np.where(free, min_v, np.inf)))
+            delta = min_v[j1]
+            u[p[used]] += delta
+            v[used] -= delta
+            min_v[free] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0 != 0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+
+    columns = np.empty(n, dtype=int)
+    columns[p[1:] - 1] = np.arange(n)
+    return columns
+
+
+class DurationTrackMatcher(ITrackMatcher):
+    def __init__(
+        self, workers: int = DEFAULT_WORKERS, tolerance: float = DEFAULT_TOLERANCE, min_confidence: float = 0.9
+    ) -> None:
+        self.workers = workers
+        self.tolerance = tolerance  # the max difference of a file's duration and its track's length
+        self.min_confidence = min_confidence
+
+    @staticmethod
+    def read_duration(path: Path) -> float | None:
+        """Reading the stream duration from the audio headers, or None if it can't be read."""
+        try:
+            audio = mutagen.File(path)
+        except mutagen.MutagenError:
+            return None
+
+        return None if (audio is None) or (audio.info is None) else audio.info.length
+
+    def get_durations(self, paths: list[Path]) -> list[float | None]:
+        if (self.workers <= 1) or (len(paths) <= 1):
+            return [self.read_duration(path) for path in paths]
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            return list(executor.map(self.read_duration, paths))
+
+    def _assign(self, durations: list[float], lengths: list[float]) -> tuple[np.ndarray, np.ndarray]:
+        """Returning the index of the track assigned to every file, along with the differences of the pairs."""
+        import numpy as np
+
+        n = len(durations)
+        positions = np.arange(n)
+        costs = np.abs(np.asarray(durations)[:, np.newaxis] - np.asarray(lengths)[np.newaxis, :])
+        if np.all(costs[positions, positions] <= self.tolerance):
+            # The files are in track order already.
+            return positions, costs[positions, positions]
+
+        costs += ORDER_PENALTY * np.abs(positions[:, np.newaxis] - positions[np.newaxis, :])
+        closest = np.argmin(costs, axis=1)
+        # Every file being closest to a distinct track is the optimal assignment as well.
+        tracks = closest if (len(np.unique(closest)) == n) else _solve_assignment(costs=costs)
+
+        return tracks, np.abs(np.asarray(durations) - np.asarray(lengths)[tracks])
+
+    def match(self, album: Album) -> Album:
+        matched, total = 0, 0
+        media_tracks: tuple[tuple[AudioTrackInfo]] = IAudioFileRepository._sort_track_info(album_info=album.info)
+        for medium, tracks in zip(album.media, media_tracks):
+            lengths = [track.length for track in tracks]
+            if (len(medium.paths) != len(tracks)) or (len(tracks) == 0) or (None in lengths):
+                continue
+            durations = self.get_durations(paths=medium.paths)
+            if None in durations:
+                continue
+
+            assigned, differences = self._assign(durations=durations, lengths=lengths)
+            paths = [None] * len(medium.paths)
+            for path, track_index in zip(medium.paths, assigned):
+                paths[track_index] = path
+            medium.paths = paths
+
+            matched += int((differences <= self.tolerance).sum())
+            total += len(tracks)
+
+        album.match_confidence = (matched / total) if (total > 0) else None
+
+        return album
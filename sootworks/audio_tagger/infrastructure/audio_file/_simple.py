@@ -1,40 +1,212 @@
 # -*- coding: utf-8 -*-
 
+import errno
+import hashlib
+import io
+import os
 import re
 import shutil
 
-from collections import deque
-from functools import reduce
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial, reduce
 from pathlib import Path
+from typing import Iterator, Type
+
+try:
+    import fcntl
+except ImportError:  # e.g. on Windows
+    fcntl = None
 
 from sootworks.audio_tagger.infrastructure.tagging_lib import get_supported_audio_file_extensions
-from sootworks.audio_tagger.domain.const import MediumType
-from sootworks.audio_tagger.domain.exceptions import AlbumInfoValidationError
-from sootworks.audio_tagger.domain.model import Album, AlbumInfo, AudioMedium, AudioTrackInfo
-from sootworks.audio_tagger.domain.repository import IAudioFileRepository
+from sootworks.audio_tagger.domain.const import ArtworkPlacement, CopyStrategy, MediumType
+from sootworks.audio_tagger.domain.exceptions import AlbumDirLockedError, AlbumInfoValidationError
+from sootworks.audio_tagger.domain.model import Album, AlbumInfo, AudioMedium, AudioTrackInfo, SourceFileSnapshot
+from sootworks.audio_tagger.domain.repository import (
+    AlbumDirFormatter,
+    AudioFileRewrite,
+    AudioFileTransferCallback,
+    IAudioFileRepository,
+    Tracer,
+)
+
 
+# Computed once rather than for every scanned file, suffixes are matched case-insensitively.
+AUDIO_FILE_EXTENSIONS = frozenset(suffix.lower() for suffix in get_supported_audio_file_extensions())
 
 MEDIUM_NUMBER_PATTERN = re.compile(".*((disc|cd|vinyl)[ _-]*)([0-9]{1,2}).*", re.IGNORECASE)
 
+FAST_HASH_CHUNK_SIZE = 64 * 1024  # bytes
+
+# Larger files are rewritten in place once transferred, rather than being read into memory.
+MAX_IN_MEMORY_REWRITE_SIZE = 64 * 1024 * 1024  # bytes
+
+DEFAULT_SIDECAR_NAME = "folder.jpg"
+
+FICLONE = 0x40049409  # _IOW(0x94, 9, int) from linux/fs.h
+
+# Strategies to try in order, falling back to the next one if the previous isn't supported.
+COPY_STRATEGY_FALLBACKS = {
+    CopyStrategy.AUTO: (CopyStrategy.REFLINK, CopyStrategy.COPY_FILE_RANGE, CopyStrategy.COPY),
+    CopyStrategy.REFLINK: (CopyStrategy.REFLINK, CopyStrategy.COPY_FILE_RANGE, CopyStrategy.COPY),
+    CopyStrategy.COPY_FILE_RANGE: (CopyStrategy.COPY_FILE_RANGE, CopyStrategy.COPY),
+    CopyStrategy.HARDLINK: (CopyStrategy.HARDLINK, CopyStrategy.COPY),
+    CopyStrategy.COPY: (CopyStrategy.COPY,),
+}
+
+# Errors signaling that a strategy isn't supported between the given source and target (e.g. they
+# reside on different devices, or the file system can't share extents).
+UNSUPPORTED_COPY_ERRNOS = {errno.EXDEV, errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL, errno.ENOSYS, errno.EPERM}
+
+
+class UnsupportedCopyStrategy(Exception):
+    pass
+
+
+def _reflink(src: Path, tgt: Path) -> None:
+    if fcntl is None:
+        raise UnsupportedCopyStrategy()
+
+    with src.open("rb") as src_file, tgt.open("wb") as tgt_file:
+        fcntl.ioctl(tgt_file.fileno(), FICLONE, src_file.fileno())
+    shutil.copystat(src, tgt)
+
+
+def _copy_file_range(src: Path, tgt: Path) -> None:
+    if not hasattr(os, "copy_file_range"):
+        raise UnsupportedCopyStrategy()
+
+    with src.open("rb") as src_file, tgt.open("wb") as tgt_file:
+        remaining = os.fstat(src_file.fileno()).st_size
+        while remaining > 0:
+            copied = os.copy_file_range(src_file.fileno(), tgt_file.fileno(), remaining)
+            if copied == 0:
+                break
+            remaining -= copied
+    shutil.copystat(src, tgt)
+
+
+def _hardlink(src: Path, tgt: Path) -> None:
+    os.link(src, tgt)
+
+
+COPY_FUNCTIONS = {
+    CopyStrategy.REFLINK: _reflink,
+    CopyStrategy.COPY_FILE_RANGE: _copy_file_range,
+    CopyStrategy.HARDLINK: _hardlink,
+    CopyStrategy.COPY: shutil.copy2,
+}
+
+
+def _scan_dir(path: str, suffixes: frozenset[str]) -> tuple[list[str], list[os.DirEntry]]:
+    """Listing the audio files and the subdirs of a dir.
+
+    The file types reported by scandir are relied on where available, so that only symlinks (and entries of file
+    systems not reporting types) need to be stat'ed.
+    """
+    audio_paths, dir_entries = [], []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                dir_entries.append(entry)
+            elif (os.path.splitext(entry.name)[1][1:].lower() in suffixes) and entry.is_file():
+                audio_paths.append(entry.path)
+
+    return audio_paths, dir_entries
+
 
 class SimpleAudioFileRepository(IAudioFileRepository):
-    def get_audio_paths(self, path: Path, suffix_filter: str | None = None) -> list[Path]:
-        audio_paths = []
-        stack = deque([path])
+    def __init__(
+        self,
+        formatter: Type[AlbumDirFormatter],
+        copy_strategy: CopyStrategy = CopyStrategy.AUTO,
+        move: bool = False,
+        scan_workers: int = 1,
+        artwork_placement: ArtworkPlacement = ArtworkPlacement.EMBED,
+        sidecar_name: str = DEFAULT_SIDECAR_NAME,
+        tracer: Tracer | None = None,
+    ) -> None:
+        super().__init__(formatter=formatter, tracer=tracer)
+        self.copy_strategy = copy_strategy
+        self.move = move
+        self.scan_workers = scan_workers
+        self.artwork_placement = artwork_placement
+        self.sidecar_name = sidecar_name
+
+        # Strategies found to be unsupported between pairs of devices, so that they aren't attempted for every file.
+        self._unsupported_strategies: set[tuple[CopyStrategy, int, int]] = set()
+
+    def iter_audio_paths(self, path: Path, suffix_filter: str | None = None) -> Iterator[Path]:
+        """Yielding the audio files found under the given dir as the dirs are scanned.
+
+        Dirs are only visited once, even if linked to more than once (e.g. symlink loops). With more than one scan
+        worker, the subdirs found on a level are scanned concurrently (useful for network storage).
+        """
+        suffixes = AUDIO_FILE_EXTENSIONS
+        if suffix_filter is not None:
+            suffixes = suffixes & {suffix_filter.lower().lstrip(".")}
+
+        scan = partial(_scan_dir, suffixes=suffixes)
+        stat = os.stat(path)
+        visited, level = {(stat.st_dev, stat.st_ino)}, [str(path)]
+        executor = ThreadPoolExecutor(max_workers=self.scan_workers) if (self.scan_workers > 1) else None
         try:
-            while parent := stack.pop():
-                for candidate in parent.iterdir():
-                    suffix = candidate.suffix[1:]  # excluding leading period
-                    if candidate.is_dir():
-                        stack.append(candidate)
-                    elif suffix in get_supported_audio_file_extensions():
-                        if isinstance(suffix_filter, str) and (suffix != suffix_filter):
-                            continue
-                        audio_paths.append(candidate)
-        except IndexError:
-            pass
-
-        return audio_paths
+            while len(level) > 0:
+                next_level = []
+                for audio_paths, dir_entries in map(scan, level) if (executor is None) else executor.map(scan, level):
+                    yield from map(Path, audio_paths)
+
+                    for dir_entry in dir_entries:
+                        stat = dir_entry.stat()
+                        if (stat.st_dev, stat.st_ino) not in visited:
+                            visited.add((stat.st_dev, stat.st_ino))
+                            next_level.append(dir_entry.path)
+                level = next_level
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+    def get_audio_paths(self, path: Path, suffix_filter: str | None = None) -> list[Path]:
+        return list(self.iter_audio_paths(path=path, suffix_filter=suffix_filter))
+
+    def get_output_settings(self) -> dict[str, str]:
+        return {"artwork_placement": self.artwork_placement.value, "sidecar_name": self.sidecar_name}
+
+    @staticmethod
+    def _get_fast_hash(path: Path, size: int) -> str:
+        """Hashing the size, the head and the tail of the file (i.e. where tags are usually stored)."""
+        digest = hashlib.blake2b(str(size).encode(), digest_size=16)
+        with path.open("rb") as f:
+            digest.update(f.read(FAST_HASH_CHUNK_SIZE))
+            if size > FAST_HASH_CHUNK_SIZE:
+                f.seek(max(FAST_HASH_CHUNK_SIZE, size - FAST_HASH_CHUNK_SIZE))
+                digest.update(f.read(FAST_HASH_CHUNK_SIZE))
+
+        return digest.hexdigest()
+
+    def get_snapshots(self, paths: list[Path], fast_hash: bool = False) -> list[SourceFileSnapshot]:
+        snapshots = []
+        for path in paths:
+            stat = path.stat()
+            snapshots.append(
+                SourceFileSnapshot(
+                    path=path.absolute(),
+                    size=stat.st_size,
+                    mtime_ns=stat.st_mtime_ns,
+                    digest=self._get_fast_hash(path=path, size=stat.st_size) if fast_hash else None,
+                )
+            )
+
+        return snapshots
+
+    def get_album_dirs(self, path: Path) -> list[Path]:
+        album_dirs = set()
+        for parent in {audio_path.parent for audio_path in self.get_audio_paths(path=path)}:
+            # Disc dirs (e.g. 'CD 1') are grouped under the album dir they belong to.
+            is_medium_dir = (parent != path) and MEDIUM_NUMBER_PATTERN.match(parent.name)
+            album_dirs.add(parent.parent if is_medium_dir else parent)
+
+        return sorted(album_dirs, key=lambda album_dir: str(album_dir))
 
     def _get_medium_type(self, album_info: AlbumInfo) -> MediumType:
         return MediumType.CD  # FIXME Derive media type from album info
@@ -106,11 +278,16 @@ class SimpleAudioFileRepository(IAudioFileRepository):
         )
 
     def plan_restructuring(self, album: Album, out_path: Path) -> Album:
-        target_structure = Album(info=album.info)
+        target_structure = Album(info=album.info, artwork_placement=self.artwork_placement)
 
         single_medium_album = album.info.total_discs == 1
         track_info = self._sort_track_info(album_info=album.info)
         base_path = self._get_out_base_path(album=album, out_path=out_path)
+        if (self.artwork_placement in (ArtworkPlacement.SIDECAR, ArtworkPlacement.BOTH)) and (
+            album.info.cover_art_data is not None
+        ):
+            # A single image in the album dir, even for albums of several media.
+            target_structure.cover_art_path = base_path / self.sidecar_name
         for medium_number, tracks in enumerate(track_info, start=1):
             # By this point both track info and media must have been sorted.
 
@@ -133,16 +310,256 @@ class SimpleAudioFileRepository(IAudioFileRepository):
 
         return target_structure
 
-    def restructure_album(self, source_structure: Album, target_structure: Album) -> None:
-        for medium_index in range(len(source_structure.media)):
-            src_paths, tgt_paths = (
-                source_structure.media[medium_index].paths,
-                target_structure.media[medium_index].paths,
-            )
+    @staticmethod
+    def _get_album_path(album: Album) -> Path:
+        return Path(os.path.commonpath([path.parent.resolve() for medium in album.media for path in medium.paths]))
+
+    @staticmethod
+    def _open_lock_file(lock_path: Path, album_path: Path) -> int:
+        """Opening the lock file and locking it, raising AlbumDirLockedError if it's locked by another process.
 
-            # Create target dir
-            tgt_paths[0].parent.resolve().mkdir(parents=True, exist_ok=True)
+        With flock, the lock is held on the open file, hence it's released by the OS if the process dies, and lock
+        files left behind by crashed runs don't lock the album out. Without it (e.g. on Windows), the file is the lock.
+        """
+        if fcntl is None:
+            try:
+                return os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                raise AlbumDirLockedError(f"Album dir '{album_path}' is being written by another process.")
 
-            # Copy files
-            for path_index in range(len(src_paths)):
-                shutil.copy2(src_paths[path_index], tgt_paths[path_index])
+        while True:
+            fd = os.open(lock_path, os.O_CREAT | os.O_WRONLY)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                raise AlbumDirLockedError(f"Album dir '{album_path}' is being written by another process.")
+
+            # The previous holder may have removed the file in the meantime, leaving the lock on a file no one sees.
+            try:
+                if os.stat(lock_path).st_ino == os.fstat(fd).st_ino:
+                    return fd
+            except FileNotFoundError:
+                pass
+            os.close(fd)
+
+    @staticmethod
+    @contextmanager
+    def _lock_album_dir(album_path: Path) -> Iterator[None]:
+        """Preventing concurrent workers from writing the same album dir.
+
+        The lock file is placed next to the album dir (i.e. in the shared artist dir), so that it
+        can be acquired before the album dir itself is created.
+        """
+        album_path.parent.mkdir(parents=True, exist_ok=True)
+        lock_path = album_path.parent / f".{album_path.name}.lock"
+        fd = SimpleAudioFileRepository._open_lock_file(lock_path=lock_path, album_path=album_path)
+        try:
+            os.ftruncate(fd, 0)
+            os.write(fd, str(os.getpid()).encode())
+            yield
+        finally:
+            # NOTE removed while still locked, so that no other process locks the file being removed
+            lock_path.unlink(missing_ok=True)
+            os.close(fd)
+
+    def _copy_with_fallbacks(self, src: Path, tmp: Path) -> CopyStrategy:
+        """Returning the strategy the file has been copied with."""
+        devices = (src.stat().st_dev, tmp.parent.stat().st_dev)
+        for strategy in COPY_STRATEGY_FALLBACKS[self.copy_strategy]:
+            if (strategy, *devices) in self._unsupported_strategies:
+                continue
+
+            try:
+                COPY_FUNCTIONS[strategy](src, tmp)
+            except UnsupportedCopyStrategy:
+                pass
+            except OSError as e:
+                if (strategy == CopyStrategy.COPY) or (e.errno not in UNSUPPORTED_COPY_ERRNOS):
+                    raise
+            else:
+                return strategy
+
+            tmp.unlink(missing_ok=True)
+            self._unsupported_strategies.add((strategy, *devices))
+
+    def _move_file(self, src: Path, tgt: Path) -> str:
+        """Renaming the file if the target is on the same device, copying it otherwise.
+
+        Copied sources are only removed when the restructuring is finalized. Returning how the file has been moved.
+        Existing targets aren't replaced, as reverting the move couldn't restore them (the album dir being locked,
+        the target can't be created in between checking and renaming).
+        """
+        if tgt.exists() and (not tgt.samefile(src)):
+            raise FileExistsError(errno.EEXIST, "Refusing to move a file over an existing one", str(tgt))
+
+        try:
+            os.rename(src, tgt)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            return self._copy_file(src=src, tgt=tgt)
+
+        return "rename"
+
+    def _copy_file(self, src: Path, tgt: Path) -> str:
+        """Copying through a temp file in the target dir, so readers never see a partially written file.
+
+        Returning the copy strategy the file has been copied with.
+        """
+        tmp = tgt.with_name(f".{tgt.name}.{os.getpid()}.tmp")
+        try:
+            strategy = self._copy_with_fallbacks(src=src, tmp=tmp)
+            os.replace(tmp, tgt)
+        finally:
+            tmp.unlink(missing_ok=True)
+
+        return strategy.value
+
+    def _rewrites_in_memory(self, src: Path, tgt: Path) -> bool:
+        """Telling whether the file is to be rewritten in memory while being copied, rather than in place.
+
+        Only files small enough, and that would be copied byte by byte anyway (i.e. neither renamed, nor linked or
+        sharing extents with their source), are worth reading into memory.
+        """
+        stat = src.stat()
+        if self.move or (stat.st_size > MAX_IN_MEMORY_REWRITE_SIZE):
+            return False
+
+        devices = (stat.st_dev, tgt.parent.stat().st_dev)
+        return all(
+            (strategy, *devices) in self._unsupported_strategies
+            for strategy in COPY_STRATEGY_FALLBACKS[self.copy_strategy]
+            if strategy in (CopyStrategy.REFLINK, CopyStrategy.HARDLINK)
+        )
+
+    @staticmethod
+    def _rewrite_file(src: Path, tgt: Path, rewrite: AudioFileRewrite) -> str:
+        """Writing the rewritten content with a single sequential write, through a temp file in the target dir."""
+        buffer = io.BytesIO(src.read_bytes())
+        rewrite(buffer)
+
+        tmp = tgt.with_name(f".{tgt.name}.{os.getpid()}.tmp")
+        try:
+            with tmp.open("wb") as f:
+                f.write(buffer.getbuffer())
+            shutil.copymode(src, tmp)
+            os.replace(tmp, tgt)
+        finally:
+            tmp.unlink(missing_ok=True)
+
+        return "rewrite"
+
+    def restructure_album(
+        self,
+        source_structure: Album,
+        target_structure: Album,
+        rewrites: dict[Path, AudioFileRewrite] | None = None,
+        on_transferred: AudioFileTransferCallback | None = None,
+    ) -> None:
+        rewrites = {} if (rewrites is None) else rewrites
+        with self._lock_album_dir(album_path=self._get_album_path(album=target_structure)):
+            for medium_index in range(len(source_structure.media)):
+                # Create target dir (concurrent workers may be creating the same artist dir)
+                target_structure.media[medium_index].paths[0].parent.resolve().mkdir(parents=True, exist_ok=True)
+
+            # Copy (or move) files
+            transferred = []
+            try:
+                for src, tgt in self._get_path_pairs(
+                    source_structure=source_structure, target_structure=target_structure
+                ):
+                    with self.tracer.span("file.transfer", path=str(tgt)) as span:
+                        rewrite = rewrites.get(tgt)
+                        in_memory = (rewrite is not None) and self._rewrites_in_memory(src=src, tgt=tgt)
+                        if in_memory:
+                            span.attributes["method"] = self._rewrite_file(src=src, tgt=tgt, rewrite=rewrite)
+                        elif self.move:
+                            span.attributes["method"] = self._move_file(src=src, tgt=tgt)
+                        else:
+                            span.attributes["method"] = self._copy_file(src=src, tgt=tgt)
+                        # Recorded before rewriting in place, so that the file is restored should the rewrite fail.
+                        transferred.append((src, tgt))
+
+                        if (rewrite is not None) and (not in_memory):
+                            with tgt.open("r+b") as f:
+                                rewrite(f)
+                            span.attributes["method"] += "+rewrite"
+                        span.byte_count = tgt.stat().st_size if self.tracer.enabled else 0
+
+                    if on_transferred is not None:
+                        on_transferred(src, tgt)
+            except BaseException:
+                # Only the files transferred so far are restored, others may be pre-existing targets.
+                if self.move:
+                    self._revert_moves(path_pairs=transferred)
+                raise
+
+    @staticmethod
+    def _get_path_pairs(source_structure: Album, target_structure: Album) -> Iterator[tuple[Path, Path]]:
+        for source_medium, target_medium in zip(source_structure.media, target_structure.media):
+            yield from zip(source_medium.paths, target_medium.paths)
+
+    @staticmethod
+    def _remove_empty_dirs(paths: list[Path]) -> None:
+        """Removing the emptied dirs of the given files, up to (and including) the dir they have in common."""
+        if len(paths) == 0:
+            return
+
+        root = Path(os.path.commonpath([path.parent for path in paths]))
+        for parent in sorted({path.parent for path in paths}, key=lambda parent: len(parent.parts), reverse=True):
+            while parent.is_relative_to(root):
+                try:
+                    parent.rmdir()
+                except OSError:  # not empty (e.g. other files were left behind), or already removed
+                    break
+                parent = parent.parent
+
+    @staticmethod
+    def _write_sidecar(target_structure: Album) -> None:
+        """Writing the image to embed next to the tracks, unless it's there already (sparing media servers a rescan)."""
+        path, image = target_structure.cover_art_path, target_structure.info.cover_art_jpeg
+        if (path is None) or (image is None) or (path.is_file() and (path.read_bytes() == image)):
+            return
+
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            tmp.write_bytes(image)
+            os.replace(tmp, path)
+        finally:
+            tmp.unlink(missing_ok=True)
+
+    def finalize_restructuring(self, source_structure: Album, target_structure: Album) -> None:
+        self._write_sidecar(target_structure=target_structure)
+        if not self.move:
+            return
+
+        # Sources still in place were copied (e.g. across devices), they're only removed once the targets are final.
+        moved_paths = []
+        for src, tgt in self._get_path_pairs(source_structure=source_structure, target_structure=target_structure):
+            if src.resolve() == tgt.resolve():
+                continue
+            src.unlink(missing_ok=True)
+            moved_paths.append(src)
+
+        self._remove_empty_dirs(paths=moved_paths)
+
+    @staticmethod
+    def _revert_moves(path_pairs: list[tuple[Path, Path]]) -> None:
+        for src, tgt in path_pairs:
+            if (src.resolve() == tgt.resolve()) or (not tgt.exists()):
+                continue
+
+            if src.exists():
+                tgt.unlink()  # a copy, the source is intact
+            else:
+                src.parent.mkdir(parents=True, exist_ok=True)
+                os.rename(tgt, src)
+
+    def revert_restructuring(self, source_structure: Album, target_structure: Album) -> None:
+        if self.move:
+            self._revert_moves(
+                path_pairs=list(
+                    self._get_path_pairs(source_structure=source_structure, target_structure=target_structure)
+                )
+            )
@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+
+from sootworks.audio_tagger.infrastructure.manifest._json import JsonAlbumManifestRepository
+
+
+__all__ = ["JsonAlbumManifestRepository"]
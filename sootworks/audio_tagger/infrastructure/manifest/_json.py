@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+
+from pydantic import ValidationError
+
+from sootworks.audio_tagger.domain.model import AlbumManifest
+from sootworks.audio_tagger.domain.repository import IAlbumManifestRepository
+
+
+class JsonAlbumManifestRepository(IAlbumManifestRepository):
+    """Keeping a JSON manifest per album in a state dir, named after the hash of the album's source dir."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def _get_manifest_path(self, in_path: Path) -> Path:
+        return self.path / f"{hashlib.sha1(str(in_path.absolute()).encode()).hexdigest()}.json"
+
+    def get_manifest(self, in_path: Path) -> AlbumManifest | None:
+        try:
+            return AlbumManifest.parse_file(self._get_manifest_path(in_path=in_path))
+        except FileNotFoundError:
+            return None
+        except (ValidationError, ValueError) as e:
+            print(f"Ignoring the malformed manifest of album '{in_path}': {e}")
+            return None
+
+    def save_manifest(self, manifest: AlbumManifest) -> None:
+        manifest_path = self._get_manifest_path(in_path=manifest.in_path)
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp = manifest_path.with_name(f".{manifest_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            tmp.write_text(manifest.json(indent=2), encoding="utf-8")
+            os.replace(tmp, manifest_path)
+        finally:
+            tmp.unlink(missing_ok=True)
@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+
+from sootworks.audio_tagger.infrastructure.review._json import JsonReviewQueueRepository
+
+
+__all__ = ["JsonReviewQueueRepository"]
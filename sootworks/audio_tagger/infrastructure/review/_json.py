@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import threading
+from pathlib import Path
+
+from pydantic import BaseModel, ValidationError
+from pydantic.json import pydantic_encoder
+
+from sootworks.audio_tagger.domain.const import ArtworkPlacement, MediumType
+from sootworks.audio_tagger.domain.model import (
+    Album,
+    AlbumInfo,
+    AlbumQueryParams,
+    AudioMedium,
+    AudioTrackInfo,
+    DefaultTags,
+    ReviewItem,
+)
+from sootworks.audio_tagger.domain.repository import IReviewQueueRepository
+
+
+# The stored records, validated on load as they may have been edited (or written by another version).
+
+
+class _TrackRecord(BaseModel):
+    title: str
+    total_tracks: int
+    track_number: int
+    genre: str | None = None
+    disc_number: int | None = None
+    comment: str | None = None
+    length: float | None = None
+
+
+class _AlbumInfoRecord(BaseModel):
+    album_id: str | None = None
+    title: str
+    artist: str
+    date: int
+    tracks: list[_TrackRecord]
+    total_discs: int = 1
+
+    @classmethod
+    def from_album_info(cls, info: AlbumInfo) -> "_AlbumInfoRecord":
+        return cls(
+            album_id=info.album_id,
+            title=info.title,
+            artist=info.artist,
+            date=info.date,
+            tracks=[
+                _TrackRecord(
+                    title=track.title,
+                    total_tracks=track.total_tracks,
+                    track_number=track.track_number,
+                    genre=track.genre,
+                    disc_number=track.disc_number,
+                    comment=track.comment,
+                    length=track.length,
+                )
+                for track in info.tracks
+            ],
+            total_discs=info.total_discs,
+        )
+
+    def to_album_info(self, cover_art_data: bytes | None = None) -> AlbumInfo:
+        info = AlbumInfo(**self.dict(exclude={"tracks"}), cover_art_data=cover_art_data)
+        info.tracks = [AudioTrackInfo(album_info=info, **track.dict()) for track in self.tracks]
+
+        return info
+
+
+class _MediumRecord(BaseModel):
+    type: MediumType
+    paths: list[Path]
+
+
+class _AlbumRecord(BaseModel):
+    media: list[_MediumRecord]
+    match_confidence: float | None = None
+    artwork_placement: ArtworkPlacement = ArtworkPlacement.EMBED
+    cover_art_path: Path | None = None
+
+    @classmethod
+    def from_album(cls, album: Album) -> "_AlbumRecord":
+        return cls(
+            media=[_MediumRecord(type=medium.type, paths=medium.paths) for medium in album.media],
+            match_confidence=album.match_confidence,
+            artwork_placement=album.artwork_placement,
+            cover_art_path=album.cover_art_path,
+        )
+
+    def to_album(self, info: AlbumInfo) -> Album:
+        return Album(
+            info=info,
+            media=[AudioMedium(type=medium.type, paths=medium.paths) for medium in self.media],
+            match_confidence=self.match_confidence,
+            artwork_placement=self.artwork_placement,
+            cover_art_path=self.cover_art_path,
+        )
+
+
+class _ReviewItemRecord(BaseModel):
+    id: str
+    in_path: Path
+    out_path: Path | None = None
+    album_query_params: AlbumQueryParams
+    default_tags: DefaultTags
+    reasons: list[str]
+    source_structure: _AlbumRecord
+    target_structure: _AlbumRecord
+    cover_art_thumbnail: str | None = None
+    approved: bool = False
+    created_at: float
+
+
+class JsonReviewQueueRepository(IReviewQueueRepository):
+    """Keeping a JSON file per queued album in a dir, along with its full cover art as a sidecar file.
+
+    The album info shared by the planned structures is stored once, without the back-references of its tracks.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def _get_item_path(self, item_id: str) -> Path:
+        return self.path / f"{item_id}.json"
+
+    def _get_cover_art_path(self, item_id: str) -> Path:
+        return self.path / f"{item_id}.cover"
+
+    @staticmethod
+    def _write_atomically(path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        finally:
+            tmp.unlink(missing_ok=True)
+
+    def _load_item(self, item_path: Path) -> ReviewItem | None:
+        try:
+            data = json.loads(item_path.read_text(encoding="utf-8"))
+            record = _ReviewItemRecord.parse_obj(data["item"])
+            info_record = _AlbumInfoRecord.parse_obj(data["album_info"])
+        except FileNotFoundError:
+            return None
+        except (KeyError, ValidationError, ValueError) as e:
+            print(f"Ignoring the malformed review item '{item_path}': {e}")
+            return None
+
+        cover_art_path = self._get_cover_art_path(item_id=record.id)
+        info = info_record.to_album_info(
+            cover_art_data=(cover_art_path.read_bytes() if cover_art_path.exists() else None)
+        )
+
+        return ReviewItem(
+            **record.dict(
+                include={"id", "in_path", "out_path", "reasons", "cover_art_thumbnail", "approved", "created_at"}
+            ),
+            album_query_params=record.album_query_params,
+            default_tags=record.default_tags,
+            source_structure=record.source_structure.to_album(info=info),
+            target_structure=record.target_structure.to_album(info=info),
+        )
+
+    def get_items(self) -> list[ReviewItem]:
+        items = [self._load_item(item_path=item_path) for item_path in sorted(self.path.glob("*.json"))]
+        return sorted((item for item in items if item is not None), key=lambda item: item.created_at)
+
+    def get_item(self, item_id: str) -> ReviewItem | None:
+        return self._load_item(item_path=self._get_item_path(item_id=item_id))
+
+    def save_item(self, item: ReviewItem, cover_art: bytes | None = None) -> None:
+        record = _ReviewItemRecord(
+            id=item.id,
+            in_path=item.in_path,
+            out_path=item.out_path,
+            album_query_params=item.album_query_params,
+            default_tags=item.default_tags,
+            reasons=item.reasons,
+            source_structure=_AlbumRecord.from_album(album=item.source_structure),
+            target_structure=_AlbumRecord.from_album(album=item.target_structure),
+            cover_art_thumbnail=item.cover_art_thumbnail,
+            approved=item.approved,
+            created_at=item.created_at,
+        )
+        info_record = _AlbumInfoRecord.from_album_info(info=item.source_structure.info)
+        if cover_art is not None:
+            self._write_atomically(path=self._get_cover_art_path(item_id=item.id), data=cover_art)
+        self._write_atomically(
+            path=self._get_item_path(item_id=item.id),
+            data=json.dumps({"item": record, "album_info": info_record}, indent=2, default=pydantic_encoder).encode(
+                "utf-8"
+            ),
+        )
+
+    def remove_item(self, item_id: str) -> None:
+        self._get_item_path(item_id=item_id).unlink(missing_ok=True)
+        self._get_cover_art_path(item_id=item_id).unlink(missing_ok=True)
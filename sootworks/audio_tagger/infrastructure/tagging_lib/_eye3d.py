@@ -2,6 +2,7 @@
 
 """eze3D only supports mp3 files with ID3 tags."""
 
+import hashlib
 from pathlib import Path
 
 import eyed3
@@ -24,6 +25,9 @@ class _Eye3DArtistAudioTagMapper(IAudioTagMapper):
     def __call__(self, song: LIB_SPECIFIC_SONG_OBJECT, track_info: AudioTrackInfo) -> None:
         song.tag.artist = track_info.artist
 
+    def is_up_to_date(self, song: LIB_SPECIFIC_SONG_OBJECT, track_info: AudioTrackInfo) -> bool:
+        return song.tag.artist == track_info.artist
+
 
 class _Eye3DAlbumAudioTagMapper(IAudioTagMapper):
     tag_type = TagType.ALBUM
@@ -32,6 +36,9 @@ class _Eye3DAlbumAudioTagMapper(IAudioTagMapper):
     def __call__(self, song: LIB_SPECIFIC_SONG_OBJECT, track_info: AudioTrackInfo) -> None:
         song.tag.album = track_info.album
 
+    def is_up_to_date(self, song: LIB_SPECIFIC_SONG_OBJECT, track_info: AudioTrackInfo) -> bool:
+        return song.tag.album == track_info.album
+
 
 class _Eye3DTitleAudioTagMapper(IAudioTagMapper):
     tag_type = TagType.TITLE
@@ -40,6 +47,9 @@ class _Eye3DTitleAudioTagMapper(IAudioTagMapper):
     def __call__(self, song: LIB_SPECIFIC_SONG_OBJECT, track_info: AudioTrackInfo) -> None:
         song.tag.title = track_info.title
 
+    def is_up_to_date(self, song: LIB_SPECIFIC_SONG_OBJECT, track_info: AudioTrackInfo) -> bool:
+        return song.tag.title == track_info.title
+
 
 class _Eye3DDateAudioTagMapper(IAudioTagMapper):
     tag_type = TagType.DATE
@@ -48,6 +58,9 @@ class _Eye3DDateAudioTagMapper(IAudioTagMapper):
     def __call__(self, song: LIB_SPECIFIC_SONG_OBJECT, track_info: AudioTrackInfo) -> None:
         song.tag.release_date = track_info.date
 
+    def is_up_to_date(self, song: LIB_SPECIFIC_SONG_OBJECT, track_info: AudioTrackInfo) -> bool:
+        return str(song.tag.release_date) == str(track_info.date)
+
 
 class _Eye3DTrackNumbersAudioTagMapper(IAudioTagMapper):
     tag_type = TagType.TRACK_NUM
@@ -56,6 +69,9 @@ class _Eye3DTrackNumbersAudioTagMapper(IAudioTagMapper):
     def __call__(self, song: LIB_SPECIFIC_SONG_OBJECT, track_info: AudioTrackInfo) -> None:
         song.tag.track_num = (track_info.track_number, track_info.total_tracks)
 
+    def is_up_to_date(self, song: LIB_SPECIFIC_SONG_OBJECT, track_info: AudioTrackInfo) -> bool:
+        return tuple(n or None for n in song.tag.track_num) == (track_info.track_number, track_info.total_tracks)
+
 
 class _Eye3DGenreAudioTagMapper(IAudioTagMapper):
     tag_type = TagType.GENRE
@@ -64,6 +80,9 @@ class _Eye3DGenreAudioTagMapper(IAudioTagMapper):
     def __call__(self, song: LIB_SPECIFIC_SONG_OBJECT, track_info: AudioTrackInfo) -> None:
         song.tag.genre = track_info.genre
 
+    def is_up_to_date(self, song: LIB_SPECIFIC_SONG_OBJECT, track_info: AudioTrackInfo) -> bool:
+        return (None if (song.tag.genre is None) else song.tag.genre.name) == track_info.genre
+
 
 class _Eye3DDiscsAudioTagMapper(IAudioTagMapper):
     tag_type = TagType.DISC_NUM
@@ -72,6 +91,10 @@ class _Eye3DDiscsAudioTagMapper(IAudioTagMapper):
     def __call__(self, song: LIB_SPECIFIC_SONG_OBJECT, track_info: AudioTrackInfo) -> None:
         song.tag.disc_num = (track_info.disc_number, track_info.total_discs)
 
+    def is_up_to_date(self, song: LIB_SPECIFIC_SONG_OBJECT, track_info: AudioTrackInfo) -> bool:
+        # Unset numbers are read back as 0.
+        return tuple(n or None for n in song.tag.disc_num) == (track_info.disc_number, track_info.total_discs)
+
 
 class _Eye3DCoverAudioTagMapper(IAudioTagMapper):
     tag_type = TagType.COVER
@@ -80,6 +103,10 @@ class _Eye3DCoverAudioTagMapper(IAudioTagMapper):
     def __call__(self, song: LIB_SPECIFIC_SONG_OBJECT, track_info: AudioTrackInfo) -> None:
         song.tag.images.set(3, track_info.cover_art_jpeg, "image/jpeg")
 
+    def is_up_to_date(self, song: LIB_SPECIFIC_SONG_OBJECT, track_info: AudioTrackInfo) -> bool:
+        digests = {hashlib.sha256(image.image_data).hexdigest() for image in song.tag.images if image.picture_type == 3}
+        return digests == ({track_info.cover_art_jpeg_digest} - {None})
+
 
 class Eye3DAudioFileTagger(IAudioFileTagger):
     compatible_tagging_lib = TAGGING_LIB
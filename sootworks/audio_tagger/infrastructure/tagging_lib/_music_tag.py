@@ -1,8 +1,13 @@
 # -*- coding: utf-8 -*-
 
+import functools
+import hashlib
+import io
 from pathlib import Path
+from typing import Any, BinaryIO
 
 import music_tag
+import mutagen
 
 from sootworks.audio_tagger.domain.const import TagType
 from sootworks.audio_tagger.domain.model import AudioTrackInfo
@@ -12,6 +17,40 @@ from sootworks.audio_tagger.domain.repository import LIB_SPECIFIC_SONG_OBJECT, I
 TAGGING_LIB = "music_tag"
 SUPPORTED_AUDIO_FILE_EXTENTIONS = {"aac", "aiff", "dsf", "flac", "m4a", "mp3", "ogg", "opus", "wav", "wv"}
 
+# The covers of the albums being tagged concurrently (by tagging threads) are kept decoded.
+ARTWORK_CACHE_SIZE = 8
+
+
+def _normalize_value(value: Any) -> str | int | None:
+    # Numbers may be zero-padded (e.g. "04/12" as written by eyeD3), and unset numbers may be stored as 0.
+    text = str(value).strip()
+    if text.isdigit():
+        return int(text) or None
+
+    return text or None
+
+
+def _has_values(song: LIB_SPECIFIC_SONG_OBJECT, **tags: Any) -> bool:
+    """Comparing tags as text, since typed lookups fail on some values written by music_tag itself (e.g. an unset
+    disc number next to the total number of discs)."""
+    for key, value in tags.items():
+        item = song.get(key, typeless=True)
+        current = [] if (item is None) else [_normalize_value(v) for v in item.values]
+        target = _normalize_value(value) if (value is not None) else None
+        if [v for v in current if v is not None] != ([] if (target is None) else [target]):
+            return False
+
+    return True
+
+
+@functools.lru_cache(maxsize=ARTWORK_CACHE_SIZE)
+def _get_artwork(digest: str, data: bytes) -> music_tag.file.Artwork:
+    """Decoding the image (by music_tag, for its dimensions) once per cover rather than once per track.
+
+    Keyed by the digest too, so that hits are told apart by comparing it rather than the image.
+    """
+    return music_tag.file.Artwork(data)
+
 
 class _MusicTagArtistAudioTagMapper(IAudioTagMapper):
     tag_type = TagType.ARTIST
@@ -20,6 +59,9 @@ class _MusicTagArtistAudioTagMapper(IAudioTagMapper):
     def __call__(self, song: LIB_SPECIFIC_SONG_OBJECT, track_info: AudioTrackInfo) -> None:
         song["artist"] = track_info.artist
 
+    def is_up_to_date(self, song: LIB_SPECIFIC_SONG_OBJECT, track_info: AudioTrackInfo) -> bool:
+        return _has_values(song, artist=track_info.artist)
+
 
 class _MusicTagAlbumAudioTagMapper(IAudioTagMapper):
     tag_type = TagType.ALBUM
@@ -28,6 +70,9 @@ class _MusicTagAlbumAudioTagMapper(IAudioTagMapper):
     def __call__(self, song: LIB_SPECIFIC_SONG_OBJECT, track_info: AudioTrackInfo) -> None:
         song["album"] = track_info.album
 
+    def is_up_to_date(self, song: LIB_SPECIFIC_SONG_OBJECT, track_info: AudioTrackInfo) -> bool:
+        return _has_values(song, album=track_info.album)
+
 
 class _MusicTagTitleAudioTagMapper(IAudioTagMapper):
     tag_type = TagType.TITLE
@@ -36,6 +81,9 @@ class _MusicTagTitleAudioTagMapper(IAudioTagMapper):
     def __call__(self, song: LIB_SPECIFIC_SONG_OBJECT, track_info: AudioTrackInfo) -> None:
         song["tracktitle"] = track_info.title
 
+    def is_up_to_date(self, song: LIB_SPECIFIC_SONG_OBJECT, track_info: AudioTrackInfo) -> bool:
+        return _has_values(song, tracktitle=track_info.title)
+
 
 class _MusicTagDateAudioTagMapper(IAudioTagMapper):
     tag_type = TagType.DATE
@@ -44,6 +92,9 @@ class _MusicTagDateAudioTagMapper(IAudioTagMapper):
     def __call__(self, song: LIB_SPECIFIC_SONG_OBJECT, track_info: AudioTrackInfo) -> None:
         song["year"] = track_info.date
 
+    def is_up_to_date(self, song: LIB_SPECIFIC_SONG_OBJECT, track_info: AudioTrackInfo) -> bool:
+        return _has_values(song, year=track_info.date)
+
 
 class _MusicTagTrackNumbersAudioTagMapper(IAudioTagMapper):
     tag_type = TagType.TRACK_NUM
@@ -52,6 +103,9 @@ class _MusicTagTrackNumbersAudioTagMapper(IAudioTagMapper):
     def __call__(self, song: LIB_SPECIFIC_SONG_OBJECT, track_info: AudioTrackInfo) -> None:
         song["tracknumber"], song["totaltracks"] = (track_info.track_number, track_info.total_tracks)
 
+    def is_up_to_date(self, song: LIB_SPECIFIC_SONG_OBJECT, track_info: AudioTrackInfo) -> bool:
+        return _has_values(song, tracknumber=track_info.track_number, totaltracks=track_info.total_tracks)
+
 
 class _MusicTagGenreAudioTagMapper(IAudioTagMapper):
     tag_type = TagType.GENRE
@@ -60,6 +114,9 @@ class _MusicTagGenreAudioTagMapper(IAudioTagMapper):
     def __call__(self, song: LIB_SPECIFIC_SONG_OBJECT, track_info: AudioTrackInfo) -> None:
         song["genre"] = track_info.genre
 
+    def is_up_to_date(self, song: LIB_SPECIFIC_SONG_OBJECT, track_info: AudioTrackInfo) -> bool:
+        return _has_values(song, genre=track_info.genre)
+
 
 class _MusicTagDiscsAudioTagMapper(IAudioTagMapper):
     tag_type = TagType.DISC_NUM
@@ -68,18 +125,31 @@ class _MusicTagDiscsAudioTagMapper(IAudioTagMapper):
     def __call__(self, song: LIB_SPECIFIC_SONG_OBJECT, track_info: AudioTrackInfo) -> None:
         song["discnumber"], song["totaldiscs"] = (track_info.disc_number, track_info.total_discs)
 
+    def is_up_to_date(self, song: LIB_SPECIFIC_SONG_OBJECT, track_info: AudioTrackInfo) -> bool:
+        return _has_values(song, discnumber=track_info.disc_number, totaldiscs=track_info.total_discs)
+
 
 class _MusicTagCoverAudioTagMapper(IAudioTagMapper):
     tag_type = TagType.COVER
     compatible_tagging_lib = TAGGING_LIB
 
     def __call__(self, song: LIB_SPECIFIC_SONG_OBJECT, track_info: AudioTrackInfo) -> None:
-        song["artwork"] = track_info.cover_art_jpeg
+        # NOTE stateless, as mappers are shared by every tagging thread and album (see TagPlan)
+        song["artwork"] = (
+            None
+            if (track_info.cover_art_jpeg is None)
+            else _get_artwork(digest=track_info.cover_art_jpeg_digest, data=track_info.cover_art_jpeg)
+        )
+
+    def is_up_to_date(self, song: LIB_SPECIFIC_SONG_OBJECT, track_info: AudioTrackInfo) -> bool:
+        digests = {hashlib.sha256(artwork.data).hexdigest() for artwork in song["artwork"].values}
+        return digests == ({track_info.cover_art_jpeg_digest} - {None})
 
 
 class MusicTagAudioFileTagger(IAudioFileTagger):
     compatible_tagging_lib = TAGGING_LIB
     supported_audio_file_extentions = SUPPORTED_AUDIO_FILE_EXTENTIONS
+    in_memory_tagging = True
 
     @classmethod
     def get_song(cls, path: Path) -> music_tag.file.AudioFile | None:
@@ -105,3 +175,16 @@ class MusicTagAudioFileTagger(IAudioFileTagger):
     @classmethod
     def save_tags(cls, song: music_tag.file.AudioFile) -> None:
         song.save()
+
+    @classmethod
+    def get_song_from_buffer(cls, buffer: BinaryIO, path: Path) -> music_tag.file.AudioFile | None:
+        # Mutagen relies on the file name when guessing the format of some files (e.g. MP3s without ID3 tags).
+        if isinstance(buffer, io.BytesIO):
+            buffer.name = str(path)
+        return music_tag.load_file(mutagen.File(buffer))
+
+    @classmethod
+    def save_tags_to_buffer(cls, song: music_tag.file.AudioFile, buffer: BinaryIO) -> None:
+        # NOTE mutagen saves from the current position of file objects for some formats (e.g. FLAC), left at its end
+        buffer.seek(0)
+        song.mfile.save(buffer)
@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+
+from sootworks.audio_tagger.infrastructure.tracing._json_lines import JsonLinesTraceSink
+from sootworks.audio_tagger.infrastructure.tracing._summary import StderrSummaryTraceSink
+
+
+__all__ = ["JsonLinesTraceSink", "StderrSummaryTraceSink"]
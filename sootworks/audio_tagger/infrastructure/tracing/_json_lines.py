@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+
+import dataclasses
+import json
+import os
+import threading
+from pathlib import Path
+from typing import TextIO
+
+from sootworks.audio_tagger.domain.model import Span
+from sootworks.audio_tagger.domain.repository import ITraceSink
+
+
+class JsonLinesTraceSink(ITraceSink):
+    """Appending every finished span to a JSON lines file, which may be shared by concurrent processes.
+
+    Lines are written (and flushed) one at a time, so that the spans of the workers of a batch aren't interleaved,
+    and are kept even if the run is interrupted.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+        self._lock = threading.Lock()
+        self._file: TextIO | None = None  # opened on the first span, by the process emitting it
+
+    def emit(self, span: Span) -> None:
+        record = {"pid": os.getpid(), "thread": threading.current_thread().name, **dataclasses.asdict(span)}
+        line = json.dumps(record, default=str) + "\n"
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = self.path.open("a", encoding="utf-8")
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+import io
+import sys
+import threading
+from dataclasses import dataclass
+
+from termcolor import colored
+
+from sootworks.audio_tagger.domain.model import Span
+from sootworks.audio_tagger.domain.repository import ITraceSink
+
+
+@dataclass(slots=True)
+class _SpanStats:
+    count: int = 0
+    total: float = 0.0  # seconds
+    max: float = 0.0  # seconds
+    byte_count: int = 0
+    errors: int = 0
+
+    def add(self, span: Span) -> None:
+        self.count += 1
+        self.total += span.duration
+        self.max = max(self.max, span.duration)
+        self.byte_count += span.byte_count
+        self.errors += span.error is not None
+
+
+class StderrSummaryTraceSink(ITraceSink):
+    """Summarizing the spans by name on stderr, whenever a root span (e.g. the processing of an album) finishes.
+
+    Spans nested in one another are all accounted for, hence the totals of enclosing spans include those of the
+    spans they enclose, and the totals of concurrent spans (e.g. of tracks tagged by several workers) may exceed
+    the wall time of the root span.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: dict[str, _SpanStats] = {}
+
+    def emit(self, span: Span) -> None:
+        with self._lock:
+            self._stats.setdefault(span.name, _SpanStats()).add(span=span)
+            if span.parent_id is not None:
+                return
+            stats, self._stats = self._stats, {}
+
+        print(self.summarize(root=span, stats=stats), file=sys.stderr)
+
+    @staticmethod
+    def summarize(root: Span, stats: dict[str, _SpanStats]) -> str:
+        buffer = io.StringIO()
+        details = ", ".join(f"{key}: {value}" for key, value in root.attributes.items())
+        buffer.write(colored(f"\n+++ Timings of {root.name} ({details}): {root.duration:.3f} s +++\n", attrs=["bold"]))
+        buffer.write(f"  {'span':<24} {'count':>6} {'total (ms)':>12} {'mean (ms)':>11} {'max (ms)':>10} {'MB':>9}\n")
+        for name, entry in sorted(stats.items(), key=lambda item: item[1].total, reverse=True):
+            line = (
+                f"  {name:<24} {entry.count:>6} {entry.total * 1000:>12.1f} {entry.total * 1000 / entry.count:>11.2f}"
+                f" {entry.max * 1000:>10.2f} {entry.byte_count / 1024**2:>9.1f}"
+            )
+            if entry.errors > 0:
+                line += colored(f"  ({entry.errors} failed)", "light_red")
+            buffer.write(line + "\n")
+
+        return buffer.getvalue()
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+"""Reviewing the albums queued by unattended runs, approved albums are processed by the tagger's --execute-approved.
+"""
+
+import base64
+from argparse import ArgumentParser, Namespace
+from datetime import datetime
+from pathlib import Path
+
+from termcolor import colored
+
+from sootworks.audio_tagger.application.const import DEFAULT_STATE_DIR
+from sootworks.audio_tagger.domain.model import ReviewItem
+from sootworks.audio_tagger.infrastructure.review import JsonReviewQueueRepository
+
+
+def parse_args() -> Namespace:
+    parser = ArgumentParser(description="Reviewing albums queued for review by unattended runs of the tagger.")
+    parser.add_argument(
+        "--review-dir",
+        type=Path,
+        default=(DEFAULT_STATE_DIR / "review"),
+        help="the dir in which albums queued for review are kept (see --review-dir of the tagger).",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="listing the queued albums.")
+    show = commands.add_parser("show", help="showing the planned restructuring of a queued album.")
+    show.add_argument("id", help="the ID (or a unique prefix of it) of the queued album.")
+    show.add_argument("--thumbnail", type=Path, help="a path to save the thumbnail of the cover art to.")
+    approve = commands.add_parser("approve", help="approving queued albums to be processed as planned.")
+    approve.add_argument("ids", nargs="*", help="the IDs (or unique prefixes of them) of the queued albums.")
+    approve.add_argument("--all", action="store_true", help="approving every queued album.")
+    reject = commands.add_parser("reject", help="removing queued albums from the queue.")
+    reject.add_argument("ids", nargs="+", help="the IDs (or unique prefixes of them) of the queued albums.")
+
+    args = parser.parse_args()
+    if (args.command == "approve") and (len(args.ids) == 0) and (not args.all):
+        parser.error("either album IDs or --all must be given.")
+
+    return args
+
+
+def find_item(items: list[ReviewItem], item_id: str) -> ReviewItem:
+    matches = [item for item in items if item.id.startswith(item_id)]
+    if len(matches) != 1:
+        raise SystemExit(f"'{item_id}' matches {len(matches)} queued albums, exactly one is expected.")
+
+    return matches[0]
+
+
+def list_items(items: list[ReviewItem]) -> None:
+    if len(items) == 0:
+        print("No albums are queued for review.")
+    for item in items:
+        status = colored("approved", "light_green") if item.approved else colored("pending", "light_yellow")
+        created_at = datetime.fromtimestamp(item.created_at).strftime("%Y-%m-%d %H:%M")
+        print(f"{item.id[:12]}  {status:<20}  {created_at}  {item.in_path}")
+        for reason in item.reasons:
+            print(f"    - {reason}")
+
+
+def show_item(item: ReviewItem, thumbnail: Path | None = None) -> None:
+    info = item.source_structure.info
+    print(colored(f"{info.artist} - {info.title} ({info.date})", attrs=["bold"]) + f"  [{info.album_id}]")
+    print(f"Queued from {item.in_path}, approved: {item.approved}")
+    for reason in item.reasons:
+        print(colored(f"  - {reason}", "light_yellow"))
+
+    for source_medium, target_medium in zip(item.source_structure.media, item.target_structure.media):
+        for source_path, target_path in zip(source_medium.paths, target_medium.paths):
+            print(f"  {source_path.name}  ->  {target_path}")
+
+    if thumbnail is not None:
+        if item.cover_art_thumbnail is None:
+            print("No cover art has been found for the album.")
+        else:
+            thumbnail.write_bytes(base64.b64decode(item.cover_art_thumbnail))
+            print(f"Thumbnail saved to {thumbnail}")
+
+
+def main() -> None:
+    args = parse_args()
+    repo = JsonReviewQueueRepository(path=args.review_dir)
+    items = repo.get_items()
+
+    if args.command == "list":
+        list_items(items=items)
+    elif args.command == "show":
+        show_item(item=find_item(items=items, item_id=args.id), thumbnail=args.thumbnail)
+    elif args.command == "approve":
+        for item in items if args.all else [find_item(items=items, item_id=item_id) for item_id in args.ids]:
+            item.approved = True
+            repo.save_item(item=item)
+            print(f"Approved {item.in_path}")
+    elif args.command == "reject":
+        for item in [find_item(items=items, item_id=item_id) for item_id in args.ids]:
+            repo.remove_item(item_id=item.id)
+            print(f"Rejected {item.in_path}")
+
+
+if __name__ == "__main__":
+    main()